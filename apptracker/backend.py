@@ -1,66 +1,369 @@
+import queue
 import threading
-import yarl
+import time
 
-import apptracker.trackers.tracker_settings as TrackerSettings
-from apptracker.sheets import Sheets, JobStatus
-from apptracker.tracker import Tracker, JobListing
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from apptracker.duplicate_index import DuplicateIndex
+from apptracker.listing_snapshot import ListingSnapshot
+from apptracker.refresh_report import RefreshReport
+from apptracker.settings import Settings
+from apptracker.status_index import JobStatus, PLACEHOLDER_URLS
+from apptracker.trackers.joblisting import JobListing
+
+# Sheets and Tracker pull in gspread and requests_cache, which take longer to import than the window takes to show; connect imports them.
+if TYPE_CHECKING:
+    from apptracker.sheets import Sheets
+    from apptracker.tracker import Tracker
 
 # Connects job listing and sheets.
 class Backend:
     def __init__(self):
-        self.sheets = Sheets()
-        self.tracker = Tracker()
-        self.tracker_list : dict[str, dict[str, list[JobListing]]] = {}
-        # self.tracker_list[ COMPANY NAME ][ JOB TITLE ] = list of job listings corresponding to this
-    
-        self.to_display_job_lsting : list[JobListing] = []
-        self.urls_done : list[yarl.URL] = []
+        # Signing in to Google Sheets and opening the README cache are slow, so they only happen once a load runs on its worker thread (see connect).
+        self.sheets : "Sheets | None" = None
+        self.tracker : "Tracker | None" = None
+
+        # Listings to show, keyed by an id that stays the same until the next load. Kept in the order they were found.
+        self.to_display_job_lsting : dict[int, JobListing] = {}
+        self.display_ids : dict[JobListing, int] = {}
+        # self.display_ids[ JOB LISTING ] = its id in self.to_display_job_lsting.
+        self.next_listing_id = 0
+        self.urls_done : set[str] = set()
+        self.duplicate_index = DuplicateIndex(Settings.NEAR_DUPLICATE_THRESHOLD)
+        self.possible_duplicates : dict[int, int] = {}
+        # self.possible_duplicates[ LISTING ID ] = id of the listing shown before it which it is probably the same job as (see Settings.NEAR_DUPLICATES).
         self.jobs_applied_to_count : int = 0
+        # Trackers' state from the snapshot shown by load_snapshot, put back by reconcile.
+        self.snapshot_trackers : dict[str, tuple[str | None, str | None, list[JobListing]]] = {}
+
+        # Loads, background refreshes and added applications all change the listings above, so only one runs at a time.
+        self.lock = threading.RLock()
+        # Counts loads. Changes found by refresh_tracker are tagged with it, so the GUI can drop changes to listings it no longer shows.
+        self.generation = 0
+        # (generation, added listing ids, removed listing ids) found by refresh_tracker, waiting for the GUI.
+        self.display_changes : queue.Queue[tuple[int, list[int], list[int]]] = queue.Queue()
+        # Ids of the listings shown by the last load, in order, as they were when it finished. Changes found by refreshes since are in self.display_changes.
+        self.loaded_listing_ids : list[int] = []
+        # Why the last load or reconcile failed (no key.json, no network...), for the GUI to show. None if it worked.
+        self.load_error : str | None = None
+
+    def connect(self) -> None:
+        """Sets up the trackers and connects to Google Sheets, if not done yet."""
+        with self.lock:
+            if self.tracker is None:
+                from apptracker.tracker import Tracker
+                self.tracker = Tracker()
+
+            if self.sheets is None:
+                from apptracker.sheets import Sheets
+                self.sheets = Sheets()
+
+    def add_application(self, event : threading.Event, type : str, listing_id : int):
+        with self.lock:
+            self.connect()
+            lsting = self.to_display_job_lsting.pop(listing_id)
+            # Not there if a refresh already removed it.
+            self.display_ids.pop(lsting, None)
+            self.duplicate_index.remove(listing_id)
+            self.possible_duplicates.pop(listing_id, None)
 
-    def add_application(self, event : threading.Event, type : str, company_name : str, job_title : str, job_location : str, url : str):
-        if type == "Applied":
-            self.sheets.add_applied(company_name, job_title, job_location, url)
-            self.jobs_applied_to_count += 1
-        elif type == "Discarded":
-            self.sheets.add_discarded(company_name, job_title, job_location, url)
-    
-        for lsting in self.to_display_job_lsting:
-            if lsting.company_name == company_name and lsting.job_title == job_title and lsting.location == job_location:
-                self.to_display_job_lsting.remove(lsting)
-                break
+            if type == "Applied":
+                self.sheets.add_applied(lsting.company_name, lsting.job_title, lsting.location, lsting.url)
+                self.jobs_applied_to_count += 1
+            elif type == "Discarded":
+                self.sheets.add_discarded(lsting.company_name, lsting.job_title, lsting.location, lsting.url)
 
         event.set()
 
-    def load(self, event : threading.Event):
-        self.tracker_list = self.tracker.get()
+    def add_applications(self, type : str, listings : list[JobListing]) -> list[JobListing]:
+        """Adds many applications at once, like add_application, but from listings rather than shown listing ids. They are sent to Google Sheets in one write per worksheet.
+        Listings which were already applied to or discarded, or are given twice, are skipped.
+
+            Args:
+                type (str): "Applied" or "Discarded".
+                listings (list[JobListing]): Listings to add. URLs must be canonical (see helpers.canonical_url).
+
+            Returns:
+                list[JobListing]: The listings added.
+        """
+        with self.lock:
+            self.connect()
+            self.sheets.reload()
+
+            # Matched the same way as against Google Sheets: same company name, job title and location, or same URL.
+            added : list[JobListing] = []
+            keys_done : set[tuple[str, str, str]] = set()
+            urls_done : set[str] = set()
+            not_applied = JobStatus.NOT_APPLIED.value
+            for lsting, status in zip(listings, self.sheets.classify(listings)):
+                key = (lsting.company_name, lsting.job_title, lsting.location)
+                if status != not_applied or key in keys_done or lsting.url in urls_done:
+                    continue
+
+                added.append(lsting)
+                keys_done.add(key)
+                if lsting.url not in PLACEHOLDER_URLS:
+                    urls_done.add(lsting.url)
+
+            if type == "Applied":
+                self.sheets.add_applied_listings(added)
+                self.jobs_applied_to_count += len(added)
+            elif type == "Discarded":
+                self.sheets.add_discarded_listings(added)
+
+            self.sheets.flush()
+
+        return added
+
+    def _show(self, listings : list[JobListing], print_duplicates : bool = True, find_duplicates : bool = True) -> list[int]:
+        """Adds listings which have not been applied to or discarded to self.to_display_job_lsting, skipping ones whose URL is already shown.
+        Ones which look like a listing already shown are flagged in self.possible_duplicates.
+
+            Args:
+                listings (list[JobListing]): Listings to add.
+                print_duplicates (bool): If true, prints the URL of every listing skipped. By default, this is true.
+                find_duplicates (bool): If true, flags possible duplicates (see _find_duplicates). By default, this is true.
+
+            Returns:
+                list[int]: Ids of the listings added.
+        """
+        shown : list[int] = []
+
+        for lsting in listings:
+            # Trackers store canonical URLs (helpers.canonical_url), so links to the same job are equal strings.
+            if lsting.url not in PLACEHOLDER_URLS:
+                if lsting.url in self.urls_done:
+                    if print_duplicates:
+                        print(f"Found URL: {lsting.url}")
+                    continue
+
+                self.urls_done.add(lsting.url)
+
+            self.to_display_job_lsting[self.next_listing_id] = lsting
+            self.display_ids[lsting] = self.next_listing_id
+            shown.append(self.next_listing_id)
+            self.next_listing_id += 1
+
+        if find_duplicates:
+            self._find_duplicates(shown)
+
+        return shown
+
+    def _find_duplicates(self, listing_ids : list[int]) -> None:
+        """Flags shown listings which are probably the same job as one shown before them in self.possible_duplicates, if Settings.NEAR_DUPLICATES is on.
+        Listings must be given in the order they were shown. Call with self.lock held.
+        """
+        if not Settings.NEAR_DUPLICATES:
+            return
+
+        for listing_id in listing_ids:
+            duplicate_of = self.duplicate_index.add(listing_id, self.to_display_job_lsting[listing_id])
+            if duplicate_of is not None:
+                self.possible_duplicates[listing_id] = duplicate_of
+
+    def load(self, event : threading.Event, listing_queue : queue.Queue | None = None, report : RefreshReport | None = None):
+        """Loads every job listing which has not been applied to or discarded yet into self.to_display_job_lsting, then sets event.
+
+            Args:
+                event (threading.Event): Set once loading is done.
+                listing_queue (queue.Queue | None): If given, listing ids are also put in it in batches (lists) as soon as they pass the filters, so they can be shown before loading is done.
+                    Batches are at most Settings.PROGRESSIVE_LOAD_BATCH_SIZE long.
+                report (RefreshReport | None): If given, the load is recorded in it and the caller finishes it (so it can time showing the listings too). Otherwise, a report is made and finished here.
+        """
+        own_report = report is None
+        if own_report:
+            report = RefreshReport("load")
+
+        self.load_error = None
+        try:
+            with self.lock, report.running():
+                # The GUI cleared its rows already, so the listings go even if connecting fails.
+                self.generation += 1
+                self.to_display_job_lsting.clear()
+                self.display_ids.clear()
+                self.loaded_listing_ids = []
+                self.urls_done.clear()
+                self.duplicate_index.clear()
+                self.possible_duplicates.clear()
+
+                with report.stage("connect"):
+                    self.connect()
+                self.sheets.reload()
+
+                # Remove all applied to and discarded applications for final listing. Listings are filtered in batches as the trackers parse them.
+                listings = self.tracker.stream()
+                not_applied = JobStatus.NOT_APPLIED.value
+                while True:
+                    # Waiting on the trackers (downloading, parsing and merging) and filtering are timed apart.
+                    start = time.perf_counter()
+                    batch = list(islice(listings, Settings.PROGRESSIVE_LOAD_BATCH_SIZE))
+                    report.add_time("trackers", time.perf_counter() - start)
+                    if not batch:
+                        break
+
+                    with report.stage("filter"):
+                        shown = self._show([lsting for lsting, status in zip(batch, self.sheets.classify(batch)) if status == not_applied])
+                    report.count("listings_shown", len(shown))
+                    # Kept up to date batch by batch, so the listings found before a failure are still shown.
+                    self.loaded_listing_ids.extend(shown)
+
+                    if listing_queue is not None and shown:
+                        listing_queue.put(shown)
+
+                self.jobs_applied_to_count = self.sheets.applied_last_row_id
+                with report.stage("save_snapshot"):
+                    self.save_snapshot()
+        except Exception as e:
+            self.load_error = f"Could not load listings: {e}"
+            print(self.load_error)
+        finally:
+            if own_report:
+                report.finish()
+            # We are done now. Mark event as completed, even if loading failed, so the GUI does not wait forever.
+            event.set()
+
+    def load_snapshot(self) -> list[int] | None:
+        """Shows the listings saved by the last load (see ListingSnapshot) until reconcile has checked them.
+        Needs neither Google Sheets nor the network, so it is fast enough to run before the window first shows.
+
+            Returns:
+                list[int] | None: Ids of the listings shown, or None if there is no usable snapshot.
+        """
+        snapshot = ListingSnapshot.read(Settings.LISTING_SNAPSHOT_FILE)
+        if snapshot is None:
+            return None
+
+        with self.lock:
+            self.generation += 1
+            self.snapshot_trackers = snapshot.trackers
+            self.to_display_job_lsting.clear()
+            self.display_ids.clear()
+            self.urls_done.clear()
+            self.duplicate_index.clear()
+            self.possible_duplicates.clear()
+
+            # Finding duplicates takes longer than the rest of this together; reconcile does it on its worker thread.
+            shown = self._show(snapshot.listings, print_duplicates=False, find_duplicates=False)
+            self.jobs_applied_to_count = snapshot.jobs_applied_to_count
+
+        return shown
+
+    def reconcile(self, event : threading.Event):
+        """Loads every tracker and Google Sheets like load, but keeps the listings shown by load_snapshot: only the listings which changed since are put in self.display_changes. Sets event once done.
+        The trackers' state is put back from the snapshot first, so READMEs which did not change are not parsed again.
+        """
+        report = RefreshReport("reconcile")
+        self.load_error = None
+        try:
+            with self.lock, report.running():
+                with report.stage("connect"):
+                    self.connect()
+                self.tracker.restore(self.snapshot_trackers)
+                self.snapshot_trackers = {}
+                self.sheets.reload()
+                with report.stage("trackers"):
+                    self.tracker.get()
+
+                with report.stage("filter"):
+                    self._find_duplicates(list(self.display_ids.values()))
+                    self._update_display(self.tracker.snapshot())
+                self.jobs_applied_to_count = self.sheets.applied_last_row_id
+                with report.stage("save_snapshot"):
+                    self.save_snapshot()
+        except Exception as e:
+            # The listings from the snapshot stay shown, but may be out of date.
+            self.load_error = f"Could not check the listings saved by the last run: {e}"
+            print(self.load_error)
+        finally:
+            report.finish()
+            event.set()
+
+    def save_snapshot(self) -> None:
+        """Saves the listings shown and the trackers' state for load_snapshot, if Settings.LISTING_SNAPSHOT is on."""
+        if not Settings.LISTING_SNAPSHOT:
+            return
+
+        with self.lock:
+            trackers = {
+                tracker.provider_name: (tracker.last_etag, tracker.last_modified, tracker.last_listings)
+                for tracker in self.tracker.trackers if tracker.has_parsed
+            }
+            snapshot = ListingSnapshot(list(self.display_ids), self.jobs_applied_to_count, trackers)
+
+            try:
+                snapshot.write(Settings.LISTING_SNAPSHOT_FILE)
+            except OSError as e:
+                print(f"Could not save snapshot: {e}")
+
+    def refresh_tracker(self, position : int) -> bool:
+        """Refreshes one tracker, then updates self.to_display_job_lsting with only what changed and puts the change in self.display_changes.
+        Listings still shown keep their ids, so the GUI only has to add and remove rows. It calls drop_listings once the removed rows are gone.
+
+            Args:
+                position (int): Position of the tracker in self.tracker.trackers.
+
+            Returns:
+                bool: False if the tracker failed to refresh, otherwise True (even if nothing changed).
+        """
+        with self.lock:
+            self.connect()
+            provider_name = self.tracker.trackers[position].provider_name
+            report = RefreshReport(f"refresh {provider_name}")
+            try:
+                with report.running():
+                    return self._refresh_tracker(position, report)
+            finally:
+                report.finish()
+
+    def _refresh_tracker(self, position : int, report : RefreshReport) -> bool:
+        """Does the work of refresh_tracker, recording it in report. Call with self.lock held."""
+        provider_name = self.tracker.trackers[position].provider_name
+        with report.stage("trackers"):
+            changed = self.tracker.refresh(position)
+        if not changed:
+            return provider_name not in self.tracker.errors
+
+        # Only downloads rows added to Google Sheets since the last reload.
         self.sheets.reload()
-        self.to_display_job_lsting.clear()
-        self.urls_done.clear()
-
-        # Remove all applied to and discarded applications for final listing.
-        for company_name, _data in self.tracker_list.items():
-            for job_title, job_listings in _data.items():
-                for lsting in job_listings:
-                    if self.sheets.get_job_status(company_name, job_title, lsting.location, lsting.url) != JobStatus.NOT_APPLIED:
-                        continue
-                    
-                    if lsting.url not in TrackerSettings.JOB_LISTINGS_ACTUAL_LINKS.values():
-                        yarl_url = yarl.URL(lsting.url)
-
-                        found = False
-                        for url in self.urls_done:
-                            if url == yarl_url:
-                                found = True
-                                break
-
-                        if found:
-                            print(f"Found URL: {lsting.url}")
-                            continue
-
-                        self.urls_done.append(yarl_url)
-                    
-                    self.to_display_job_lsting.append(lsting)
-        
-        self.jobs_applied_to_count = self.sheets.applied_last_row_id
-        # We are done now. Mark event as completed.
-        event.set()
\ No newline at end of file
+
+        with report.stage("filter"):
+            changed = self._update_display(self.tracker.snapshot())
+        if changed:
+            with report.stage("save_snapshot"):
+                self.save_snapshot()
+
+        return provider_name not in self.tracker.errors
+
+    def _update_display(self, listings : tuple[JobListing, ...]) -> bool:
+        """Updates self.to_display_job_lsting to the listings which have not been applied to or discarded, and puts what changed in self.display_changes.
+        Call with self.lock held.
+
+            Returns:
+                bool: Whether anything changed.
+        """
+        not_applied = JobStatus.NOT_APPLIED.value
+        available = [lsting for lsting, status in zip(listings, self.sheets.classify(listings)) if status == not_applied]
+        available_set = set(available)
+
+        # Removed listings stay in self.to_display_job_lsting until the GUI takes their rows out (see drop_listings).
+        removed = [listing_id for lsting, listing_id in self.display_ids.items() if lsting not in available_set]
+        for listing_id in removed:
+            del self.display_ids[self.to_display_job_lsting[listing_id]]
+            self.duplicate_index.remove(listing_id)
+
+        # Rows already shown keep their URL, so a new listing never replaces one the user can see.
+        self.urls_done = {lsting.url for lsting in self.display_ids if lsting.url not in PLACEHOLDER_URLS}
+        # Listings skipped for their URL come up again on every refresh, and were printed by the load already.
+        added = self._show([lsting for lsting in available if lsting not in self.display_ids], print_duplicates=False)
+
+        if added or removed:
+            self.display_changes.put((self.generation, added, removed))
+
+        return bool(added or removed)
+
+    def drop_listings(self, listing_ids : list[int]) -> None:
+        """Forgets listings a refresh removed, once they are no longer shown."""
+        for listing_id in listing_ids:
+            self.to_display_job_lsting.pop(listing_id, None)
+            self.possible_duplicates.pop(listing_id, None)
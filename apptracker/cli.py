@@ -0,0 +1,174 @@
+"""Headless entry point: runs the same fetch, duplicate removal and filtering as the GUI, without a display.
+
+    python -m apptracker.cli list [--format jsonl|csv]
+        Writes every listing not applied to or discarded yet to stdout, one per line, as soon as it is found.
+
+    python -m apptracker.cli mark {applied,discarded} FILE [--format jsonl|csv]
+        Marks every listing in FILE (- for stdin, in the format list writes) as applied to or discarded, with one write to Google Sheets.
+
+Exit codes: 0 on success, 1 if it failed, 2 for bad arguments or input, 3 if it finished but a tracker failed to load or rows could not be sent to Google Sheets yet (they are sent on the next run).
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+
+from apptracker.backend import Backend
+from apptracker.status_index import PLACEHOLDER_URLS
+from apptracker.trackers.helpers import canonical_url
+import apptracker.trackers.registry as registry
+from apptracker.trackers.joblisting import JobListing
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2 # Same code argparse exits with.
+EXIT_PARTIAL = 3
+
+FIELDS = ("company_name", "job_title", "location", "url", "source")
+REQUIRED_FIELDS = ("company_name", "job_title", "location", "url")
+
+class ListingWriter:
+    """Writes listings to a text stream as JSON Lines or CSV (with a header row)."""
+    def __init__(self, out, format : str):
+        self.out = out
+        self.format = format
+
+        if format == "csv":
+            self.csv_writer = csv.writer(out, lineterminator="\n")
+            self.csv_writer.writerow(FIELDS)
+
+    def write(self, listings : list[JobListing]) -> None:
+        if self.format == "csv":
+            self.csv_writer.writerows([getattr(listing, field) for field in FIELDS] for listing in listings)
+        else:
+            self.out.writelines(json.dumps({field: getattr(listing, field) for field in FIELDS}, ensure_ascii=False) + "\n" for listing in listings)
+
+        self.out.flush()
+
+def read_listings(file, format : str) -> list[JobListing]:
+    """Reads listings written by ListingWriter. Only company_name, job_title, location and url are needed; URLs are made canonical like the trackers do.
+
+        Raises:
+            ValueError: If a record is malformed or misses a field.
+    """
+    # Closed listings of plugin trackers have their placeholder URL too.
+    registry.discover()
+
+    if format == "csv":
+        records = enumerate(csv.DictReader(file), start=2)
+    else:
+        records = ((line_number, json.loads(line)) for line_number, line in enumerate(file, start=1) if line.strip())
+
+    listings : list[JobListing] = []
+    try:
+        for line_number, record in records:
+            missing = [field for field in REQUIRED_FIELDS if not isinstance(record.get(field), str)]
+            if missing:
+                raise ValueError(f"line {line_number}: missing {', '.join(missing)}")
+
+            url = record["url"] if record["url"] in PLACEHOLDER_URLS else canonical_url(record["url"])
+            listings.append(JobListing(record["company_name"], record["job_title"], record["location"], url, record.get("source") or ""))
+    except (json.JSONDecodeError, csv.Error, AttributeError) as e:
+        raise ValueError(f"could not read listings: {e}")
+
+    return listings
+
+def list_listings(backend : Backend, writer : ListingWriter) -> int:
+    """Loads listings on a worker thread (see Backend.load), writing each batch as soon as it is filtered."""
+    done = threading.Event()
+    listing_queue = queue.Queue()
+    failure : list[BaseException] = []
+
+    def load():
+        try:
+            backend.load(done, listing_queue)
+        except BaseException as e:
+            failure.append(e)
+            done.set()
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+
+    # The backend puts its last batch before setting done, so once it is set an empty queue means everything is in.
+    while not (done.is_set() and listing_queue.empty()):
+        try:
+            listing_ids = listing_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+        writer.write([backend.to_display_job_lsting[listing_id] for listing_id in listing_ids])
+
+    if failure:
+        raise failure[0]
+
+    for provider_name in backend.tracker.errors:
+        print(f"Could not load {provider_name}", file=sys.stderr)
+
+    return EXIT_PARTIAL if backend.tracker.errors else EXIT_OK
+
+def mark_listings(backend : Backend, type : str, listings : list[JobListing]) -> int:
+    added = backend.add_applications(type, listings)
+    print(f"Marked {len(added)} listings as {type.lower()} ({len(listings) - len(added)} already marked or given twice)", file=sys.stderr)
+
+    if any(backend.sheets.pending_rows.values()):
+        print("Some rows could not be sent to Google Sheets yet; they will be sent on the next run", file=sys.stderr)
+        return EXIT_PARTIAL
+
+    return EXIT_OK
+
+def parse_args(argv : list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="apptracker", description="Lists job listings not reviewed yet, or marks listings as applied to or discarded, without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="write every listing not applied to or discarded yet to stdout")
+    list_parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+
+    mark_parser = commands.add_parser("mark", help="mark the listings in a file as applied to or discarded")
+    mark_parser.add_argument("status", choices=("applied", "discarded"))
+    mark_parser.add_argument("file", help="listings in the format list writes, or - for stdin")
+    mark_parser.add_argument("--format", choices=("jsonl", "csv"), help="by default, csv if the file name ends in .csv, otherwise jsonl")
+
+    return parser.parse_args(argv)
+
+def main(argv : list[str] | None = None) -> int:
+    args = parse_args(argv)
+    out = sys.stdout
+
+    # The backend reports progress with print; keep stdout for listings only.
+    with contextlib.redirect_stdout(sys.stderr):
+        backend = Backend()
+
+        if args.command == "list":
+            try:
+                return list_listings(backend, ListingWriter(out, args.format))
+            except BrokenPipeError:
+                # Whatever we were piped into has seen enough. Point stdout at devnull so exiting doesn't fail flushing it again.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+                return EXIT_OK
+            except Exception as e:
+                print(f"Could not load listings: {e}", file=sys.stderr)
+                return EXIT_FAILED
+
+        format = args.format or ("csv" if args.file.endswith(".csv") else "jsonl")
+        try:
+            if args.file == "-":
+                listings = read_listings(sys.stdin, format)
+            else:
+                with open(args.file, newline="", encoding="utf-8") as file:
+                    listings = read_listings(file, format)
+        except (OSError, ValueError) as e:
+            print(f"Could not read {args.file}: {e}", file=sys.stderr)
+            return EXIT_USAGE
+
+        try:
+            return mark_listings(backend, "Applied" if args.status == "applied" else "Discarded", listings)
+        except Exception as e:
+            print(f"Could not mark listings: {e}", file=sys.stderr)
+            return EXIT_FAILED
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import functools
+import re
+
+from apptracker.trackers.joblisting import JobListing
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+YEAR_RE = re.compile(r'20\d\d')
+
+# Words at the end of a company name which different job boards add or leave out ("Jane Street Capital", "Jane Street").
+COMPANY_SUFFIXES = frozenset(("inc", "llc", "ltd", "lp", "llp", "plc", "gmbh", "corp", "corporation", "co", "company", "group", "holdings", "technologies", "technology", "capital", "labs"))
+
+# Job title abbreviations and their spelled out words.
+TITLE_ALIASES = {
+    "swe": ("software", "engineer"),
+    "sde": ("software", "engineer"),
+    "engineering": ("engineer",),
+    "eng": ("engineer",),
+    "dev": ("developer",),
+    "development": ("developer",),
+    "ml": ("machine", "learning"),
+    "internship": ("intern",),
+    "interns": ("intern",),
+}
+# Job title words which say nothing about the job itself.
+TITLE_STOPWORDS = frozenset(("summer", "fall", "winter", "spring", "the", "and", "of", "for", "in", "a", "to"))
+
+# Location words which do not name a city ("**2 locations**", "Remote in USA", "New York City").
+LOCATION_FILLER = frozenset(("locations", "location", "remote", "hybrid", "onsite", "in", "usa", "us", "united", "states", "america", "city"))
+# Kept out of a city name only when they follow it without a comma ("Seattle WA"), since "LA" on its own is a city.
+STATE_CODES = frozenset((
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "dc", "fl", "ga", "hi", "id", "il", "in", "ia", "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo",
+    "mt", "ne", "nv", "nh", "nj", "nm", "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri", "sc", "sd", "tn", "tx", "ut", "vt", "va", "wa", "wv", "wi", "wy",
+))
+CITY_ALIASES = {
+    "nyc": "new york",
+    "sf": "san francisco",
+    "la": "los angeles",
+}
+
+# Blocks bigger than this are too generic to tell anything apart (a very common first word, say), so listings in them are not compared.
+# This keeps the cost of adding a listing bounded however many are shown.
+MAX_BLOCK_SIZE = 1000
+
+@functools.lru_cache(maxsize=65536)
+def company_words(company_name : str) -> tuple[str, ...]:
+    """Lowercased words of a company name, without a leading "the" or suffixes like "Inc" and "Capital". Keeps at least one word."""
+    words = WORD_RE.findall(company_name.lower())
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+
+    return tuple(words)
+
+@functools.lru_cache(maxsize=65536)
+def title_words(job_title : str) -> frozenset[str]:
+    """Words of a job title with abbreviations spelled out, and seasons and years left out: "SWE Intern - Summer 2025" gives {software, engineer, intern}."""
+    words = set()
+    for word in WORD_RE.findall(job_title.lower()):
+        if word in TITLE_STOPWORDS or YEAR_RE.fullmatch(word):
+            continue
+
+        words.update(TITLE_ALIASES.get(word, (word,)))
+
+    return frozenset(words)
+
+@functools.lru_cache(maxsize=65536)
+def city_names(location : str) -> frozenset[str]:
+    """Names of the cities of a location: for each of its locations (split on "|"), the part before the first comma without filler or a state code.
+    "**2 locations** New York, NY | Bellevue, WA" gives {new york, bellevue}, and "Remote in USA" gives nothing.
+    """
+    names = set()
+    for part in location.lower().split("|"):
+        words = [word for word in WORD_RE.findall(part.split(",", 1)[0]) if word not in LOCATION_FILLER and not word.isdigit()]
+        if len(words) > 1 and words[-1] in STATE_CODES:
+            words.pop()
+
+        if words:
+            name = " ".join(words)
+            names.add(CITY_ALIASES.get(name, name))
+
+    return frozenset(names)
+
+# Listings which look like the same job posted on different job boards, found without comparing every pair.
+class DuplicateIndex:
+    """Finds listings which are probably the same job as one added before, even though their company name, job title, location or URL is not exactly the same.
+
+    Listings are put in blocks by the first word of their company name. A new listing is only compared to the listings in its block, so adding one
+    costs about the same however many there are. Two listings are possible duplicates if they come from different job boards, their company names match
+    (the same words, or one starts with all of the other's words and those are at least two), their job titles have at least threshold of their words
+    in common (Jaccard similarity), and they share a city (see city_names) or neither names one. A job board lists the same role in several cities
+    as several listings, and "Seattle, WA" and "Bellevue, WA" are as different jobs as "Seattle, WA" and "Austin, TX".
+
+    URLs are not compared. Listings with the same canonical URL are never both shown (see Backend._show), and links which only differ in their query
+    are often different jobs: careers.example.com/job?gh_jid=1 and ?gh_jid=2 are two roles, sometimes at two companies sharing a careers site.
+    """
+    def __init__(self, threshold : float):
+        self.threshold = threshold
+        self.entries : dict[int, tuple[tuple, str | None]] = {}
+        # self.entries[ LISTING ID ] = (features of the listing, see features; its block key)
+        self.blocks : dict[str, dict[int, None]] = {}
+        # self.blocks[ BLOCK KEY ] = ids of the listings in that block, in the order they were added.
+
+    def features(self, listing : JobListing) -> tuple:
+        """(job board, company name words, job title words, city names) of a listing; what is_duplicate compares."""
+        return (listing.source, company_words(listing.company_name), title_words(listing.job_title), city_names(listing.location))
+
+    def is_duplicate(self, features : tuple, other_features : tuple) -> bool:
+        """Whether two listings are probably the same job, from their features. See DuplicateIndex."""
+        source, companies, titles, cities = features
+        other_source, other_companies, other_titles, other_cities = other_features
+
+        # A job board does not list the same job twice.
+        if source == other_source:
+            return False
+
+        if companies != other_companies:
+            # "Jane Street Financial" and "Jane Street" match, but a single word is too little to go on: "Acme" could be "Acme Robotics" or "Acme Health".
+            shorter, longer = (companies, other_companies) if len(companies) < len(other_companies) else (other_companies, companies)
+            if len(shorter) < 2 or longer[:len(shorter)] != shorter:
+                return False
+
+        # "Remote in USA" and "Mountain View, CA, USA" are not the same place either.
+        if cities != other_cities and cities.isdisjoint(other_cities):
+            return False
+
+        if not titles or not other_titles:
+            return titles == other_titles
+
+        return len(titles & other_titles) / len(titles | other_titles) >= self.threshold
+
+    def add(self, listing_id : int, listing : JobListing) -> int | None:
+        """Adds a listing.
+
+            Returns:
+                int | None: Id of the first listing added before which it is probably a duplicate of, or None.
+        """
+        features = self.features(listing)
+        companies = features[1]
+        # A company name without any word can't be told apart from anything.
+        key = companies[0] if companies else None
+
+        duplicate_of = None
+        if key is not None:
+            block = self.blocks.setdefault(key, {})
+            if len(block) <= MAX_BLOCK_SIZE:
+                for other_id in block:
+                    if self.is_duplicate(features, self.entries[other_id][0]):
+                        duplicate_of = other_id
+                        break
+
+            block[listing_id] = None
+
+        self.entries[listing_id] = (features, key)
+        return duplicate_of
+
+    def remove(self, listing_id : int) -> None:
+        """Removes a listing, if it was added."""
+        entry = self.entries.pop(listing_id, None)
+        if entry is None or entry[1] is None:
+            return
+
+        key = entry[1]
+        block = self.blocks[key]
+        del block[listing_id]
+        if not block:
+            del self.blocks[key]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.blocks.clear()
@@ -2,9 +2,16 @@ import tkinter as tk
 from tkinter import font
 from tkinter import ttk
 import threading
+import heapq
+import queue
 import webbrowser
-import pyperclip
+from collections import deque
+from operator import attrgetter
 from apptracker.backend import Backend 
+from apptracker.refresh_report import RefreshReport
+from apptracker.refresh_scheduler import RefreshScheduler
+from apptracker.search_index import SearchIndex
+from apptracker.settings import Settings
 
 # GUI Structure idealogy adopted from: https://stackoverflow.com/a/17470842
 # Button callback and threading stuff from: https://stackoverflow.com/a/64038231 tysm!
@@ -23,28 +30,54 @@ class GUI(tk.Frame):
         self.jobs_to_apply_to = ttk.Label(self, text="")
         self.jobs_to_apply_to.grid(row=1, column=1, sticky='ns')
 
+        # Type-ahead search over company, role, location and source; see filter_gridlist.
+        self.search_label = ttk.Label(self, text="Search:")
+        self.search_label.grid(row=0, column=0, padx=(5, 0), sticky='sw')
+        self.search_text = tk.StringVar()
+        self.search_entry = ttk.Entry(self, textvariable=self.search_text)
+        self.search_entry.grid(row=1, column=0, padx=(5, 0), sticky='we')
+        self.search_text.trace_add("write", lambda *_: self.filter_gridlist())
+
+        # Counts listings added by background refreshes. Clicking it scrolls down to them.
+        self.new_listings_label = ttk.Label(self, text="", cursor="hand2")
+        self.new_listings_label.grid(row=0, column=2, sticky='ns')
+        self.new_listings_label.bind("<Button-1>", lambda _: self.show_new_listings())
+
         self.columns = ("Company", "Role", "Source", "Location")
+        self.column_attributes = ("company_name", "job_title", "source", "location") # JobListing field shown in each column.
         self.job_gridlist = ttk.Treeview(self, columns=self.columns, height=30, selectmode='browse')
 
         for col in self.columns:
             self.job_gridlist.column(col, anchor='w', stretch=False)
 
             if col == 'Location':
-                self.job_gridlist.heading(col, text=col, command=lambda: self.treeview_sort_column(self.job_gridlist, col, False), anchor='w')
+                self.job_gridlist.heading(col, text=col, command=lambda col=col: self.treeview_sort_column(self.job_gridlist, col, False), anchor='w')
             else:
-                self.job_gridlist.heading(col, text=col, command=lambda: self.treeview_sort_column(self.job_gridlist, col, False), anchor='center')
+                self.job_gridlist.heading(col, text=col, command=lambda col=col: self.treeview_sort_column(self.job_gridlist, col, False), anchor='center')
         
         self.job_gridlist['show'] = 'headings' # Gets rid of the empty icon column.
+        # Listings which are probably the same job as one above them (see Backend.possible_duplicates).
+        self.job_gridlist.tag_configure("possible_duplicate", background="#fff3c4")
         self.job_gridlist.grid(row=2, column=0, columnspan=3, sticky='news')
 
         # Scrollbar handling
         self.job_gridlist_horizontal_sb = ttk.Scrollbar(master=self, orient=tk.HORIZONTAL, command=self.job_gridlist.xview)
         self.job_gridlist_horizontal_sb.grid(row=3, column=0, columnspan=3, sticky='nwe')
-        self.job_gridlist_vertical_sb = ttk.Scrollbar(master=self, orient=tk.VERTICAL, command=self.job_gridlist.yview)
+        # The vertical scrollbar tracks our position in view_ids rather than the Treeview's own items, see render_gridlist.
+        self.job_gridlist_vertical_sb = ttk.Scrollbar(master=self, orient=tk.VERTICAL, command=self.gridlist_yview)
         self.job_gridlist_vertical_sb.grid(row=2, column=0, columnspan=3, sticky='nse')
-        self.job_gridlist.configure(xscroll=self.job_gridlist_horizontal_sb.set, yscroll=self.job_gridlist_vertical_sb.set)      
+        self.job_gridlist.configure(xscroll=self.job_gridlist_horizontal_sb.set, yscroll=self.gridlist_yscroll)      
         self.job_gridlist.bind("<Double-1>", self.treeview_double_click)
         self.job_gridlist.bind("<Button-3>", self.treeview_copy_url)
+        self.job_gridlist.bind("<<TreeviewSelect>>", self.treeview_select)
+        self.job_gridlist.bind("<Configure>", lambda _: self.render_gridlist())
+        self.job_gridlist.bind("<MouseWheel>", self.gridlist_mouse_wheel)
+        self.job_gridlist.bind("<Button-4>", self.gridlist_mouse_wheel)
+        self.job_gridlist.bind("<Button-5>", self.gridlist_mouse_wheel)
+        self.job_gridlist.bind("<Up>", lambda _: self.gridlist_move_selection(-1))
+        self.job_gridlist.bind("<Down>", lambda _: self.gridlist_move_selection(1))
+        self.job_gridlist.bind("<Prior>", lambda _: self.gridlist_move_selection(-self.visible_row_count()))
+        self.job_gridlist.bind("<Next>", lambda _: self.gridlist_move_selection(self.visible_row_count()))
 
         self.add_button = tk.Button(self, text = "Add", width=10, command = self.start_add_application)
         self.add_button.grid(row=4, column=0, padx=(5, 0), pady=(5, 5), sticky='w')
@@ -65,17 +98,51 @@ class GUI(tk.Frame):
         self.grid_rowconfigure(2,weight=1)
         self.grid_rowconfigure(3,weight=1)
         self.grid_rowconfigure(4,weight=1)
+
+        self.longest_text = [15, 15, 15, 15]
+        self.text_widths : dict[str, int] = {} # Cache for font.measure, which is slow.
+        self.heading_font = font.nametofont("TkHeadingFont")
+        self.pending_listings = deque()
+        self.load_report : RefreshReport | None = None # Report of the running load, finished once its rows are all in the gridlist.
+
+        # Only the rows on screen exist as Treeview items. listing_order holds the listing id (see Backend.to_display_job_lsting) of
+        # every row in display order, and view_ids the ones matching the search bar. view_offset is the index in view_ids of the top
+        # row shown, and row_items are the Treeview items for the rows shown. A row's Treeview item id is its listing id.
+        self.listing_order : list[int] = []
+        self.listing_positions : dict[int, int] | None = None # Index of every listing id in listing_order, made again when needed after it changes.
+        self.view_ids : list[int] = []
+        self.view_offset = 0
+        self.row_items : list[str] = []
+        self.duplicate_rows : set[str] = set() # Items in row_items with the possible_duplicate tag.
+        self.selected_index : int | None = None # Index of the selected row in view_ids.
+        self.search_index = SearchIndex() # Every listing in listing_order.
+
+        self.busy = False # True while the buttons are disabled for a load or an added application.
+        self.new_listings_count = 0
     
-        self.load_data_into_window()
+        # Show what the last run loaded right away, and check it in the background. Otherwise load from scratch.
+        if not (Settings.LISTING_SNAPSHOT and self.load_snapshot_into_window()):
+            self.load_data_into_window()
+
+        if Settings.AUTO_REFRESH:
+            self.refresh_scheduler = RefreshScheduler(self.backend)
+            self.refresh_scheduler.start()
+            self.after(1000, self.poll_display_changes)
 
     # From: https://stackoverflow.com/a/46994404
     def treeview_sort_column(self, tv, col, reverse):
-        l = [(self.job_gridlist.set(k, col), k) for k in self.job_gridlist.get_children('')]
-        l.sort(reverse=reverse)
-
-        # rearrange items in sorted positions
-        for index, (val, k) in enumerate(l):
-            self.job_gridlist.move(k, '', index)
+        selected = self.selected_listing_id()
+        listings = self.backend.to_display_job_lsting
+        get_attribute = attrgetter(self.column_attributes[self.columns.index(col)])
+        # Both are sorted from the same order, so the rows matching the search stay in the same order as in listing_order.
+        self.listing_order.sort(key=lambda listing_id: get_attribute(listings[listing_id]), reverse=reverse)
+        self.listing_positions = None
+        self.view_ids.sort(key=lambda listing_id: get_attribute(listings[listing_id]), reverse=reverse)
+
+        # Keep the same listing selected, and go back to the top.
+        self.selected_index = None if selected is None else self.view_ids.index(selected)
+        self.view_offset = 0
+        self.render_gridlist()
 
         # reverse sort next time
         self.job_gridlist.heading(col, command=lambda: \
@@ -92,10 +159,143 @@ class GUI(tk.Frame):
         if len(item) == 0:
             return
         
+        import pyperclip # Only needed once something is copied.
         pyperclip.copy(self.job_gridlist.item(item[0], "text"))
 
+    def treeview_select(self, _):
+        item = self.job_gridlist.selection()
+        if len(item) == 0 or item[0] not in self.row_items:
+            return
+
+        self.selected_index = self.view_offset + self.row_items.index(item[0])
+
+    def selected_listing_id(self) -> int | None:
+        if self.selected_index is None:
+            return None
+
+        return self.view_ids[self.selected_index]
+
+    def visible_row_count(self) -> int:
+        """Number of rows the gridlist has room to show at its current size."""
+        if not self.job_gridlist.winfo_ismapped():
+            return int(self.job_gridlist['height'])
+
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        return max(1, self.job_gridlist.winfo_height() // row_height - 1) # Minus one for the headings.
+
+    def render_gridlist(self):
+        """Shows the rows of view_ids starting at view_offset as Treeview items.
+
+        Only the visible rows plus Settings.GRIDLIST_BUFFER_ROWS exist as items, so this costs the same however many listings there are.
+        Rows which were already shown keep their items, so scrolling or searching only inserts and deletes the rows which came in or went out.
+        """
+        visible = self.visible_row_count()
+        self.view_offset = max(0, min(self.view_offset, len(self.view_ids) - visible))
+        window = [str(listing_id) for listing_id in self.view_ids[self.view_offset:self.view_offset + visible + Settings.GRIDLIST_BUFFER_ROWS]]
+
+        # Items kept are already in the order of the window, unless the rows were sorted since; then every item is made again.
+        window_items = set(window)
+        kept = [item for item in self.row_items if item in window_items]
+        kept_items = set(kept)
+        if kept != [item for item in window if item in kept_items]:
+            kept_items = set()
+
+        gone = [item for item in self.row_items if item not in kept_items]
+        if gone:
+            self.job_gridlist.delete(*gone)
+            self.duplicate_rows.difference_update(gone)
+
+        listings = self.backend.to_display_job_lsting
+        possible_duplicates = self.backend.possible_duplicates
+        for index, item in enumerate(window):
+            listing_id = int(item)
+            duplicate = listing_id in possible_duplicates
+            tags = ("possible_duplicate",) if duplicate else ()
+
+            if item in kept_items:
+                # Possible duplicates are flagged after the rows first show up (see reconcile_callback).
+                if duplicate != (item in self.duplicate_rows):
+                    self.job_gridlist.item(item, tags=tags)
+            else:
+                listing = listings[listing_id]
+                self.job_gridlist.insert('', index, item, text=listing.url, values=(
+                        listing.company_name,
+                        listing.job_title,
+                        listing.source,
+                        listing.location
+                    ), tags=tags
+                )
+
+            if duplicate:
+                self.duplicate_rows.add(item)
+            else:
+                self.duplicate_rows.discard(item)
+
+        self.row_items = window
+        self.job_gridlist.yview_moveto(0)
+
+        if self.selected_index is not None and 0 <= self.selected_index - self.view_offset < len(self.row_items):
+            self.job_gridlist.selection_set(self.row_items[self.selected_index - self.view_offset])
+        elif self.job_gridlist.selection():
+            self.job_gridlist.selection_remove(*self.job_gridlist.selection())
+
+        self.update_vertical_scrollbar()
+
+    def update_vertical_scrollbar(self):
+        total = len(self.view_ids)
+        if total == 0:
+            self.job_gridlist_vertical_sb.set(0, 1)
+            return
+
+        self.job_gridlist_vertical_sb.set(self.view_offset / total, min(1, (self.view_offset + self.visible_row_count()) / total))
+
+    def scroll_gridlist_to(self, offset : int):
+        if offset == self.view_offset and self.row_items:
+            return
+
+        self.view_offset = offset
+        self.render_gridlist()
+
+    def gridlist_yview(self, *args):
+        """Command for the vertical scrollbar. Takes the same arguments as Treeview.yview: ("moveto", fraction) or ("scroll", count, "units" | "pages")."""
+        if args[0] == "moveto":
+            self.scroll_gridlist_to(round(float(args[1]) * len(self.view_ids)))
+        elif args[0] == "scroll":
+            step = self.visible_row_count() if args[2] == "pages" else 1
+            self.scroll_gridlist_to(self.view_offset + int(args[1]) * step)
+
+    def gridlist_yscroll(self, first, _):
+        """Called when the Treeview scrolls its own items, e.g. to show a half visible row that was clicked. Moves our window down by as much instead, so the top item is always view_offset."""
+        scrolled_rows = round(float(first) * len(self.row_items))
+        if scrolled_rows > 0:
+            self.scroll_gridlist_to(self.view_offset + scrolled_rows)
+
+    def gridlist_mouse_wheel(self, event):
+        # Linux sends Button-4/5, Windows and macOS send MouseWheel with a delta.
+        up = event.num == 4 or (event.num != 5 and event.delta > 0)
+        self.scroll_gridlist_to(self.view_offset + (-3 if up else 3))
+        return "break" # Stop the Treeview from scrolling its own items too.
+
+    def gridlist_move_selection(self, step : int):
+        """Moves the selection by step rows, scrolling to keep it on screen."""
+        if len(self.view_ids) == 0:
+            return "break"
+
+        index = 0 if self.selected_index is None else self.selected_index + step
+        self.selected_index = max(0, min(index, len(self.view_ids) - 1))
+
+        visible = self.visible_row_count()
+        if self.selected_index < self.view_offset:
+            self.view_offset = self.selected_index
+        elif self.selected_index >= self.view_offset + visible:
+            self.view_offset = self.selected_index - visible + 1
+
+        self.render_gridlist()
+        return "break"
+
     def disable_buttons(self):
         """Shortcut to disable all buttons in the GUI."""
+        self.busy = True
         self.add_button["state"] = "disabled"
         self.refresh_button["state"] = "disabled"
         self.discard_button["state"] = "disabled"
@@ -104,6 +304,7 @@ class GUI(tk.Frame):
 
     def enable_buttons(self):
         """Shortcut to enable all buttons in the GUI."""
+        self.busy = False
         self.add_button["state"] = "normal"
         self.refresh_button["state"] = "normal"
         self.discard_button["state"] = "normal"
@@ -112,7 +313,58 @@ class GUI(tk.Frame):
 
     def set_labels(self):
         self.job_count_label['text'] = f"Jobs Applied To: {self.backend.jobs_applied_to_count}"
-        self.jobs_to_apply_to['text'] = f"Jobs To Review: {str(len(self.backend.to_display_job_lsting))}"
+        self.jobs_to_apply_to['text'] = f"Jobs To Review: {self.review_count()}"
+        if self.backend.load_error is not None:
+            self.jobs_to_apply_to['text'] += f" ({self.backend.load_error})"
+
+        if Settings.SHOW_NEW_LISTINGS_COUNT and self.new_listings_count:
+            self.new_listings_label['text'] = f"{self.new_listings_count} new listing{'s' if self.new_listings_count != 1 else ''}"
+        else:
+            self.new_listings_label['text'] = ""
+
+    def poll_display_changes(self):
+        self.after(1000, self.poll_display_changes)
+        self.apply_display_changes()
+
+    def apply_display_changes(self):
+        """Applies the listings added and removed by background refreshes (see Backend.refresh_tracker) to the gridlist. Waits while a load or an added application is running."""
+        if self.busy or self.pending_listings:
+            return
+
+        added : list[int] = []
+        removed : set[int] = set()
+        while True:
+            try:
+                generation, added_ids, removed_ids = self.backend.display_changes.get_nowait()
+            except queue.Empty:
+                break
+
+            # Changes to the listings of an earlier load; those rows were already cleared.
+            if generation != self.backend.generation:
+                continue
+
+            added.extend(added_ids)
+            removed.update(removed_ids)
+
+        if not added and not removed:
+            return
+
+        if removed:
+            added = [listing_id for listing_id in added if listing_id not in removed]
+            self.remove_rows(removed)
+            self.backend.drop_listings(list(removed))
+
+        if added:
+            self.new_listings_count += len(added)
+            self.insert_listings(added)
+
+        self.set_labels()
+
+    def show_new_listings(self):
+        """Scrolls to the end of the gridlist, where listings added by background refreshes go."""
+        self.new_listings_count = 0
+        self.set_labels()
+        self.scroll_gridlist_to(len(self.view_ids))
 
     def generic_event_checker(self, event : threading.Event, callback):
         if not event.is_set():
@@ -121,39 +373,163 @@ class GUI(tk.Frame):
         
         callback()
     
+    def clear_gridlist(self):
+        """Deletes every row from the gridlist, and resets the column sizes."""
+        self.listing_order = []
+        self.listing_positions = None
+        self.view_ids = []
+        self.search_index.clear()
+        self.view_offset = 0
+        self.selected_index = None
+        self.longest_text = [15, 15, 15, 15]
+        self.render_gridlist()
+
+    def measure_text(self, text : str) -> int:
+        width = self.text_widths.get(text)
+        if width is None:
+            width = self.text_widths[text] = self.heading_font.measure(text + "____")
+        return width
+
+    def insert_listings(self, listing_ids):
+        """Adds job listings (by their id in Backend.to_display_job_lsting) to the end of the gridlist, and resizes the columns to fit them.
+        Only the ones matching the search bar are shown.
+        """
+        listings = [self.backend.to_display_job_lsting[listing_id] for listing_id in listing_ids]
+        if self.listing_positions is not None:
+            self.listing_positions.update(zip(listing_ids, range(len(self.listing_order), len(self.listing_order) + len(listing_ids))))
+        self.listing_order.extend(listing_ids)
+        for listing_id, listing in zip(listing_ids, listings):
+            self.search_index.add(listing_id, listing)
+
+        matches = self.search_index.search(self.search_text.get())
+        self.view_ids.extend(listing_ids if matches is None else [listing_id for listing_id in listing_ids if listing_id in matches])
+
+        # Measuring every string is what made big refreshes slow. Only the few longest strings (by length) of each column
+        # are measured; the widest one is nearly always among them.
+        for i, attribute in enumerate(self.column_attributes):
+            for text in heapq.nlargest(Settings.COLUMN_WIDTH_SAMPLES, (getattr(listing, attribute) for listing in listings), key=len):
+                self.longest_text[i] = max(self.longest_text[i], self.measure_text(text))
+
+        # Resize our gridlist columns nicely.
+        for i, col in enumerate(self.columns):
+            self.job_gridlist.column(col, width=self.longest_text[i])
+
+        # New listings go at the end, so the rows on screen only change if the window was not full yet.
+        if len(self.row_items) < self.visible_row_count() + Settings.GRIDLIST_BUFFER_ROWS:
+            self.render_gridlist()
+        else:
+            self.update_vertical_scrollbar()
+
+    def remove_rows(self, listing_ids : set[int]):
+        """Takes job listings out of the gridlist, keeping the same row selected unless it is one of them."""
+        selected = self.selected_listing_id()
+        self.listing_order = [listing_id for listing_id in self.listing_order if listing_id not in listing_ids]
+        self.listing_positions = None
+        self.view_ids = [listing_id for listing_id in self.view_ids if listing_id not in listing_ids]
+        for listing_id in listing_ids:
+            self.search_index.remove(listing_id)
+
+        self.selected_index = self.view_ids.index(selected) if selected is not None and selected not in listing_ids else None
+        self.render_gridlist()
+
+    def filter_gridlist(self):
+        """Shows only the rows matching the search bar (see SearchIndex), in the same order, from the top. Called on every keystroke."""
+        selected = self.selected_listing_id()
+        matches = self.search_index.search(self.search_text.get())
+        if matches is None:
+            self.view_ids = list(self.listing_order)
+        elif len(matches) * 8 < len(self.listing_order):
+            # Going through every listing takes about half a millisecond for 10k of them; sorting a few matches by position is much less.
+            if self.listing_positions is None:
+                self.listing_positions = {listing_id: position for position, listing_id in enumerate(self.listing_order)}
+            self.view_ids = sorted(matches, key=self.listing_positions.__getitem__)
+        else:
+            self.view_ids = [listing_id for listing_id in self.listing_order if listing_id in matches]
+
+        self.selected_index = self.view_ids.index(selected) if selected is not None and (matches is None or selected in matches) else None
+        self.view_offset = 0
+        self.render_gridlist()
+        self.set_labels()
+
+    def review_count(self) -> str:
+        """Number of listings to review, and how many of them match the search bar if it is in use."""
+        if len(self.view_ids) == len(self.listing_order):
+            return str(len(self.listing_order))
+
+        return f"{len(self.listing_order)} ({len(self.view_ids)} shown)"
+
     def load_data_into_window_callback(self):
         #print("Call back received")
 
-        # Delete everything from gridlist.
-        for row in self.job_gridlist.get_children():
-            self.job_gridlist.delete(row)
-        
-        # Add new listings.
-        default_font = font.nametofont("TkHeadingFont")
-        longest_text = [15, 15, 15, 15]
-        for listing in self.backend.to_display_job_lsting:
-            self.job_gridlist.insert('', 'end', None, text=listing.url, values=(
-                    listing.company_name,
-                    listing.job_title,
-                    listing.source,
-                    listing.location
-                )
-            )
-            longest_text[0] = max(longest_text[0], default_font.measure(listing.company_name + "____"))
-            longest_text[1] = max(longest_text[1], default_font.measure(listing.job_title + "____"))
-            longest_text[2] = max(longest_text[2], default_font.measure(listing.source + "____"))
-            longest_text[3] = max(longest_text[3], default_font.measure(listing.location + "____"))
+        # Delete everything from gridlist, and add new listings. Only the ones the load found: refreshes which ran since put their changes in
+        # Backend.display_changes, which apply_display_changes applies on top. Reading them here instead would wait for the backend's lock.
+        with self.load_report.stage("gui_insert"):
+            self.clear_gridlist()
+            self.insert_listings(self.backend.loaded_listing_ids)
 
-        # Resize our gridlist columns nicely.
-        for i, col in enumerate(self.columns):
-            self.job_gridlist.column(col, width=longest_text[i])
+        self.finish_loading()
+        self.load_report.finish()
+        #print("Call back done")
+
+    def drain_listing_queue(self, event : threading.Event, listing_queue : queue.Queue):
+        """Inserts listings published by Backend.load while it is still running. Only a bounded number of rows is inserted per tick so the window stays responsive."""
+        while True:
+            try:
+                self.pending_listings.extend(listing_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        chunk = [self.pending_listings.popleft() for _ in range(min(len(self.pending_listings), Settings.PROGRESSIVE_LOAD_ROWS_PER_TICK))]
+        if chunk:
+            with self.load_report.stage("gui_insert"):
+                self.insert_listings(chunk)
+            self.jobs_to_apply_to['text'] = f"Jobs To Review: {self.review_count()} (loading...)"
+
+        # The backend puts its last batch before setting the event, so once it is set an empty queue means everything is in.
+        if self.pending_listings or not event.is_set() or not listing_queue.empty():
+            self.after(1 if self.pending_listings else 50, self.drain_listing_queue, event, listing_queue)
+            return
+
+        self.finish_loading()
+        self.load_report.finish()
 
+    def finish_loading(self):
         # Add label stuff
         self.set_labels()
 
         self.loading_event.clear()
         self.enable_buttons()
-        #print("Call back done")
+
+        # Only ⟳ is left on to try again, since adding an application would most likely fail the same way.
+        if self.backend.load_error is not None:
+            self.add_button["state"] = "disabled"
+            self.discard_button["state"] = "disabled"
+
+    def load_snapshot_into_window(self) -> bool:
+        """Shows the listings saved by the last run (see Backend.load_snapshot), then checks them against a live load in the background.
+
+            Returns:
+                bool: False if there was no usable snapshot.
+        """
+        listing_ids = self.backend.load_snapshot()
+        if listing_ids is None:
+            return False
+
+        self.insert_listings(listing_ids)
+        self.set_labels()
+
+        self.disable_buttons()
+        self.loading_event = threading.Event()
+        self.generic_event_checker(self.loading_event, self.reconcile_callback)
+
+        thread = threading.Thread(target=self.backend.reconcile, args=(self.loading_event, ))
+        thread.start()
+        return True
+
+    def reconcile_callback(self):
+        self.finish_loading()
+        self.render_gridlist() # Possible duplicates are only flagged once reconciled.
+        self.apply_display_changes()
 
     def load_data_into_window(self):
         self.disable_buttons()
@@ -163,8 +539,21 @@ class GUI(tk.Frame):
             return
 
         self.loading_event = threading.Event()
-        self.generic_event_checker(self.loading_event, self.load_data_into_window_callback)
-        thread = threading.Thread(target=self.backend.load, args=(self.loading_event, ))
+
+        # The backend drops the listings the rows refer to as soon as it starts loading.
+        self.clear_gridlist()
+        self.new_listings_count = 0
+        self.load_report = RefreshReport("load")
+
+        if Settings.PROGRESSIVE_LOAD:
+            listing_queue = queue.Queue()
+            self.pending_listings = deque()
+            self.drain_listing_queue(self.loading_event, listing_queue)
+            thread = threading.Thread(target=self.backend.load, args=(self.loading_event, listing_queue, self.load_report))
+        else:
+            self.generic_event_checker(self.loading_event, self.load_data_into_window_callback)
+            thread = threading.Thread(target=self.backend.load, args=(self.loading_event, None, self.load_report))
+
         thread.start()
     
     def add_application(self):
@@ -174,8 +563,7 @@ class GUI(tk.Frame):
         self.enable_buttons()
 
     def start_add_application(self):
-        item = self.job_gridlist.selection()
-        if len(item) == 0:
+        if self.selected_index is None:
             return
         
         if self.loading_event.is_set():
@@ -186,15 +574,14 @@ class GUI(tk.Frame):
         self.loading_event = threading.Event()
         self.generic_event_checker(self.loading_event, self.add_application)
 
-        item_details = self.job_gridlist.item(item[0])
-        self.job_gridlist.delete(item[0])
+        listing_id = self.selected_listing_id()
+        self.remove_rows({listing_id})
 
-        thread = threading.Thread(target=self.backend.add_application, args=(self.loading_event,"Applied", item_details['values'][0], item_details['values'][1], item_details['values'][3], item_details['text']))
+        thread = threading.Thread(target=self.backend.add_application, args=(self.loading_event,"Applied", listing_id))
         thread.start()
 
     def start_add_discard(self):
-        item = self.job_gridlist.selection()
-        if len(item) == 0:
+        if self.selected_index is None:
             return
         
         if self.loading_event.is_set():
@@ -205,10 +592,10 @@ class GUI(tk.Frame):
         self.loading_event = threading.Event()
         self.generic_event_checker(self.loading_event, self.add_application)
 
-        item_details = self.job_gridlist.item(item[0])
-        self.job_gridlist.delete(item[0])
+        listing_id = self.selected_listing_id()
+        self.remove_rows({listing_id})
 
-        thread = threading.Thread(target=self.backend.add_application, args=(self.loading_event, "Discarded", item_details['values'][0], item_details['values'][1], item_details['values'][3], item_details['text']))
+        thread = threading.Thread(target=self.backend.add_application, args=(self.loading_event, "Discarded", listing_id))
         thread.start()
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import os
+import struct
+import sys
+import zlib
+
+from array import array
+
+from apptracker.trackers.joblisting import JobListing
+
+# Saved copy of the listings shown after the last load, so the next start can show them before anything is downloaded.
+# File format: header (magic, schema version), then a zlib-compressed body. In the body, every string is stored once in a
+# string table and everything else refers to strings and listings by index:
+#     jobs applied to count
+#     string table: count, byte length of each string, then all strings (utf-8) back to back
+#     listings: count, then 5 string indices per listing (the fields of JobListing, in order)
+#     shown listings: count, then a listing index each
+#     trackers: count, then for each one its provider name, ETag and Last-Modified (string indices, NONE if missing),
+#               and its last parsed listings (count, then a listing index each)
+# Every number is an unsigned 32 bit little-endian integer. Bump SNAPSHOT_VERSION whenever this changes; older files are ignored.
+SNAPSHOT_MAGIC = b"ATSN"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<4sH")
+NONE = 0xFFFFFFFF
+
+class ListingSnapshot:
+    def __init__(self, listings : list[JobListing], jobs_applied_to_count : int, trackers : dict[str, tuple[str | None, str | None, list[JobListing]]]):
+        """
+            Args:
+                listings (list[JobListing]): Listings shown, in order.
+                jobs_applied_to_count (int): Number of jobs applied to.
+                trackers (dict[str, tuple[str | None, str | None, list[JobListing]]]): trackers[ PROVIDER NAME ] = (ETag, Last-Modified, job listings) of the README it last parsed.
+        """
+        self.listings = listings
+        self.jobs_applied_to_count = jobs_applied_to_count
+        self.trackers = trackers
+
+    def write(self, path : str) -> None:
+        """Writes the snapshot to path. The file is replaced in one step, so a crash leaves either the old or the new snapshot."""
+        strings : dict[str, int] = {}
+        listings : dict[JobListing, int] = {}
+        fields = array("I")
+
+        def string_index(text : str | None) -> int:
+            if text is None:
+                return NONE
+            return strings.setdefault(text, len(strings))
+
+        def listing_index(listing : JobListing) -> int:
+            index = listings.get(listing)
+            if index is None:
+                index = listings[listing] = len(listings)
+                fields.extend((string_index(listing.company_name), string_index(listing.job_title), string_index(listing.location), string_index(listing.url), string_index(listing.source)))
+            return index
+
+        shown = array("I", map(listing_index, self.listings))
+        trackers = [
+            (string_index(name), string_index(etag), string_index(last_modified), array("I", map(listing_index, tracker_listings)))
+            for name, (etag, last_modified, tracker_listings) in self.trackers.items()
+        ]
+
+        encoded = [text.encode("utf-8") for text in strings]
+        parts = [
+            _pack(array("I", (self.jobs_applied_to_count, len(encoded)))),
+            _pack(array("I", map(len, encoded))),
+            b"".join(encoded),
+            _pack(array("I", (len(listings), ))),
+            _pack(fields),
+            _pack(array("I", (len(shown), ))),
+            _pack(shown),
+            _pack(array("I", (len(trackers), ))),
+        ]
+        for name, etag, last_modified, tracker_listings in trackers:
+            parts.append(_pack(array("I", (name, etag, last_modified, len(tracker_listings)))))
+            parts.append(_pack(tracker_listings))
+
+        # Several processes (e.g. the GUI and apptracker.cli) may save at once; each writes its own temporary file.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+            file.write(zlib.compress(b"".join(parts), 1))
+
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def read(path : str) -> "ListingSnapshot | None":
+        """Reads a snapshot written by write.
+
+            Returns:
+                The snapshot, or None if there is none, or it is from another schema version or unreadable.
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) < HEADER.size:
+            print(f"Ignoring snapshot {path}: file is too short")
+            return None
+
+        magic, version = HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            print(f"Ignoring snapshot {path}: not a version {SNAPSHOT_VERSION} snapshot")
+            return None
+
+        try:
+            return ListingSnapshot._decode(memoryview(zlib.decompress(data[HEADER.size:])))
+        except (zlib.error, IndexError, ValueError) as e:
+            print(f"Ignoring snapshot {path}: {e}")
+            return None
+
+    @staticmethod
+    def _decode(body : memoryview) -> "ListingSnapshot":
+        position = 0
+
+        def ints(count : int) -> array:
+            nonlocal position
+            values = _unpack(body[position:position + 4 * count])
+            if len(values) != count:
+                raise ValueError("snapshot is truncated")
+
+            position += 4 * count
+            return values
+
+        jobs_applied_to_count, string_count = ints(2)
+
+        strings : list[str | None] = []
+        for length in ints(string_count):
+            strings.append(str(body[position:position + length], "utf-8"))
+            position += length
+
+        # Indices are checked by the lookups below; NONE is the only index allowed past the end.
+        def string(index : int) -> str | None:
+            return None if index == NONE else strings[index]
+
+        listing_count, = ints(1)
+        fields = ints(5 * listing_count)
+        # The same iterator passed five times hands each JobListing the next five fields.
+        field_strings = map(strings.__getitem__, fields)
+        listings = list(map(JobListing, field_strings, field_strings, field_strings, field_strings, field_strings))
+
+        shown_count, = ints(1)
+        shown = [listings[index] for index in ints(shown_count)]
+
+        trackers : dict[str, tuple[str | None, str | None, list[JobListing]]] = {}
+        tracker_count, = ints(1)
+        for _ in range(tracker_count):
+            name, etag, last_modified, count = ints(4)
+            trackers[strings[name]] = (string(etag), string(last_modified), [listings[index] for index in ints(count)])
+
+        return ListingSnapshot(shown, jobs_applied_to_count, trackers)
+
+def _pack(values : array) -> bytes:
+    if sys.byteorder == "big":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+def _unpack(data : memoryview) -> array:
+    values = array("I")
+    values.frombytes(data[:len(data) - len(data) % 4])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
@@ -0,0 +1,154 @@
+import contextlib
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+
+from collections.abc import Iterator
+
+from apptracker.settings import Settings
+
+_active : "RefreshReport | None" = None
+
+def active() -> "RefreshReport":
+    """Gets the report of the load or refresh running now (see RefreshReport.running). Outside of one, a report which is thrown away, so instrumented code never has to check."""
+    return _active if _active is not None else RefreshReport("none")
+
+# Timings and counters of one load or refresh, from the trackers down to the GUI.
+class RefreshReport:
+    """Collects how long each stage of a load or refresh took and what it did, overall and per tracker.
+
+    Stages are timed in seconds and add up if a stage runs more than once. Trackers run at the same time on their own threads, so their
+    stages overlap each other and the backend's. Counters include cache_hits / cache_misses / not_modified (README downloads answered from
+    the requests_cache cache, downloaded, or revalidated with a 304), bytes (downloaded), rows_parsed / rows_reused (table rows parsed, or
+    reused from the previous parse), listings, and sheets_api_calls.
+
+    Set Settings.PROFILE to also profile it with cProfile (every thread taking part) and/or tracemalloc.
+    """
+    def __init__(self, kind : str):
+        self.kind = kind # "load", "reconcile" or "refresh PROVIDER NAME".
+        self.started_at = time.time()
+        self.duration : float | None = None
+        self.stages : dict[str, float] = {}
+        self.counters : dict[str, int] = {}
+        self.trackers : dict[str, dict[str, dict[str, float | int]]] = {}
+        # self.trackers[ PROVIDER NAME ] = {"stages": {...}, "counters": {...}} of that tracker.
+        self.profiles : list[cProfile.Profile] = []
+        self.profile_file : str | None = None
+        self.memory : dict | None = None
+
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _section(self, name : str, tracker : str | None) -> dict:
+        if tracker is None:
+            return self.stages if name == "stages" else self.counters
+
+        return self.trackers.setdefault(tracker, {"stages": {}, "counters": {}})[name]
+
+    def add_time(self, stage : str, seconds : float, tracker : str | None = None) -> None:
+        with self._lock:
+            stages = self._section("stages", tracker)
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def count(self, counter : str, n : int = 1, tracker : str | None = None) -> None:
+        with self._lock:
+            counters = self._section("counters", tracker)
+            counters[counter] = counters.get(counter, 0) + n
+
+    @contextlib.contextmanager
+    def stage(self, stage : str, tracker : str | None = None) -> Iterator[None]:
+        """Times the code inside the with block as a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start, tracker)
+
+    @contextlib.contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        """Profiles the code inside the with block with cProfile, if Settings.PROFILE asks for it. cProfile only sees the thread it runs on, so every thread doing work for the refresh uses this."""
+        if "cprofile" not in Settings.PROFILE:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self.profiles.append(profile)
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator["RefreshReport"]:
+        """Makes this the active report (see active) for the with block, profiling it if Settings.PROFILE asks for it. Only one load or refresh runs at a time (see Backend.lock)."""
+        global _active
+        previous, _active = _active, self
+
+        trace_memory = "tracemalloc" in Settings.PROFILE and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
+        try:
+            with self.profile_thread():
+                yield self
+        finally:
+            _active = previous
+
+            if trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+                tracemalloc.stop()
+                self.memory = {"current": current, "peak": peak, "top": [str(statistic) for statistic in top]}
+
+    def finish(self) -> None:
+        """Stops the clock, saves the cProfile stats (if any), prints a summary if Settings.REFRESH_REPORT is on and appends the report to Settings.REFRESH_REPORT_FILE if it is set."""
+        self.duration = time.perf_counter() - self._start
+
+        if self.profiles:
+            self.profile_file = f"profile_{self.kind.replace(' ', '_')}_{int(self.started_at)}.prof"
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(self.profile_file)
+
+        if Settings.REFRESH_REPORT:
+            print(self.summary())
+
+        if Settings.REFRESH_REPORT_FILE:
+            try:
+                with open(Settings.REFRESH_REPORT_FILE, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(self.to_dict()) + "\n")
+            except OSError as e:
+                print(f"Could not save refresh report: {e}")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "started_at": self.started_at,
+                "duration": self.duration,
+                "stages": dict(self.stages),
+                "counters": dict(self.counters),
+                "trackers": {name: {"stages": dict(tracker["stages"]), "counters": dict(tracker["counters"])} for name, tracker in self.trackers.items()},
+                "profile_file": self.profile_file,
+                "memory": self.memory,
+            }
+
+    def summary(self) -> str:
+        """One line: the total time, then the time and counters of every stage, then each tracker's."""
+        def describe(stages : dict, counters : dict) -> str:
+            return ", ".join([f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in stages.items()] + [f"{counter} {n}" for counter, n in counters.items()])
+
+        report = self.to_dict()
+        parts = [f"{self.kind}: {(self.duration or 0) * 1000:.0f} ms", describe(report["stages"], report["counters"])]
+        parts += [f"[{name}] {describe(tracker['stages'], tracker['counters'])}" for name, tracker in report["trackers"].items()]
+        if self.profile_file is not None:
+            parts.append(f"profile saved to {self.profile_file}")
+        if self.memory is not None:
+            parts.append(f"peak memory {self.memory['peak'] / 1024 / 1024:.1f} MB")
+        return " | ".join(part for part in parts if part)
@@ -0,0 +1,94 @@
+import random
+import threading
+
+from time import monotonic
+
+from apptracker.settings import Settings
+import apptracker.trackers.tracker_settings as tracker_settings
+
+class RefreshScheduler:
+    """Refreshes each tracker of a Backend in the background on its own interval (tracker_settings.REFRESH_INTERVALS), through Backend.refresh_tracker.
+    Waits are jittered by Settings.AUTO_REFRESH_JITTER, and a tracker which keeps failing waits twice as long each time, up to Settings.AUTO_REFRESH_MAX_BACKOFF.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.stop_event = threading.Event()
+        self.thread : threading.Thread | None = None
+
+        # Filled in by schedule_all once the backend has its trackers.
+        self.failures : list[int] = []
+        # self.failures[ TRACKER POSITION ] = failed refreshes in a row.
+        self.next_refresh : list[float] = []
+        # self.next_refresh[ TRACKER POSITION ] = time.monotonic() at which the tracker is refreshed next.
+
+    def schedule_all(self) -> None:
+        """Schedules the first refresh of every tracker."""
+        trackers = self.backend.tracker.trackers
+        self.failures = [0] * len(trackers)
+        self.next_refresh = [monotonic() + self.next_wait(position) for position in range(len(trackers))]
+
+    def interval(self, position : int) -> float:
+        """Seconds between refreshes of the tracker at the given position when it works. Never shorter than its cache lifetime, since a refresh before then would be answered from the cache anyway."""
+        tracker = self.backend.tracker.trackers[position]
+        interval = tracker_settings.REFRESH_INTERVALS.get(tracker.provider_name, 15 * 60)
+
+        return max(interval, tracker.cache_lifetime())
+
+    def next_wait(self, position : int) -> float:
+        """Seconds to wait before refreshing the tracker at the given position again, with jitter and backoff applied."""
+        wait = min(self.interval(position) * 2 ** self.failures[position], max(self.interval(position), Settings.AUTO_REFRESH_MAX_BACKOFF))
+
+        return wait * random.uniform(1 - Settings.AUTO_REFRESH_JITTER, 1 + Settings.AUTO_REFRESH_JITTER)
+
+    def run_due(self) -> None:
+        """Refreshes every tracker which is due, then schedules its next refresh."""
+        for position, due in enumerate(self.next_refresh):
+            if self.stop_event.is_set():
+                return
+
+            if monotonic() < due:
+                continue
+
+            try:
+                succeeded = self.backend.refresh_tracker(position)
+            except Exception as e:
+                # Google Sheets failing is no reason to stop refreshing.
+                print(f"Could not refresh {self.backend.tracker.trackers[position].provider_name}: {e}")
+                succeeded = False
+
+            self.failures[position] = 0 if succeeded else self.failures[position] + 1
+            self.next_refresh[position] = monotonic() + self.next_wait(position)
+
+    def run(self) -> None:
+        # Waits for the first load, which holds the backend's lock while it sets the trackers up.
+        # If that fails (no key.json, no network...), tries again later rather than giving up on refreshing.
+        while not self.stop_event.is_set():
+            try:
+                self.backend.connect()
+                break
+            except Exception as e:
+                print(f"Could not start refreshing: {e}")
+                self.stop_event.wait(Settings.AUTO_REFRESH_MAX_BACKOFF)
+
+        if self.stop_event.is_set():
+            return
+
+        self.schedule_all()
+
+        while not self.stop_event.is_set():
+            self.run_due()
+
+            if self.next_refresh:
+                self.stop_event.wait(max(0, min(self.next_refresh) - monotonic()))
+            else:
+                self.stop_event.wait()
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
@@ -0,0 +1,132 @@
+import bisect
+import functools
+import re
+import unicodedata
+
+from apptracker.trackers.joblisting import JobListing
+
+# Letters and digits of any script, so "Société" stays one word.
+WORD_RE = re.compile(r'[^\W_]+')
+# Sorts after every character WORD_RE matches, so vocabulary[bisect(prefix) : bisect(prefix + WORD_END)] are the words starting with prefix.
+WORD_END = "\U0010ffff"
+
+@functools.lru_cache(maxsize=65536)
+def text_words(text : str) -> tuple[str, ...]:
+    """Casefolded words of a company name, job title, location or source without accents, each once: "Société Générale" gives (societe, generale),
+    which "societe" and "soci" both find. Most of them repeat across listings, hence the cache.
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+
+    return tuple(dict.fromkeys(WORD_RE.findall(text)))
+
+# Finds listings by the words in their company name, job title, location and source, as fast as the search bar can be typed in.
+class SearchIndex:
+    """Inverted index of the words of the listings shown: for every word, the ids of the listings which have it.
+
+    A query is split into words like the listings are, and a listing matches if each query word starts one of its words; "jane str new"
+    finds Jane Street's listings in New York. The words of the index are also kept sorted, so the words starting with a query word are one
+    range of them (found by bisection) however many there are. Listings are added and removed one by one, so the index never has to be built again.
+    """
+    def __init__(self):
+        self.postings : dict[str, set[int]] = {}
+        # self.postings[ WORD ] = ids of the listings with that word.
+        self.listing_words : dict[int, tuple[str, ...]] = {}
+        # self.listing_words[ LISTING ID ] = its words, to take it out of self.postings again.
+        self.vocabulary : list[str] = [] # Every word in self.postings, sorted.
+        self.prefix_cache : dict[str, set[int]] = {}
+        # self.prefix_cache[ PREFIX ] = ids of the listings with a word starting with it. Typing a query asks for the same prefixes over and over.
+        # Words and result of the last search. Typing only ever makes a query narrower, so the next result can be found among these.
+        self.last_terms : tuple[str, ...] = ()
+        self.last_matches : set[int] | None = None
+
+    def add(self, listing_id : int, listing : JobListing) -> None:
+        words = tuple(dict.fromkeys(
+            text_words(listing.company_name) + text_words(listing.job_title) + text_words(listing.location) + text_words(listing.source)
+        ))
+        self.listing_words[listing_id] = words
+
+        for word in words:
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+                bisect.insort(self.vocabulary, word)
+
+            ids.add(listing_id)
+
+        self.forget_searches()
+
+    def remove(self, listing_id : int) -> None:
+        """Removes a listing, if it was added."""
+        words = self.listing_words.pop(listing_id, None)
+        if words is None:
+            return
+
+        for word in words:
+            ids = self.postings[word]
+            ids.discard(listing_id)
+            if not ids:
+                del self.postings[word]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]
+
+        self.forget_searches()
+
+    def clear(self) -> None:
+        self.postings.clear()
+        self.listing_words.clear()
+        self.vocabulary.clear()
+        self.forget_searches()
+
+    def forget_searches(self) -> None:
+        """Empties the caches of earlier searches. The index does this itself whenever listings change."""
+        if self.prefix_cache:
+            self.prefix_cache.clear()
+        self.last_terms = ()
+        self.last_matches = None
+
+    def __len__(self) -> int:
+        return len(self.listing_words)
+
+    def prefix_matches(self, prefix : str) -> set[int]:
+        """Ids of the listings with a word starting with prefix. The set returned must not be changed."""
+        ids = self.prefix_cache.get(prefix)
+        if ids is not None:
+            return ids
+
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + WORD_END, start)
+        if end - start == 1:
+            ids = self.postings[self.vocabulary[start]]
+        else:
+            ids = set().union(*[self.postings[word] for word in self.vocabulary[start:end]])
+
+        self.prefix_cache[prefix] = ids
+        return ids
+
+    def search(self, query : str) -> set[int] | None:
+        """Finds the listings matching every word of query (see SearchIndex).
+
+            Returns:
+                set[int] | None: Ids of the listings which match, or None if query has no words (every listing matches). The set returned must not be changed.
+        """
+        terms = text_words(query)
+        if not terms:
+            return None
+
+        # If every word of the last query starts a word of this one ("jane st" after "jane s"), this matches a subset of what it did,
+        # so only the words which are new or longer need to be looked up.
+        candidates = None
+        if self.last_matches is not None and all(any(term.startswith(last_term) for term in terms) for last_term in self.last_terms):
+            candidates = self.last_matches
+            terms = tuple(term for term in terms if term not in self.last_terms)
+
+        # Intersecting the smallest sets first keeps every step as small as the result.
+        matches = sorted((self.prefix_matches(term) for term in terms), key=len)
+        if candidates is not None:
+            matches.insert(0, candidates)
+
+        result = matches[0] if len(matches) == 1 else matches[0].intersection(*matches[1:])
+        self.last_terms = text_words(query)
+        self.last_matches = result
+        return result
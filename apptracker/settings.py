@@ -1,5 +1,45 @@
+import os
+
 class Settings:
     SHEET_KEY_FILE = "sheet_key.txt"
     KEY_FILE_PATH = "key.json"
 
+    # Added and discarded applications are sent to Google Sheets in batches.
+    SHEETS_PENDING_ROWS_FILE = "pending_rows.json" # Rows not sent yet, kept here in case the app crashes.
+    SHEETS_FLUSH_ROW_COUNT = 25 # Send once this many rows are waiting...
+    SHEETS_FLUSH_INTERVAL = 30 # ...or this many seconds after the first one was queued.
+
+    # Local copy of the Applications and Ignore worksheets. Reloads only download rows added since the last one.
+    SHEETS_MIRROR_FILE = "sheets_mirror.sqlite"
+    SHEETS_MIRROR_FULL_SYNC_INTERVAL = 24 * 60 * 60 # Seconds between full downloads, to catch edits to old rows.
+
+    # Show job listings while they are still being loaded, instead of all at once when loading is done.
+    PROGRESSIVE_LOAD = True
+    PROGRESSIVE_LOAD_BATCH_SIZE = 50 # Listings the backend hands to the GUI at a time.
+    PROGRESSIVE_LOAD_ROWS_PER_TICK = 250 # Most rows the GUI inserts before letting Tk handle other events.
+
+    # The listing view only keeps the rows on screen as Tk items, and swaps them in as you scroll.
+    GRIDLIST_BUFFER_ROWS = 10 # Extra rows kept below the visible ones.
+    COLUMN_WIDTH_SAMPLES = 5 # Longest strings of each column that are measured to size it.
+
+    # Refresh trackers in the background while the app is open (intervals are in trackers/tracker_settings.py).
+    AUTO_REFRESH = True
+    AUTO_REFRESH_JITTER = 0.1 # Each wait is randomly up to 10% shorter or longer, so trackers drift apart instead of firing together.
+    AUTO_REFRESH_MAX_BACKOFF = 60 * 60 # Longest wait, in seconds, after a tracker keeps failing. Each failure doubles the wait.
+    SHOW_NEW_LISTINGS_COUNT = True # Show how many listings background refreshes added since the last manual refresh.
+
+    # Listings shown after the last load are saved here, and shown right away on the next start while the live load runs.
+    LISTING_SNAPSHOT = True
+    LISTING_SNAPSHOT_FILE = "listing_snapshot.bin"
+
+    # Mark listings which look like the same job as one shown above them, e.g. "SWE Intern - Summer 2025" at "Jane Street Capital" and "Software Engineer Intern"
+    # at "Jane Street" from another job board. They are still shown; see DuplicateIndex.
+    NEAR_DUPLICATES = True
+    NEAR_DUPLICATE_THRESHOLD = 0.8 # Share of their job title words (after spelling out abbreviations) two listings need in common.
 
+    # Every load and refresh is timed stage by stage (see RefreshReport). Its summary is printed, and its full report appended as a JSON line to
+    # REFRESH_REPORT_FILE if set. Profiling with "cprofile" and/or "tracemalloc" (comma separated) is off unless PROFILE asks for it.
+    # The file and profiling can also be set from the environment: APPTRACKER_REFRESH_REPORT=reports.jsonl APPTRACKER_PROFILE=cprofile,tracemalloc
+    REFRESH_REPORT = True
+    REFRESH_REPORT_FILE = os.environ.get("APPTRACKER_REFRESH_REPORT") or None
+    PROFILE = os.environ.get("APPTRACKER_PROFILE", "").lower()
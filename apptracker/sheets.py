@@ -1,104 +1,67 @@
+import atexit
 import gspread
+import json
+import os
+import requests
+import threading
 
-from apptracker.trackers.tracker_settings import JOB_LISTINGS_ACTUAL_LINKS
+import apptracker.refresh_report as refresh_report
 from apptracker.settings import Settings
-from apptracker.sheet_row import SheetRow
+from apptracker.sheets_mirror import SheetsMirror
+from apptracker.status_index import JobStatus, StatusIndex, PLACEHOLDER_URLS
+from apptracker.trackers.joblisting import JobListing
 
 from time import time
-from enum import Enum
-
-class JobStatus(Enum):
-    NOT_APPLIED = 1
-    APPLIED = 2
-    DISCARDED = 3
+from typing import Sequence
 
 class Sheets:
     def __init__(self):
-        """Initializes the gspread objects used for making calls to Google Sheets. Loads data into self.applied and self.discarded. """
+        """Initializes the gspread objects used for making calls to Google Sheets. Loads data into self.statuses from the local mirror, so statuses are available before the first reload. """
         self.gc = gspread.service_account(filename=Settings.KEY_FILE_PATH)
 
         with open(Settings.SHEET_KEY_FILE, "r") as file:
-            self.sh = self.gc.open_by_key(file.read())
+            sheet_key = file.read()
+            self.sh = self.gc.open_by_key(sheet_key)
 
         self.applied_ws = self.sh.worksheet("Applications")
         self.discarded_ws = self.sh.worksheet("Ignore")
 
-        self.applied : dict[str, dict[str, list[SheetRow]]] = {}
-        self.discarded : dict[str, dict[str, list[SheetRow]]] = {}
-        # The structure of applied and discarded is as follows:
-        # self.applied[ COMPANY NAME ][ JOB TITLE ] = list of job applications corresponding to this.
-        self.applied_by_url : dict[str, list[SheetRow]] = {}
-        self.discarded_by_url : dict[str, list[SheetRow]] = {}
+        # Status of every job in both worksheets.
+        self.statuses = StatusIndex()
 
         self.applied_last_row_id = 0
         self.discarded_last_row_id = 0
 
         self.last_reload_time = 0
 
-    def _add_discarded_dict(self, row_id : int, company_name : str, job_title : str, job_location : str, url : str) -> None:
-        """Handles adding a discarded application to the dictionary inside this class."""
-        if not company_name in self.discarded:
-            self.discarded[company_name] = {}
-        
-        if not job_title in self.discarded[company_name]:
-            self.discarded[company_name][job_title] = []
-        
-        self.discarded[company_name][job_title].append(
-            SheetRow(
-                row_id,
-                company_name,
-                job_title,
-                job_location,
-                url
-            )
-        )
-
-        if not url in self.discarded_by_url:
-            self.discarded_by_url[url] = []
-        
-        self.discarded_by_url[url].append(
-            SheetRow(
-                row_id,
-                company_name,
-                job_title,
-                job_location,
-                url
-            )
-        )
-
-    def _add_applied_dict(self, row_id : int, company_name : str, job_title : str, job_location : str, url : str) -> None:
-        """Handles adding an "applied to" application to the dictionary inside this class."""
-        if not company_name in self.applied:
-            self.applied[company_name] = {}
-        
-        if not job_title in self.applied[company_name]:
-            self.applied[company_name][job_title] = []
-
-        self.applied[company_name][job_title].append(
-            SheetRow(
-                row_id,
-                company_name,
-                job_title,
-                job_location,
-                url
-            )
-        )
-
-        if not url in self.applied_by_url:
-            self.applied_by_url[url] = []
-        
-        self.applied_by_url[url].append(
-            SheetRow(
-                row_id,
-                company_name,
-                job_title,
-                job_location,
-                url
-            )
-        )
+        # Write-behind buffer. Added rows go straight into the status index above, but are only sent to Google Sheets
+        # in batches by flush(). Until then they are kept on disk, so they survive a crash.
+        # self.pending_rows[ WORKSHEET TITLE ] = rows waiting to be appended, in sheet format: Job Name - Title - URL - Location
+        self.worksheets : dict[str, gspread.Worksheet] = {self.applied_ws.title: self.applied_ws, self.discarded_ws.title: self.discarded_ws}
+        self.pending_rows : dict[str, list[list[str]]] = {title: [] for title in self.worksheets}
+        self.pending_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.flush_timer : threading.Timer | None = None
+
+        self._load_pending_rows()
+        # Rows saved by a run that crashed mid-flush may already be on Google Sheets; the first reload drops those.
+        self.check_recovered_rows = any(self.pending_rows.values())
+
+        atexit.register(self.flush)
+
+        self.mirror = SheetsMirror(Settings.SHEETS_MIRROR_FILE, sheet_key)
+        self._rebuild()
+
+    def _add_discarded_dict(self, company_name : str, job_title : str, job_location : str, url : str) -> None:
+        """Handles adding a discarded application to the status index inside this class."""
+        self.statuses.add(JobStatus.DISCARDED, company_name, job_title, job_location, url)
+
+    def _add_applied_dict(self, company_name : str, job_title : str, job_location : str, url : str) -> None:
+        """Handles adding an "applied to" application to the status index inside this class."""
+        self.statuses.add(JobStatus.APPLIED, company_name, job_title, job_location, url)
     
     def reload(self, force : bool = False) -> None:
-        """Reloads data inside this class by fetching data from sheets. This ensures we are not out of sync. There is an inbuilt cooldown of 5 seconds which can be skipped by the force param.
+        """Reloads data inside this class by syncing the local mirror with sheets. This ensures we are not out of sync. There is an inbuilt cooldown of 5 seconds which can be skipped by the force param.
 
             Args:
                 force (bool): If true, skips the 5 second cooldown between reloads. By default, this is false.
@@ -109,91 +72,209 @@ class Sheets:
                 return
 
         self.last_reload_time = time()
-    
-        self.applied : dict[str, dict[str, list[SheetRow]]] = {}
-        self.discarded : dict[str, dict[str, list[SheetRow]]] = {}
-    
-        self.applied_last_row_id = 0
-        self.discarded_last_row_id = 0
 
-        applied_values = self.applied_ws.get_all_values()
-        for row_id, row in enumerate(applied_values):
+        # Both syncs have to run, so don't short-circuit.
+        with refresh_report.active().stage("sheets_reload"):
+            changed = [self.mirror.sync(self.applied_ws), self.mirror.sync(self.discarded_ws)]
+            if any(changed) or self.check_recovered_rows:
+                self._rebuild()
+
+        if self.check_recovered_rows:
+            self.check_recovered_rows = False
+            with self.pending_lock:
+                self._save_pending_rows()
+            self._schedule_flush()
+
+    def _rebuild(self) -> None:
+        """Rebuilds self.statuses from the mirror and the rows waiting to be flushed."""
+        self.statuses = StatusIndex()
+
+        applied_values = self.mirror.rows(self.applied_ws.title)
+        for row in applied_values:
             # row format: Job Name - Title - URL - Location
-            self._add_applied_dict(row_id, row[0], row[1], row[3], row[2])
+            self._add_applied_dict(row[0], row[1], row[3], row[2])
     
-        self.applied_last_row_id = len(applied_values)
+        self.applied_last_row_id = len(applied_values) + self._add_pending_rows(self.applied_ws, applied_values, self._add_applied_dict)
 
-        discarded_values = self.discarded_ws.get_all_values()
-        for row_id, row in enumerate(discarded_values):
+        discarded_values = self.mirror.rows(self.discarded_ws.title)
+        for row in discarded_values:
             # row format: Job Name - Title - URL - Location
-            self._add_discarded_dict(row_id, row[0], row[1], row[3], row[2])
+            self._add_discarded_dict(row[0], row[1], row[3], row[2])
+
+        self.discarded_last_row_id = len(discarded_values) + self._add_pending_rows(self.discarded_ws, discarded_values, self._add_discarded_dict)
+
+    def _add_pending_rows(self, worksheet : gspread.Worksheet, values : list[list[str]], add_dict) -> int:
+        """Adds the rows still waiting to be flushed to worksheet into our status index, since the mirror only has what is on Google Sheets.
+
+            Args:
+                worksheet (gspread.Worksheet): Worksheet the rows are waiting for.
+                values (list[list[str]]): Mirrored rows of worksheet.
+                add_dict: self._add_applied_dict or self._add_discarded_dict.
+
+            Returns:
+                int: How many rows were added.
+        """
+        uploaded = {tuple(row[:4]) for row in values}
+
+        with self.pending_lock:
+            rows = self.pending_rows[worksheet.title]
+            if self.check_recovered_rows:
+                rows[:] = [row for row in rows if tuple(row) not in uploaded]
+
+            added = 0
+            for row in rows:
+                # A flush running right now may have uploaded it already.
+                if tuple(row) in uploaded:
+                    continue
+
+                added += 1
+                add_dict(row[0], row[1], row[3], row[2])
+
+        return added
+
+    def _load_pending_rows(self) -> None:
+        """Loads rows that a previous run queued but never flushed."""
+        try:
+            with open(Settings.SHEETS_PENDING_ROWS_FILE, "r") as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            return
+
+        for title, rows in saved.items():
+            if title in self.pending_rows:
+                self.pending_rows[title].extend(rows)
+
+    def _save_pending_rows(self) -> None:
+        """Writes self.pending_rows to disk. The file is replaced in one step, so a crash leaves either the old or the new queue. Call with self.pending_lock held."""
+        temp_path = Settings.SHEETS_PENDING_ROWS_FILE + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.pending_rows, file)
+
+        os.replace(temp_path, Settings.SHEETS_PENDING_ROWS_FILE)
+
+    def _queue_row(self, worksheet : gspread.Worksheet, company_name : str, job_title : str, job_location : str, url : str) -> None:
+        """Queues a row to be appended to worksheet. See _queue_rows."""
+        self._queue_rows(worksheet, [[company_name, job_title, url, job_location]])
 
-        self.discarded_last_row_id = len(discarded_values)
+    def _queue_rows(self, worksheet : gspread.Worksheet, rows : list[list[str]]) -> None:
+        """Queues rows (in sheet format: Job Name - Title - URL - Location) to be appended to worksheet. Flushes right away once Settings.SHEETS_FLUSH_ROW_COUNT rows are waiting, otherwise within Settings.SHEETS_FLUSH_INTERVAL seconds."""
+        with self.pending_lock:
+            self.pending_rows[worksheet.title].extend(rows)
+            self._save_pending_rows()
+            pending_count = sum(len(rows) for rows in self.pending_rows.values())
+
+        if pending_count >= Settings.SHEETS_FLUSH_ROW_COUNT:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        with self.pending_lock:
+            if self.flush_timer is not None or not any(self.pending_rows.values()):
+                return
+
+            self.flush_timer = threading.Timer(Settings.SHEETS_FLUSH_INTERVAL, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    def flush(self) -> None:
+        """Sends every queued row to Google Sheets, with one append_rows call per worksheet. Rows that fail to send stay queued and are retried later."""
+        with self.flush_lock:
+            with self.pending_lock:
+                if self.flush_timer is not None:
+                    self.flush_timer.cancel()
+                    self.flush_timer = None
+
+                batches = {title: list(rows) for title, rows in self.pending_rows.items() if rows}
+
+            for title, rows in batches.items():
+                try:
+                    refresh_report.active().count("sheets_api_calls")
+                    self.worksheets[title].append_rows(rows, value_input_option = "USER_ENTERED")
+                except (gspread.exceptions.GSpreadException, requests.exceptions.RequestException) as e:
+                    print(f"Could not add {len(rows)} rows to {title}, will try again later: {e}")
+                    continue
+
+                with self.pending_lock:
+                    # Rows queued while we were sending are behind the ones we sent.
+                    del self.pending_rows[title][:len(rows)]
+                    self._save_pending_rows()
+
+        self._schedule_flush()
 
     def add_applied(self, company_name : str, job_title : str, job_location : str, url : str) -> None:    
-        """Adds in a "applied-to" application. Updates Google Sheets and internal dictionary (self.applied)."""
+        """Adds in a "applied-to" application. Updates the status index (self.statuses) right away, and queues the row for Google Sheets (see flush)."""
         row_id = self.applied_last_row_id + 1
 
-        # Update Google Sheets
-        cells = self.applied_ws.range(row_id, 1, row_id, 4)
-        cells[0].value = company_name
-        cells[1].value = job_title
-        cells[2].value = url
-        cells[3].value = job_location
-
-        self.applied_ws.update_cells(cells, value_input_option = "USER_ENTERED")
+        # Update our status index.
+        self._add_applied_dict(company_name, job_title, job_location, url)
 
-        # Update our internal dictionary.
-        self._add_applied_dict(row_id, company_name, job_title, job_location, url)
+        # Update Google Sheets
+        self._queue_row(self.applied_ws, company_name, job_title, job_location, url)
 
         # Ensure we keep the right count for row ID purposes for next added application.
         self.applied_last_row_id = row_id
     
 
     def add_discarded(self, company_name : str, job_title : str, job_location : str, url : str) -> None:
-        """Adds in a discarded application. Updates Google Sheets and internal dictionary (self.applied)."""
-        self.reload()
-
+        """Adds in a discarded application. Updates the status index (self.statuses) right away, and queues the row for Google Sheets (see flush)."""
         row_id = self.discarded_last_row_id + 1
         
-        # Update Google Sheets
-        cells = self.discarded_ws.range(row_id, 1, row_id, 4)
-        cells[0].value = company_name
-        cells[1].value = job_title
-        cells[2].value = url
-        cells[3].value = job_location
+        # Update our status index.
+        self._add_discarded_dict(company_name, job_title, job_location, url)
 
-        self.discarded_ws.update_cells(cells, value_input_option = "USER_ENTERED")
-
-        # Update our internal dictionary.
-        self._add_discarded_dict(row_id, company_name, job_title, job_location, url)
+        # Update Google Sheets
+        self._queue_row(self.discarded_ws, company_name, job_title, job_location, url)
     
         # Ensure we keep the right count for row ID purposes for next added application.
         self.discarded_last_row_id = row_id
     
+    def add_applied_listings(self, listings : Sequence[JobListing]) -> None:
+        """Adds in many "applied-to" applications at once. They are queued together, so they are sent to Google Sheets in the same write (see flush)."""
+        for listing in listings:
+            self._add_applied_dict(listing.company_name, listing.job_title, listing.location, listing.url)
+
+        self._queue_rows(self.applied_ws, [[listing.company_name, listing.job_title, listing.url, listing.location] for listing in listings])
+        self.applied_last_row_id += len(listings)
+
+    def add_discarded_listings(self, listings : Sequence[JobListing]) -> None:
+        """Adds in many discarded applications at once. They are queued together, so they are sent to Google Sheets in the same write (see flush)."""
+        for listing in listings:
+            self._add_discarded_dict(listing.company_name, listing.job_title, listing.location, listing.url)
+
+        self._queue_rows(self.discarded_ws, [[listing.company_name, listing.job_title, listing.url, listing.location] for listing in listings])
+        self.discarded_last_row_id += len(listings)
+
     def get_job_status(self, company_name : str, job_title : str, job_location : str, job_url : str) -> JobStatus:
-        """Gets job status; for a job to match, there must be an exact company_name, job_title and job_location match. The URL is NOT used for job matching. Or one job URL matching."""
-        # first, we do URL matching.
-        if job_url not in JOB_LISTINGS_ACTUAL_LINKS.values():
-            if job_url in self.applied_by_url:
-                return JobStatus.APPLIED
-            
-            if job_url in self.discarded_by_url:
-                return JobStatus.DISCARDED
-
-        # Match the job in "applied-to" database.
-        if company_name in self.applied:
-            if job_title in self.applied[company_name]:
-                for job in self.applied[company_name][job_title]:
-                    if job.location == job_location:
-                        return JobStatus.APPLIED
-        
-        # Match the job in "discarded" database.
-        if company_name in self.discarded:
-            if job_title in self.discarded[company_name]:
-                for job in self.discarded[company_name][job_title]:
-                    if job.location == job_location:
-                        return JobStatus.DISCARDED
-
-        # If it's in neither, default job status (it has not been applied to)
-        return JobStatus.NOT_APPLIED
\ No newline at end of file
+        """Gets job status; for a job to match, there must be an exact company_name, job_title and job_location match. The URL is NOT used for job matching. Or one job URL matching.
+        job_url must be canonical (see helpers.canonical_url), as it is in every JobListing a tracker makes, so it is looked up as it is.
+        """
+        job_url = None if job_url in PLACEHOLDER_URLS else job_url
+
+        return self.statuses.get(company_name, job_title, job_location, job_url)
+
+    def classify(self, listings : Sequence[JobListing]) -> bytearray:
+        """Gets the job status of many listings at once, matching the same way as get_job_status. Listing URLs are already canonical, since trackers store them that way.
+
+            Args:
+                listings (Sequence[JobListing]): Listings to classify.
+
+            Returns:
+                bytearray: The JobStatus value of each listing, in the same order.
+        """
+        statuses = bytearray(len(listings))
+
+        # Bind everything the loop touches up front; this runs for every listing on every refresh.
+        by_url = self.statuses.by_url.get
+        by_job = self.statuses.by_job.get
+        values = {status: status.value for status in JobStatus}
+        not_applied = JobStatus.NOT_APPLIED.value
+
+        for i, listing in enumerate(listings):
+            status = None if listing.url in PLACEHOLDER_URLS else by_url(listing.url)
+            if status is None:
+                status = by_job((listing.company_name, listing.job_title, listing.location))
+
+            statuses[i] = not_applied if status is None else values[status]
+
+        return statuses
@@ -0,0 +1,103 @@
+import gspread
+import sqlite3
+import threading
+
+import apptracker.refresh_report as refresh_report
+from apptracker.settings import Settings
+
+from time import time
+
+# Local copy of the Applications/Ignore worksheets, so we don't download all of them on every reload.
+class SheetsMirror:
+    def __init__(self, path : str, sheet_key : str):
+        """Opens (or creates) the mirror database.
+
+            Args:
+                path (str): SQLite file to keep the mirror in.
+                sheet_key (str): Key of the spreadsheet being mirrored. Rows of other spreadsheets in the same file are kept apart.
+        """
+        self.sheet_key = sheet_key
+        self.lock = threading.Lock()
+
+        # Reloads run on the backend's worker thread.
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS rows (
+                worksheet TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                company_name TEXT NOT NULL,
+                job_title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                location TEXT NOT NULL,
+                PRIMARY KEY (worksheet, row_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                worksheet TEXT PRIMARY KEY,
+                last_full_sync REAL NOT NULL
+            );
+        """)
+
+    def _name(self, worksheet_title : str) -> str:
+        return f"{self.sheet_key}/{worksheet_title}"
+
+    def rows(self, worksheet_title : str) -> list[list[str]]:
+        """Gets every mirrored row of a worksheet in sheet order, in sheet format: Job Name - Title - URL - Location."""
+        with self.lock:
+            return self._rows(self._name(worksheet_title))
+
+    def _rows(self, name : str) -> list[list[str]]:
+        cursor = self.connection.execute("SELECT company_name, job_title, url, location FROM rows WHERE worksheet = ? ORDER BY row_id", (name, ))
+        return [list(row) for row in cursor]
+
+    def sync(self, worksheet : gspread.Worksheet) -> bool:
+        """Brings the mirror of worksheet up to date.
+
+        Normally only the last mirrored row (as an anchor) and the rows after it are downloaded. If the anchor no longer
+        matches, rows above it were edited or deleted, so the whole worksheet is downloaded again. That also happens every
+        Settings.SHEETS_MIRROR_FULL_SYNC_INTERVAL seconds, to pick up edits the anchor can't see.
+
+            Args:
+                worksheet (gspread.Worksheet): Worksheet to sync.
+
+            Returns:
+                bool: True if the mirror changed.
+        """
+        name = self._name(worksheet.title)
+
+        with self.lock:
+            row_count, = self.connection.execute("SELECT COUNT(*) FROM rows WHERE worksheet = ?", (name, )).fetchone()
+            last_full_sync = self.connection.execute("SELECT last_full_sync FROM sync_state WHERE worksheet = ?", (name, )).fetchone()
+            anchor = self.connection.execute(
+                "SELECT company_name, job_title, url, location FROM rows WHERE worksheet = ? AND row_id = ?",
+                (name, row_count - 1)
+            ).fetchone()
+
+        if anchor is not None and last_full_sync is not None and time() - last_full_sync[0] < Settings.SHEETS_MIRROR_FULL_SYNC_INTERVAL:
+            # Sheet rows start at 1, so row row_count is our last row.
+            refresh_report.active().count("sheets_api_calls")
+            fetched = [self._pad(row) for row in worksheet.get(f"A{row_count}:D")]
+            if len(fetched) > 0 and fetched[0] == list(anchor):
+                if len(fetched) == 1:
+                    return False
+
+                with self.lock, self.connection:
+                    self.connection.executemany(
+                        "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?)",
+                        [(name, row_count + i, *row) for i, row in enumerate(fetched[1:])]
+                    )
+                return True
+
+        refresh_report.active().count("sheets_api_calls")
+        rows = [self._pad(row) for row in worksheet.get_all_values()]
+        with self.lock, self.connection:
+            changed = row_count != len(rows) or self._rows(name) != rows
+            self.connection.execute("DELETE FROM rows WHERE worksheet = ?", (name, ))
+            self.connection.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?)", [(name, i, *row) for i, row in enumerate(rows)])
+            self.connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, time()))
+
+        return changed
+
+    @staticmethod
+    def _pad(row : list[str]) -> list[str]:
+        """The Sheets API leaves out empty cells at the end of a row."""
+        return (list(row) + [""] * 4)[:4]
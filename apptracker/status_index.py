@@ -0,0 +1,55 @@
+import sys
+
+from apptracker.trackers.helpers import canonical_url
+from apptracker.trackers.registry import PLACEHOLDER_URLS
+from enum import Enum
+
+# PLACEHOLDER_URLS are the links trackers give listings that have no link of their own. Many listings share them, so they are never used to match jobs.
+
+class JobStatus(Enum):
+    NOT_APPLIED = 1
+    APPLIED = 2
+    DISCARDED = 3
+
+# Status of every row in the Applications and Ignore worksheets, found by hash lookups instead of scanning rows.
+class StatusIndex:
+    __slots__ = ("by_job", "by_url")
+
+    def __init__(self):
+        # self.by_job[ (COMPANY NAME, JOB TITLE, LOCATION) ] = status of that job.
+        # self.by_url[ CANONICAL URL ] = status of the job at that URL. Rows written before URLs were canonical still match.
+        # A job both applied to and discarded counts as applied.
+        self.by_job : dict[tuple[str, str, str], JobStatus] = {}
+        self.by_url : dict[str, JobStatus] = {}
+
+    def add(self, status : JobStatus, company_name : str, job_title : str, job_location : str, url : str) -> None:
+        """Records the status of a job. Company names, titles and locations repeat across thousands of rows, so they are interned to be stored once."""
+        key = (sys.intern(company_name), sys.intern(job_title), sys.intern(job_location))
+
+        url = canonical_url(url)
+
+        if status == JobStatus.APPLIED:
+            self.by_job[key] = status
+            self.by_url[url] = status
+        else:
+            self.by_job.setdefault(key, status)
+            self.by_url.setdefault(url, status)
+
+    def get(self, company_name : str, job_title : str, job_location : str, url : str | None = None) -> JobStatus:
+        """Gets the status of a job, matching on URL first if one is given, then on company name, job title and location.
+
+            Args:
+                company_name (str): Company name.
+                job_title (str): Job title.
+                job_location (str): Job location.
+                url (str | None): Canonical URL of the job (see helpers.canonical_url), or None to only match on the other fields.
+
+            Returns:
+                JobStatus: JobStatus.NOT_APPLIED if nothing matches.
+        """
+        if url is not None:
+            status = self.by_url.get(url)
+            if status is not None:
+                return status
+
+        return self.by_job.get((company_name, job_title, job_location), JobStatus.NOT_APPLIED)
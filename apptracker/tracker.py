@@ -1,74 +1,268 @@
+import multiprocessing
+import queue
 import requests_cache
+import time
+import traceback
 
-from copy import deepcopy
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+import apptracker.refresh_report as refresh_report
 from apptracker.trackers.trackerabc import TrackerABC
 from apptracker.trackers.joblisting import JobListing
-from apptracker.trackers.ouckah import OuckahTracker
-from apptracker.trackers.simplify import SimplifyTracker
-from apptracker.trackers.northwesternfintech import NorthwesternFintech
+import apptracker.trackers.registry as registry
 import apptracker.trackers.tracker_settings as tracker_settings
 
 class Tracker:
     def __init__(self):
-        self.trackers : list[TrackerABC] = []
+        self.errors : dict[str, str] = {}
+        # self.errors[ PROVIDER NAME ] = traceback of the last failed fetch for that tracker.
         self.job_listings : dict[str, dict[str, list[JobListing]]] = {}
         # self.job_listings[ COMPANY NAME ][ JOB TITLE ] = list of job listings corresponding to this.
+        self.listing_index : dict[tuple[str, str, str], list[tuple[int, JobListing]]] = {}
+        # self.listing_index[ (COMPANY NAME, JOB TITLE, LOCATION) ] = every (tracker position, job listing) with that key, in merge order.
+        # The first one is the listing kept in self.job_listings; the rest are duplicates which take its place if it is removed.
+        self._snapshot : tuple[JobListing, ...] | None = None
+        self._parse_pool : ProcessPoolExecutor | None = None
 
         self.session = requests_cache.CachedSession('listing_cache',
             use_cache_dir=True,
-            expire_after=60,
+            expire_after=tracker_settings.CACHE_EXPIRE_AFTER,
             stale_if_error=True
         )
 
-        for tracker, is_enabled in tracker_settings.TRACKERS_ENABLED.items():
-            if not is_enabled:
-                continue
+        self.trackers : list[TrackerABC] = registry.create_trackers(self.session)
+
+    def _add_listing(self, position : int, listing : JobListing) -> bool:
+        """Adds a job listing from the tracker at the given position in self.trackers. It is only kept in self.job_listings if no listing with the same company name, job title, and location comes before it.
+        Adding a listing which is already there changes nothing, and one from the same tracker with the same key replaces the old one.
+
+            Returns:
+                Whether it is the listing kept for its key.
+        """
+        key = (listing.company_name, listing.job_title, listing.location)
+        candidates = self.listing_index.setdefault(key, [])
+
+        index = 0
+        while index < len(candidates) and candidates[index][0] < position:
+            index += 1
+
+        if index < len(candidates) and candidates[index][0] == position:
+            # A tracker has at most one listing per key, so this is the same listing or an outdated one from the same tracker.
+            old_listing = candidates[index][1]
+            if old_listing != listing:
+                candidates[index] = (position, listing)
+
+                if index == 0:
+                    bucket = self.job_listings[listing.company_name][listing.job_title]
+                    bucket[bucket.index(old_listing)] = listing
+                    self._snapshot = None
+
+            return index == 0
+
+        candidates.insert(index, (position, listing))
+        if index != 0:
+            return False # Duplicate of a listing which comes before it.
+
+        bucket = self.job_listings.setdefault(listing.company_name, {}).setdefault(listing.job_title, [])
+        if len(candidates) == 1:
+            bucket.append(listing)
+        else:
+            # Takes the place of the listing it now comes before.
+            bucket[bucket.index(candidates[1][1])] = listing
+
+        self._snapshot = None
+        return True
 
-            match tracker:
-                case "Ouckah & CS Careers":
-                    self.trackers.append(OuckahTracker(self.session))
+    def _remove_listing(self, position : int, listing : JobListing) -> None:
+        """Removes a job listing from the tracker at the given position in self.trackers. If it was the listing kept for its key, the next duplicate takes its place."""
+        key = (listing.company_name, listing.job_title, listing.location)
+        candidates = self.listing_index.get(key, [])
 
-                case "Pitt CSC & Simplify":
-                    self.trackers.append(SimplifyTracker(self.session))
+        try:
+            index = candidates.index((position, listing))
+        except ValueError:
+            return
 
-                case "Northwestern Fintech Club":
-                    self.trackers.append(NorthwesternFintech(self.session))
+        candidates.pop(index)
+        if index != 0:
+            return
 
-                case _:
-                    print(f"Tracker not found: {tracker}")
+        titles = self.job_listings[listing.company_name]
+        bucket = titles[listing.job_title]
+        if candidates:
+            bucket[bucket.index(listing)] = candidates[0][1]
+        else:
+            bucket.remove(listing)
+            del self.listing_index[key]
 
-    def get(self, force : bool = False) -> dict[str, dict[str, list[JobListing]]]:
-        """Gets job listing dictionary from predefined GitHub job listings as given in settings.py. If a request was made in the past minute, sends the same data to avoid getting blocked.
+            if not bucket:
+                del titles[listing.job_title]
+            if not titles:
+                del self.job_listings[listing.company_name]
+
+        self._snapshot = None
+
+    def snapshot(self) -> tuple[JobListing, ...]:
+        """Returns every job listing kept so far, grouped by company name and then job title. The tuple is only rebuilt after listings change, and since JobListing is frozen it can be shared freely."""
+        if self._snapshot is None:
+            self._snapshot = tuple(
+                listing
+                for titles in self.job_listings.values()
+                for listings in titles.values()
+                for listing in listings
+            )
+
+        return self._snapshot
+
+    def parse_pool(self) -> ProcessPoolExecutor | None:
+        """Gets the process pool READMEs are parsed in, starting it the first time. None if tracker_settings.PARSE_WORKERS is 0.
+        The workers are kept for the next refresh, since starting them takes longer than parsing most READMEs.
+        """
+        if tracker_settings.PARSE_WORKERS <= 0:
+            return None
+
+        if self._parse_pool is None:
+            # Forking a process which has threads running (the GUI, other downloads) can deadlock the child, so workers are always started fresh.
+            self._parse_pool = ProcessPoolExecutor(max_workers=tracker_settings.PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+        return self._parse_pool
+
+    def close(self) -> None:
+        """Stops the parse worker processes, if any were started."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+            self._parse_pool = None
+
+    def _stream_into(self, tracker : TrackerABC, force : bool, pool : ProcessPoolExecutor | None, results : queue.Queue) -> None:
+        """Runs a tracker's stream on a worker thread, passing each listing (then None, or the exception it failed with) through results."""
+        try:
+            with refresh_report.active().profile_thread():
+                for listing in tracker.stream(force, pool):
+                    results.put(listing)
+        except Exception as e:
+            results.put(e)
+        else:
+            results.put(None)
+
+    def _drain(self, results : queue.Queue) -> Iterator[JobListing]:
+        """Yields the listings a worker thread puts in results, re-raising the exception it failed with."""
+        while (item := results.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+
+    def _merge(self, position : int, listings : Iterator[JobListing]) -> Iterator[JobListing]:
+        """Merges the stream of the tracker at the given position, yielding each listing which is kept. A failing tracker is recorded in self.errors and never aborts the whole refresh.
+        It keeps the listings streamed before it failed, which may already be shown, and its previous listings for the rest (see TrackerABC.keep_partial).
+        """
+        tracker = self.trackers[position]
+        yielded : set[JobListing] = set()
+        merge_time = 0.0
+
+        try:
+            for listing in listings:
+                start = time.perf_counter()
+                kept = self._add_listing(position, listing)
+                merge_time += time.perf_counter() - start
+                if kept:
+                    yielded.add(listing)
+                    yield listing
+        except Exception as e:
+            refresh_report.active().count("errors", tracker=tracker.provider_name)
+            self.errors[tracker.provider_name] = traceback.format_exc()
+            print(self.errors[tracker.provider_name])
+
+            if isinstance(e, BrokenProcessPool):
+                self.close() # A worker died; start new ones on the next refresh.
+
+            # Streamed listings already took the place of previous ones with the same key, so nothing yielded is taken back.
+            # The previous listings with other keys are still merged; yield the ones kept, since a load only shows what it is given.
+            for listing in tracker.last_listings:
+                if self._add_listing(position, listing) and listing not in yielded:
+                    yield listing
+            return
+
+        start = time.perf_counter()
+        for listing in tracker.last_removed:
+            self._remove_listing(position, listing)
+        refresh_report.active().add_time("merge", merge_time + time.perf_counter() - start, tracker.provider_name)
+
+    def stream(self, force : bool = False) -> Iterator[JobListing]:
+        """Refreshes every tracker, yielding each job listing which is kept after duplicate removal as soon as its row is parsed.
+        Trackers are merged in order (not completion order) so the first listing kept for a duplicate is always the same, and every listing is final once yielded.
+        Duplicates are found by matching company name, job title, and location.
+
+            Args:
+                force (bool): If true, skips the 1 minute cooldown between data refresh; READMEs are still only downloaded again if they changed. By default, this is false.
+        """
+        self.errors.clear()
+        pool = self.parse_pool()
+
+        if tracker_settings.FETCH_IN_PARALLEL and len(self.trackers) > 1:
+            # Every tracker downloads and parses on its own thread, while this one merges them in order.
+            with ThreadPoolExecutor(max_workers=len(self.trackers)) as executor:
+                queues = [queue.Queue() for _ in self.trackers]
+                for tracker, results in zip(self.trackers, queues):
+                    executor.submit(self._stream_into, tracker, force, pool, results)
+
+                for position, results in enumerate(queues):
+                    yield from self._merge(position, self._drain(results))
+        else:
+            for position, tracker in enumerate(self.trackers):
+                yield from self._merge(position, tracker.stream(force, pool))
+
+    def refresh(self, position : int, force : bool = False) -> bool:
+        """Refreshes only the tracker at the given position in self.trackers; every other tracker keeps its listings. A failure is recorded in self.errors, like in stream.
 
             Args:
+                position (int): Position of the tracker in self.trackers.
                 force (bool): If true, skips the 1 minute cooldown between data refresh. By default, this is false.
 
             Returns:
-                dictionary[companyNamme, dictionary[jobTitle, list[JobListing]]]
+                Whether the kept job listings changed.
         """
+        tracker = self.trackers[position]
+        snapshot = self.snapshot()
 
-        for tracker in self.trackers:
-            tracker_listing = tracker.get(force)
+        self.errors.pop(tracker.provider_name, None)
+        for _ in self._merge(position, tracker.stream(force, self.parse_pool())):
+            pass
 
-            for listing in tracker_listing:
-                if not listing.company_name in self.job_listings:
-                    self.job_listings[listing.company_name] = {}
+        return self.snapshot() is not snapshot
 
-                if not listing.job_title in self.job_listings[listing.company_name]:
-                    self.job_listings[listing.company_name][listing.job_title] = []
-                
-                found = False
+    def restore(self, states : dict[str, tuple[str | None, str | None, list[JobListing]]]) -> None:
+        """Puts back the trackers' state saved in a snapshot (see ListingSnapshot), as if they had just parsed those READMEs. The next refresh only parses READMEs which changed since.
 
-                # Check for duplicate listing by matching company name, job title, and location
-                for duplicate_listing in self.job_listings[listing.company_name][listing.job_title]:
-                    if listing.location == duplicate_listing.location:
-                        found = True
-                        break
-                
-                if found:
-                    continue
+            Args:
+                states (dict[str, tuple[str | None, str | None, list[JobListing]]]): states[ PROVIDER NAME ] = (ETag, Last-Modified, job listings) of the README the tracker last parsed.
+        """
+        for position, tracker in enumerate(self.trackers):
+            if tracker.provider_name not in states:
+                continue
+
+            tracker.last_etag, tracker.last_modified, listings = states[tracker.provider_name]
+            tracker.last_listings = list(listings)
+            tracker.last_removed = []
+            tracker.has_parsed = True
+
+            for _ in self._merge(position, iter(tracker.last_listings)):
+                pass
+
+    def get(self, force : bool = False) -> tuple[JobListing, ...]:
+        """Gets job listings from predefined GitHub job listings as given in settings.py. If a request was made in the past minute, sends the same data to avoid getting blocked.
 
-                self.job_listings[listing.company_name][listing.job_title].append(listing)
+            Args:
+                force (bool): If true, skips the 1 minute cooldown between data refresh; READMEs are still only downloaded again if they changed. By default, this is false.
+
+            Only rows which changed since the last refresh are parsed again. Trackers which fail to load keep their previous listings and their errors are kept in self.errors.
+
+            Returns:
+                An immutable snapshot of all job listings, grouped by company name and then job title (see Tracker.snapshot).
+        """
+        for _ in self.stream(force):
+            pass
 
-        return deepcopy(self.job_listings) # Safe-guard just in case.
\ No newline at end of file
+        return self.snapshot()
@@ -1,4 +1,76 @@
 import re
+from html.entities import html5
+from urllib.parse import urlsplit, urlunsplit
+
+CLOSED_MARKER = "🔒" # Shown instead of an application link when a listing is closed.
+
+# Markdown link patterns, compiled once. Source: https://stackoverflow.com/a/30738268/2755116
+# Links never span lines; a table cell is always on one line.
+INLINE_LINK_RE = re.compile(r'\[([^\]\n]+)\]\(([^)\n]+)\)')
+FOOTNOTE_LINK_TEXT_RE = re.compile(r'\[([^\]\n]+)\]\[(\d+)\]')
+FOOTNOTE_LINK_URL_RE = re.compile(r'\[(\d+)\]:\s+(\S+)')
+# A markdown link or bold marker; replace_md_links handles both in a single re.sub.
+INLINE_LINK_OR_BOLD_RE = re.compile(INLINE_LINK_RE.pattern + r'|\*\*')
+
+# Fast path for pulling the first link out of a table cell, without setting up an HTML parser per row.
+HTML_ANCHOR_RE = re.compile(r'<a(?=[\s>/])([^>]*)>', re.IGNORECASE)
+HTML_ATTRIBUTE_RE = re.compile(r'([^\s=>/]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+# An "&" has to be decoded by an HTML parser if it starts a character reference, a named reference ending in ";",
+# or one of the legacy named references which don't need the ";" (e.g. "&lt-1", but not "&lt=1" or "&ltx").
+# Query parameters such as "&utm_source=" never match, so the common case stays on the fast path.
+LEGACY_ENTITIES = sorted((name for name in html5 if not name.endswith(";")), key=len, reverse=True)
+UNSAFE_AMPERSAND_RE = re.compile(r'&(?:#|[A-Za-z0-9]+;|(?:' + "|".join(LEGACY_ENTITIES) + r')(?![A-Za-z0-9=]))')
+
+# Query parameters that only say where a click came from, such as the "?utm_source=Simplify&ref=Simplify" Simplify adds.
+TRACKING_PARAM_RE = re.compile(r'(?:utm_[^=&]*|ref|gh_src)(?:=|$)', re.IGNORECASE)
+
+def _find_html_link(cell : str) -> str | None:
+    """Returns the href of the first <a> tag in cell, or None if the fast path can't be sure to match what an HTML parser would give."""
+    if "<!--" in cell:
+        return None
+
+    anchor = HTML_ANCHOR_RE.search(cell)
+    if anchor is None:
+        return None
+
+    href = None
+    for attribute in HTML_ATTRIBUTE_RE.finditer(anchor.group(1)):
+        if attribute.group(1).lower() != "href":
+            continue
+
+        if href is not None:
+            return None # Repeated attribute; let the parser decide.
+
+        href = next((value for value in attribute.groups()[1:] if value is not None), None)
+        if href is None:
+            return None
+
+    if href is None or UNSAFE_AMPERSAND_RE.search(href):
+        return None
+
+    return href
+
+def extract_link(cell : str) -> str | None:
+    """Returns the URL a job listing table cell links to: the href of its first <a> tag or, if it has no HTML, its first markdown link.
+    Returns None if the cell is the closed marker (🔒).
+
+    Cells the fast path can't handle (HTML entities, comments, odd markup) are parsed with BeautifulSoup instead, which raises TypeError if there's no link.
+    """
+    if cell == CLOSED_MARKER:
+        return None
+
+    if "<" not in cell:
+        md_link = INLINE_LINK_RE.search(cell)
+        if md_link is not None:
+            return md_link.group(2)
+    else:
+        href = _find_html_link(cell)
+        if href is not None:
+            return href
+
+    # Fallback: parse reliably using BeautifulSoup4.
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(cell, "lxml").find("a")["href"]
 
 # Source:  https://stackoverflow.com/a/63529754
 def find_md_links(md):
@@ -8,13 +80,7 @@ def find_md_links(md):
     
     [3]: some.url
     """
-    # https://stackoverflow.com/a/30738268/2755116
-
-    INLINE_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-    FOOTNOTE_LINK_TEXT_RE = re.compile(r'\[([^\]]+)\]\[(\d+)\]')
-    FOOTNOTE_LINK_URL_RE = re.compile(r'\[(\d+)\]:\s+(\S+)')
-
-    links = list(INLINE_LINK_RE.findall(md))
+    links = INLINE_LINK_RE.findall(md)
     footnote_links = dict(FOOTNOTE_LINK_TEXT_RE.findall(md))
     footnote_urls = dict(FOOTNOTE_LINK_URL_RE.findall(md))
 
@@ -26,15 +92,46 @@ def find_md_links(md):
     return {'regular': links, 'footnotes': footnotes_linking}
 
 def replace_md_links(md, f):
-    """Replace links url to f(url)"""
-    
-    links = find_md_links(md)
-    newmd = md
+    """Replace links [text](url) with text + f(url), and remove bold markers (**), in one pass."""
+    def replace(match):
+        if match.group(2) is None:
+            return "" # "**"
 
-    for r in links['regular']:
-        newmd = newmd.replace(f"({r[1]})", f(r[1])).replace(f"[{r[0]}]", r[0])
+        return (match.group(1) + f(match.group(2))).replace("**", "")
 
-    for r in links['footnotes']:
-        newmd = newmd.replace(f"({(r[1])})", f(r[1]))
-    
-    return newmd.replace("**", "")
\ No newline at end of file
+    return INLINE_LINK_OR_BOLD_RE.sub(replace, md)
+
+def canonical_url(url : str) -> str:
+    """Returns the form of a job listing URL used everywhere URLs are compared, so the same job linked slightly differently only counts once.
+
+    The scheme becomes https, the host is lowercased without "www." or a default port, and the trailing slash, tracking
+    query parameters (see TRACKING_PARAM_RE) and the fragment are removed. Fragments that look like routes ("#/job/12",
+    "#!/job/12") are kept, since some job boards use them to pick the job. Anything else, including the order and encoding
+    of the remaining query parameters, is left alone, so the URL still opens the same page.
+
+        Args:
+            url (str): URL to normalize. Strings that aren't absolute URLs are returned stripped of whitespace.
+
+        Returns:
+            str: The canonical URL.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    host = parts.netloc.lower()
+    default_port = {"https": ":443", "http": ":80"}.get(scheme)
+    if default_port is not None and host.endswith(default_port):
+        host = host[:-len(default_port)]
+    if host.startswith("www."):
+        host = host[4:]
+
+    if scheme == "http":
+        scheme = "https"
+
+    query = "&".join(param for param in parts.query.split("&") if param and not TRACKING_PARAM_RE.match(param))
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+
+    canonical = urlunsplit((scheme, host, parts.path.rstrip("/"), query, fragment))
+    return url if canonical == url else canonical # Most URLs are canonical already; share the string instead of keeping a copy.
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
-@dataclass
+# Frozen so that one listing can be shared between the tracker, the backend and the GUI without copying.
+@dataclass(frozen=True)
 class JobListing:
     company_name : str
     job_title : str
@@ -0,0 +1,81 @@
+"""Every tracker the app knows about, as TableSchemas by provider name.
+
+The built-in trackers are registered on import. Other packages can add trackers without changing apptracker by declaring an entry point in the
+"apptracker.trackers" group which points to a TableSchema (or a list of them), e.g. in their pyproject.toml:
+
+    [project.entry-points."apptracker.trackers"]
+    my_tracker = "my_package.my_tracker:SCHEMA"
+"""
+import traceback
+
+from apptracker.trackers.table_schema import TableSchema
+import apptracker.trackers.tracker_settings as tracker_settings
+import apptracker.trackers.ouckah as ouckah
+import apptracker.trackers.simplify as simplify
+import apptracker.trackers.northwesternfintech as northwesternfintech
+
+ENTRY_POINT_GROUP = "apptracker.trackers"
+
+SCHEMAS : dict[str, TableSchema] = {}
+# SCHEMAS[ PROVIDER NAME ] = schema of that tracker, in the order they were registered.
+PLACEHOLDER_URLS : set[str] = set()
+# Display URLs of every registered tracker; listings without a link of their own (closed ones) have these as their URL.
+
+_discovered = False
+
+def register(schema : TableSchema) -> None:
+    """Adds a tracker, replacing any registered one with the same provider name."""
+    SCHEMAS[schema.provider_name] = schema
+    PLACEHOLDER_URLS.add(schema.display_url)
+
+def discover() -> None:
+    """Registers the trackers of every installed "apptracker.trackers" entry point. Only looks them up once; reading the installed packages takes a while,
+    so this is done when trackers are created rather than on import. A plugin which fails to load is reported and skipped.
+    """
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+
+    # importlib.metadata takes about as long to import as the rest of the window, so it is only imported once trackers are created.
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry_point.load()
+            for schema in [loaded] if isinstance(loaded, TableSchema) else loaded:
+                if not isinstance(schema, TableSchema):
+                    raise TypeError(f"expected a TableSchema, got {type(schema).__name__}")
+
+                register(schema)
+        except Exception:
+            print(f"Could not load tracker plugin {entry_point.name}")
+            print(traceback.format_exc())
+
+def enabled_schemas() -> list[TableSchema]:
+    """Gets the schemas of the enabled trackers: those in tracker_settings.TRACKERS_ENABLED in its order, then plugins it doesn't mention, which are enabled by default."""
+    discover()
+
+    schemas : list[TableSchema] = []
+    for provider_name, is_enabled in tracker_settings.TRACKERS_ENABLED.items():
+        if not is_enabled:
+            continue
+
+        if provider_name not in SCHEMAS:
+            print(f"Tracker not found: {provider_name}")
+            continue
+
+        schemas.append(SCHEMAS[provider_name])
+
+    schemas.extend(schema for provider_name, schema in SCHEMAS.items() if provider_name not in tracker_settings.TRACKERS_ENABLED)
+    return schemas
+
+def create_trackers(session) -> list:
+    """Creates a tracker (TableTracker, or the schema's tracker_class) for every enabled schema, sharing one requests_cache.CachedSession."""
+    # Imported here, since it imports requests; the registry itself is needed for PLACEHOLDER_URLS before that is.
+    from apptracker.trackers.table_tracker import TableTracker
+
+    return [(schema.tracker_class or TableTracker)(session, schema) for schema in enabled_schemas()]
+
+for schema in (ouckah.SCHEMA, simplify.SCHEMA, northwesternfintech.SCHEMA):
+    register(schema)
@@ -0,0 +1,57 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import apptracker.trackers.helpers as helpers
+
+# Cleanup rules a TableSchema can name for a column. Each one takes a cell and returns it cleaned up.
+CLEANUP_RULES : dict[str, Callable[[str], str]] = {
+    # Removes markdown links and bold markers; some company names are links to their website.
+    "strip_md_links": lambda text: helpers.replace_md_links(text, lambda _ : ""),
+    # Removes all unnecessary icons (emoji) from a job title.
+    "ascii_only": lambda text: text.encode('ascii', 'ignore').decode('ascii'),
+    # Makes a job location into a consistent form when there are multiple job locations for the same listing.
+    "join_locations": lambda text: text.replace("</br>", " | ").replace("<details><summary>", "").replace("</summary>", " ").replace("</details>", ""),
+}
+
+Cleanup = tuple[str | Callable[[str], str], ...]
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Declares a job listing table in a GitHub README, which TableTracker parses. Register it with registry.register, or publish it as an
+    "apptracker.trackers" entry point (see registry.discover).
+
+    Columns are numbered as in the line split on "|", so the first column is 1.
+    A table either has a title column and a link column (one listing per row), or role_columns (one listing per role column with role_marker in it).
+    """
+    provider_name : str
+    raw_url : str # Raw README to download.
+    display_url : str # Page of the tracker. Listings without a link of their own (closed ones) link here.
+    company_column : int
+    location_column : int
+    title_column : int | None = None
+    link_column : int | None = None
+    role_columns : tuple[tuple[int, str], ...] = () # (column, job title) of every role column.
+    role_marker : str = "✅" # A role column has a listing if its cell contains this; its link is in the same cell.
+
+    table_start : str = "TABLE_START" # The table starts on the line after the first line containing this.
+    table_end : str | None = "TABLE_END" # The table ends at the first line containing this; None for the end of the README.
+    header : tuple[str, str] | None = ("Company", "Role") # (company cell, title cell) of heading rows inside the table, which are skipped.
+    sublisting_marker : str | None = "↳" # Company cell of rows which belong to the company of the row above. None if the table has none.
+
+    # Cleanup rules applied in order to every cell of a column: names from CLEANUP_RULES or functions.
+    company_cleanup : Cleanup = ()
+    title_cleanup : Cleanup = ()
+    location_cleanup : Cleanup = ()
+
+    tracker_class : type | None = None # Subclass of TableTracker to use for tables which need code of their own. By default, TableTracker.
+
+    def __post_init__(self):
+        if self.role_columns:
+            if self.title_column is not None or self.link_column is not None:
+                raise ValueError(f"{self.provider_name}: a table with role columns has no title or link column")
+        elif self.title_column is None or self.link_column is None:
+            raise ValueError(f"{self.provider_name}: needs a title and a link column, or role columns")
+
+        for rule in self.company_cleanup + self.title_cleanup + self.location_cleanup:
+            if isinstance(rule, str) and rule not in CLEANUP_RULES:
+                raise ValueError(f"{self.provider_name}: unknown cleanup rule {rule!r}")
@@ -0,0 +1,183 @@
+import functools
+import pickle
+import re
+import traceback
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+
+from apptracker.trackers.trackerabc import TrackerABC
+from apptracker.trackers.joblisting import JobListing
+from apptracker.trackers.table_schema import CLEANUP_RULES, Cleanup, TableSchema
+import requests_cache
+import apptracker.trackers.helpers as helpers
+
+# Company cells of the row under a table's heading, e.g. "---", ":---:".
+SEPARATOR_RE = re.compile(r':?-+:?')
+
+# Distinct cells remembered per column. The same company names, job titles and locations come up on many rows, so most cells are cleaned up only once.
+CLEANUP_CACHE_SIZE = 8192
+
+def cleanup_chain(rules : Cleanup) -> Callable[[str], str] | None:
+    """Combines cleanup rules (see TableSchema) into one memoized function, or None if there are no rules."""
+    if not rules:
+        return None
+
+    functions = [CLEANUP_RULES[rule] if isinstance(rule, str) else rule for rule in rules]
+    if len(functions) == 1:
+        return functools.lru_cache(maxsize=CLEANUP_CACHE_SIZE)(functions[0])
+
+    def chain(text : str) -> str:
+        for function in functions:
+            text = function(text)
+        return text
+
+    return functools.lru_cache(maxsize=CLEANUP_CACHE_SIZE)(chain)
+
+_pool_trackers : dict[TableSchema, "TableTracker"] = {}
+# _pool_trackers[ SCHEMA ] = tracker a parse worker process keeps for that schema, so its cleanup caches last between READMEs.
+
+def parse_rows(schema : TableSchema, text : str) -> list[tuple[str, str, str, str]]:
+    """Runs in a parse worker process (see TableTracker.parse_in_pool). Parses a whole README.
+
+        Returns:
+            (company name, job title, location, url) of every job listing, in order. Plain tuples pickle much smaller and faster than JobListings.
+    """
+    tracker = _pool_trackers.get(schema)
+    if tracker is None:
+        tracker = _pool_trackers[schema] = (schema.tracker_class or TableTracker)(None, schema)
+
+    # Any worker may get this README next time, so a row cache would only help by chance.
+    tracker.row_cache = {}
+
+    return [(listing.company_name, listing.job_title, listing.location, listing.url) for listing in tracker.parse(text.splitlines())]
+
+class TableTracker(TrackerABC):
+    """Tracks any job listing table declared by a TableSchema."""
+    def __init__(self, session : requests_cache.CachedSession, schema : TableSchema):
+        super().__init__(session)
+
+        self.schema = schema
+        self.provider_name = schema.provider_name
+        self.raw_url = schema.raw_url
+        self.display_url = schema.display_url
+
+        self.clean_company = cleanup_chain(schema.company_cleanup)
+        self.clean_title = cleanup_chain(schema.title_cleanup)
+        self.clean_location = cleanup_chain(schema.location_cleanup)
+
+        # Schemas with cleanup functions (or a tracker class) defined inside a function can't be sent to a parse worker process.
+        try:
+            pickle.dumps(schema)
+            self.is_picklable = True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self.is_picklable = False
+
+    def is_table_start(self, line : str) -> bool:
+        return self.schema.table_start in line
+
+    def is_table_end(self, line : str) -> bool:
+        return self.schema.table_end is not None and self.schema.table_end in line
+
+    def is_sublisting(self, line : str) -> bool:
+        return self.schema.sublisting_marker is not None and self.schema.sublisting_marker in line
+
+    def parse_in_pool(self, pool : Executor, text : str) -> Iterable[JobListing]:
+        """Parses a whole README in a worker process of pool, then makes the job listings here. See TrackerABC.parse_in_pool."""
+        if not self.is_picklable:
+            return super().parse_in_pool(pool, text)
+
+        rows = pool.submit(parse_rows, self.schema, text).result()
+        return [JobListing(company_name, job_title, location, url, self.provider_name) for company_name, job_title, location, url in rows]
+
+    def is_filler_row(self, listing_data : list[str]) -> bool:
+        """Whether a row is a heading row or the separator row under it."""
+        company_name = listing_data[self.schema.company_column]
+        if company_name[:1] in ("-", ":") and SEPARATOR_RE.fullmatch(company_name):
+            return True
+
+        header = self.schema.header
+        if header is None or company_name != header[0]:
+            return False
+
+        return self.schema.title_column is None or listing_data[self.schema.title_column] == header[1]
+
+    def job_url(self, cell : str) -> str:
+        """Gets the job URL out of a link cell. Closed listings (🔒) have no link and point to the tracker itself.
+
+            Raises:
+                TypeError: If the cell has no link.
+        """
+        # Job Listings are inside <a href> (or a markdown link).
+        job_url = helpers.extract_link(cell)
+        if job_url is None:
+            return self.display_url
+
+        # Makes it easier to get a more consistent URL for URL matching purposes (i.e checking duplicate job listings.)
+        return helpers.canonical_url(job_url)
+
+    def parse_row(self, listing_data : list[str], last_company : str) -> tuple[list[JobListing], str | None]:
+        """Parses one row of the table, as declared by the schema. See TrackerABC.parse_row."""
+        schema = self.schema
+        company_name = listing_data[schema.company_column]
+
+        # Most rows are listings, so only look closer at cells which could be a heading or separator.
+        if (company_name[:1] in ("-", ":") or (schema.header is not None and company_name == schema.header[0])) and self.is_filler_row(listing_data):
+            return [], None
+
+        # Check for sublisting
+        if company_name == schema.sublisting_marker:
+            company_name = last_company
+
+        clean_company, clean_title, clean_location = self.clean_company, self.clean_title, self.clean_location
+        if clean_company is not None:
+            company_name = clean_company(company_name)
+
+        job_location = listing_data[schema.location_column]
+        if clean_location is not None:
+            job_location = clean_location(job_location)
+
+        # Tables without sublistings never set the company for the rows below.
+        next_company = company_name if schema.sublisting_marker is not None else None
+
+        if schema.role_columns:
+            return self.parse_roles(listing_data, company_name, job_location), next_company
+
+        try:
+            job_url = self.job_url(listing_data[schema.link_column])
+        except TypeError:
+            # if it ever errors, print the listing data which it error'd on and fail this tracker only. Should never happen.
+            print(listing_data)
+            raise
+
+        job_title = listing_data[schema.title_column]
+        if clean_title is not None:
+            job_title = clean_title(job_title)
+
+        return [JobListing(company_name, job_title, job_location, job_url, self.provider_name)], next_company
+
+    def parse_roles(self, listing_data : list[str], company_name : str, job_location : str) -> list[JobListing]:
+        """Parses the role columns of a row; there is one job listing per open role. A role whose link can't be read is skipped."""
+        job_listings : list[JobListing] = []
+
+        for column, job_title in self.schema.role_columns:
+            if not self.schema.role_marker in listing_data[column]:
+                continue
+
+            try:
+                job_url = self.job_url(listing_data[column])
+            except Exception:
+                print(traceback.format_exc())
+                continue
+
+            job_listings.append(
+                JobListing(
+                    company_name = company_name,
+                    job_title = job_title,
+                    location = job_location,
+                    url = job_url,
+                    source = self.provider_name
+                )
+            )
+
+        return job_listings
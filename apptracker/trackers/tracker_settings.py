@@ -1,17 +1,31 @@
-JOB_LISTING_LINKS = {
-    "Ouckah & CS Careers": "https://raw.githubusercontent.com/Ouckah/Summer2025-Internships/dev/README.md",
-    "Pitt CSC & Simplify": "https://raw.githubusercontent.com/SimplifyJobs/Summer2025-Internships/dev/README.md",
-    "Northwestern Fintech Club": "https://raw.githubusercontent.com/northwesternfintech/2025QuantInternships/main/README.md"
-}
-
-JOB_LISTINGS_ACTUAL_LINKS = {
-    "Ouckah & CS Careers": "https://github.com/Ouckah/Summer2025-Internships",
-    "Pitt CSC & Simplify": "https://github.com/SimplifyJobs/Summer2025-Internships",
-    "Northwestern Fintech Club": "https://github.com/northwesternfintech/2025QuantInternships/tree/main"
-}
-
+# Trackers are declared as TableSchemas and registered in registry.py; trackers from plugins are enabled unless they are set to False here.
 TRACKERS_ENABLED = {
     "Ouckah & CS Careers": True,
     "Pitt CSC & Simplify": True,
     "Northwestern Fintech Club": True
-}
\ No newline at end of file
+}
+
+# If true, every enabled tracker is downloaded and parsed at the same time on a thread pool instead of one after another.
+# Results are always merged in the order of TRACKERS_ENABLED (then plugins), so duplicate removal gives the same result either way.
+FETCH_IN_PARALLEL = True
+
+# Number of worker processes READMEs are parsed in, which lets several large READMEs parse at the same time on different CPU cores.
+# A README is then downloaded completely before it is parsed, and all of its rows are parsed, not only those which changed. 0 parses on the download threads instead, while READMEs download.
+PARSE_WORKERS = 0
+
+# Seconds a downloaded README is reused before asking GitHub whether it changed, for trackers not in CACHE_LIFETIMES.
+CACHE_EXPIRE_AFTER = 60
+
+# Seconds each tracker's README is reused before asking GitHub whether it changed. READMEs which rarely change can be cached for longer.
+CACHE_LIFETIMES = {
+    "Ouckah & CS Careers": 60,
+    "Pitt CSC & Simplify": 60,
+    "Northwestern Fintech Club": 5 * 60
+}
+
+# Seconds between background refreshes of each tracker (see RefreshScheduler). Never shorter than the tracker's cache lifetime (see CACHE_LIFETIMES).
+REFRESH_INTERVALS = {
+    "Ouckah & CS Careers": 15 * 60,
+    "Pitt CSC & Simplify": 10 * 60,
+    "Northwestern Fintech Club": 30 * 60
+}
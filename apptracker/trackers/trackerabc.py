@@ -1,12 +1,234 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
 from apptracker.trackers.joblisting import JobListing
+import apptracker.refresh_report as refresh_report
+import apptracker.trackers.tracker_settings as tracker_settings
+import requests
 import requests_cache
+import time
 
 class TrackerABC(ABC):
     def __init__(self, session : requests_cache.CachedSession):
         self.session = session
 
+        # State of the previous refresh, used to only re-parse table rows which changed.
+        self.has_parsed = False
+        self.last_etag : str | None = None
+        self.last_modified : str | None = None
+        # ETag and Last-Modified headers of the README last parsed.
+        self.last_listings : list[JobListing] = []
+        self.last_removed : list[JobListing] = []
+        # Job listings which were in the README before the last refresh but not after it.
+        self.row_cache : dict[tuple[int, int, str], tuple[list[JobListing], str | None]] = {}
+        # self.row_cache[ (hash(LINE), len(LINE), INHERITED COMPANY) ] = (job listings parsed from the line, company name the line sets for sublistings)
+        # Lines are keyed by their hash rather than kept, so the README text is not held in memory between refreshes.
+
+    def fetch(self, force : bool = False) -> requests.Response | None:
+        """Starts downloading the raw README of this tracker. The body is streamed, so it can be parsed while it arrives.
+
+            The session revalidates its cached copy with If-None-Match / If-Modified-Since, using the ETag and Last-Modified it keeps on disk,
+            so an unchanged README is answered with 304 Not Modified and never downloaded again.
+
+            Args:
+                force (bool): If true, revalidates with GitHub even if the cached copy is not expired yet. By default, this is false.
+
+            Returns:
+                The response with the README, or None if it is the same README which was parsed last time.
+        """
+        # If we still have what we parsed last time, ask GitHub directly whether it changed. This also covers a cache which lost its copy.
+        headers = {}
+        if self.has_parsed:
+            if self.last_etag is not None:
+                headers["If-None-Match"] = self.last_etag
+            if self.last_modified is not None:
+                headers["If-Modified-Since"] = self.last_modified
+
+        report = refresh_report.active()
+        with report.stage("fetch", self.provider_name):
+            r = self.session.get(self.raw_url, headers=headers, refresh=force, stream=True, expire_after=self.cache_lifetime())
+
+        if r.status_code == 304:
+            report.count("not_modified", tracker=self.provider_name)
+            r.close()
+            return None
+
+        report.count("cache_hits" if getattr(r, "from_cache", False) else "cache_misses", tracker=self.provider_name)
+
+        # Fail this tracker instead of parsing an error page as an empty README.
+        r.raise_for_status()
+
+        validators = (r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        if self.has_parsed and any(validators) and validators == (self.last_etag, self.last_modified):
+            report.count("unchanged", tracker=self.provider_name)
+            r.close()
+            return None # Served from the cache (or revalidated by it), and it is still the README we parsed.
+
+        # raw.githubusercontent.com always says utf-8; don't let a missing charset turn lines into bytes.
+        r.encoding = r.encoding or "utf-8"
+        return r
+
+    def cache_lifetime(self) -> int:
+        """Seconds the README of this tracker is reused from the cache before asking GitHub whether it changed (see tracker_settings.CACHE_LIFETIMES)."""
+        return tracker_settings.CACHE_LIFETIMES.get(self.provider_name, tracker_settings.CACHE_EXPIRE_AFTER)
+
+    @staticmethod
+    def downloaded_bytes(r : requests.Response) -> int:
+        """Size of the README body downloaded for r, once it has been read. requests_cache reads the whole body of a response it caches before returning it,
+        so then nothing was streamed from r.raw.
+        """
+        if r.raw.tell() > 0:
+            return r.raw.tell()
+
+        try:
+            return len(r.content)
+        except RuntimeError:
+            return 0 # Streamed an empty body.
+
+    def is_table_start(self, line : str) -> bool:
+        """Whether this line marks the start of the job listing table. Rows start on the line after it."""
+        # The current GitHub links make this very easy with "TABLE_START" and "TABLE_END" in the line denoting start and end of table in comments.
+        return "TABLE_START" in line
+
+    def is_table_end(self, line : str) -> bool:
+        """Whether this line marks the end of the job listing table."""
+        return "TABLE_END" in line
+
+    def is_sublisting(self, line : str) -> bool:
+        """Whether this line could be a sublisting, which takes its company from the row above. Rows it is true for are only reused by parse under the same company."""
+        return "↳" in line
+
     @abstractmethod
+    def parse_row(self, listing_data : list[str], last_company : str) -> tuple[list[JobListing], str | None]:
+        """Parses one table row.
+
+            Args:
+                listing_data (list[str]): The row split on "|", with every cell stripped.
+                last_company (str): Company name of the last row which set one; sublistings ("↳") belong to it.
+
+            Returns:
+                The job listings in this row, and the company name following sublistings belong to (None to leave it unchanged).
+        """
+        pass
+
+    def parse(self, lines : Iterable[str]) -> Iterator[JobListing]:
+        """Parses job listings out of README lines, yielding them as soon as their row is read. Rows which are identical to a row of the previous parse are not parsed again."""
+        row_cache : dict[tuple[int, int, str], tuple[list[JobListing], str | None]] = {}
+        last_company = ""
+        data_started = False
+        rows_parsed = 0
+
+        for line in lines:
+            # First, find where the table starts.
+            if not data_started:
+                data_started = self.is_table_start(line)
+                continue
+
+            if self.is_table_end(line):
+                break
+
+            # Skip away any empty lines.
+            if line.strip() == "":
+                continue
+
+            # Sublistings take their company from the row above, so the same line can mean a different listing under a different company.
+            key = (hash(line), len(line), last_company if self.is_sublisting(line) else "")
+
+            row = self.row_cache.get(key)
+            if row is None:
+                # Get data nicely and make sure to remove all spaces through strip().
+                row = self.parse_row([x.strip() for x in line.split("|")], last_company)
+                rows_parsed += 1
+
+            row_cache[key] = row
+            row_listings, company = row
+            yield from row_listings
+
+            if company is not None:
+                last_company = company
+
+        self.row_cache = row_cache
+
+        report = refresh_report.active()
+        report.count("rows_parsed", rows_parsed, self.provider_name)
+        report.count("rows_reused", len(row_cache) - rows_parsed, self.provider_name)
+
+    def parse_in_pool(self, pool : Executor, text : str) -> Iterable[JobListing]:
+        """Parses a whole README on a process pool (see tracker_settings.PARSE_WORKERS). Trackers which can't be sent to another process parse it here instead."""
+        return self.parse(text.splitlines())
+
+    def stream(self, force : bool = False, pool : Executor | None = None) -> Iterator[JobListing]:
+        """Yields every job listing of the tracker while the README downloads, without duplicates. An unchanged README yields the listings from last time without parsing.
+        Once the generator is exhausted, self.last_listings and self.last_removed describe this refresh. If it fails part way, the listings already yielded stay,
+        and the rest are kept from the previous refresh (see keep_partial).
+
+            Args:
+                force (bool): If true, skips any data refresh cooldown. By default, this is false.
+                pool (Executor | None): If given, the README is downloaded completely and parsed on this process pool (see parse_in_pool). By default, it is parsed on this thread while it downloads.
+        """
+        r = self.fetch(force)
+        if r is None:
+            self.last_removed = []
+            yield from self.last_listings
+            return
+
+        # Duplicates within one README are resolved here by keeping the first, the same way Tracker does between trackers.
+        unique_listings : dict[tuple[str, str, str], JobListing] = {}
+        # Only the time spent here counts as parsing (which includes downloading the body while it streams), not the time the caller takes between listings.
+        parse_time = 0.0
+        start = time.perf_counter()
+        try:
+            with r:
+                listings = self.parse(r.iter_lines(decode_unicode=True)) if pool is None else self.parse_in_pool(pool, r.text)
+                for listing in listings:
+                    key = (listing.company_name, listing.job_title, listing.location)
+                    if key in unique_listings:
+                        continue
+
+                    unique_listings[key] = listing
+                    parse_time += time.perf_counter() - start
+                    yield listing
+                    start = time.perf_counter()
+
+                parse_time += time.perf_counter() - start
+                report = refresh_report.active()
+                report.add_time("parse", parse_time, self.provider_name)
+                if not getattr(r, "from_cache", False):
+                    report.count("bytes", self.downloaded_bytes(r), self.provider_name)
+        except Exception:
+            self.keep_partial(unique_listings)
+            raise
+
+        job_listings = list(unique_listings.values())
+        new_listings = set(job_listings)
+        report.count("listings", len(job_listings), self.provider_name)
+
+        # Only remember the README (and its validators) once it was parsed successfully.
+        self.last_removed = [listing for listing in self.last_listings if listing not in new_listings]
+        self.last_listings = job_listings
+        self.has_parsed = True
+        self.last_etag = r.headers.get("ETag")
+        self.last_modified = r.headers.get("Last-Modified")
+
+    def keep_partial(self, unique_listings : dict[tuple[str, str, str], JobListing]) -> None:
+        """Called when parsing fails part way. The listings already yielded may be shown by now, so they become this tracker's listings,
+        with the listings of the previous refresh for every other company name, job title and location.
+
+            Args:
+                unique_listings (dict[tuple[str, str, str], JobListing]): Every listing yielded before the failure, by (company name, job title, location).
+        """
+        if not unique_listings:
+            return # Nothing was yielded; the previous refresh still holds.
+
+        self.last_listings = list(unique_listings.values()) + [
+            listing for listing in self.last_listings
+            if (listing.company_name, listing.job_title, listing.location) not in unique_listings
+        ]
+        self.last_removed = []
+        # These listings match neither README, so the next refresh parses the whole README again instead of revalidating.
+        self.has_parsed = False
+        self.row_cache = {}
+
     def get(self, force : bool = False) -> list[JobListing]:
         """Gets job listing dictionary from the tracker.
 
@@ -14,7 +236,6 @@ class TrackerABC(ABC):
                 force (bool): If true, skips any data refresh cooldown. By default, this is false.
 
             Returns:
-                Returns a list of all job listings associated with this tracker.
+                Returns a list of all job listings associated with this tracker, without duplicates.
         """
-        pass
-
+        return list(self.stream(force))
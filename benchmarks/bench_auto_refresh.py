@@ -0,0 +1,54 @@
+"""Times one background refresh of a tracker (Backend.refresh_tracker) against a full load, and checks that only the listings which changed are pushed to the GUI.
+
+Run from the repository root with: python -m benchmarks.bench_auto_refresh
+"""
+import os
+import tempfile
+import threading
+
+from apptracker.backend import Backend
+from apptracker.tracker import Tracker
+
+from benchmarks.common import ReadmeServer, SIMPLIFY_PATH, default_bodies, fake_sheets, point_trackers_at, simplify_readme, timed
+
+ROW_COUNT = 5000
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+
+    with ReadmeServer(default_bodies(ROW_COUNT)) as server:
+        b = Backend()
+        b.sheets = fake_sheets()
+        b.tracker = Tracker()
+        point_trackers_at(b.tracker, server.base_url)
+        simplify = next(position for position, t in enumerate(b.tracker.trackers) if t.provider_name == "Pitt CSC & Simplify")
+
+        load_time = timed(lambda: b.load(threading.Event()), repeat=1)
+        shown = len(b.to_display_job_lsting)
+
+        def refresh(name : str, expire_cache : bool):
+            start_requests, start_bytes = server.request_count, server.bytes_sent
+            if expire_cache:
+                b.tracker.session.cache.clear()
+
+            refresh_time = timed(lambda: b.refresh_tracker(simplify), repeat=1)
+            changes = []
+            while not b.display_changes.empty():
+                changes.append(b.display_changes.get())
+
+            added = sum(len(change[1]) for change in changes)
+            removed = sum(len(change[2]) for change in changes)
+            print(f"{name:<34} {refresh_time * 1000:>8.1f} ms  requests={server.request_count - start_requests} bytes={server.bytes_sent - start_bytes:>8} added={added} removed={removed}")
+            return added, removed
+
+        print(f"{'full load':<34} {load_time * 1000:>8.1f} ms  listings={shown}")
+        assert refresh("refresh, cache still fresh", False) == (0, 0)
+        assert refresh("refresh, README unchanged (304)", True) == (0, 0)
+
+        server.set_body(SIMPLIFY_PATH, simplify_readme(ROW_COUNT + 1))
+        added, removed = refresh("refresh, one row added", True)
+        assert added <= 1 and removed == 0
+        assert len(b.to_display_job_lsting) == shown + added
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Times classifying the listings of a refresh one get_job_status call at a time versus Sheets.classify, with 5k listings against 5k historical rows.
+
+Run from the repository root with: python -m benchmarks.bench_classify
+"""
+import os
+import random
+import tempfile
+
+from apptracker.trackers.joblisting import JobListing
+from apptracker.status_index import PLACEHOLDER_URLS
+
+from benchmarks.common import LOCATIONS, ROLES, fake_sheets, timed
+
+LISTING_COUNT = 5000
+ROW_COUNT = 5000
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    rng = random.Random(0)
+    placeholder_links = sorted(PLACEHOLDER_URLS) # What the links were kept in before: a list, scanned on every lookup.
+
+    # Half the listings are already in the history, some matched by URL and some only by company, title and location.
+    listings = []
+    for i in range(LISTING_COUNT):
+        url = rng.choice(placeholder_links) if rng.random() < 0.1 else f"https://company{i}.com/job/{i}"
+        listings.append(JobListing(f"Company{i}", rng.choice(ROLES), rng.choice(LOCATIONS), url, "Synthetic"))
+
+    history = []
+    for listing in rng.sample(listings, ROW_COUNT // 2):
+        url = listing.url if rng.random() < 0.5 else "https://elsewhere.com/" + listing.company_name
+        history.append([listing.company_name, listing.job_title, url, listing.location])
+    history += [[f"Old{i}", "SWE Intern", f"https://old.com/{i}", "Remote"] for i in range(ROW_COUNT - len(history))]
+
+    sheets = fake_sheets(history[::2], history[1::2])
+    sheets.reload(force=True)
+
+    def before(listing):
+        """get_job_status as it was, scanning the placeholder links on every call."""
+        url = listing.url if listing.url not in placeholder_links else None
+        return sheets.statuses.get(listing.company_name, listing.job_title, listing.location, url).value
+
+    original = lambda: [before(l) for l in listings]
+    one_by_one = lambda: [sheets.get_job_status(l.company_name, l.job_title, l.location, l.url).value for l in listings]
+    assert bytearray(original()) == bytearray(one_by_one()) == sheets.classify(listings)
+
+    original_time = timed(original)
+    old_time = timed(one_by_one)
+    new_time = timed(lambda: sheets.classify(listings))
+    print(f"{LISTING_COUNT} listings against {ROW_COUNT} rows")
+    print(f"values() scan per listing:  {original_time * 1000:7.2f} ms")
+    print(f"get_job_status per listing: {old_time * 1000:7.2f} ms")
+    print(f"classify:                   {new_time * 1000:7.2f} ms ({original_time / new_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Counts README bytes downloaded and rows parsed across refreshes, to check that unchanged READMEs are revalidated instead of downloaded.
+The repository has no test suite, so this is also the test for conditional requests: it fails with an AssertionError if a cached, unchanged
+or forced refresh downloads or parses anything it should not, or if a changed README is not downloaded and parsed exactly once.
+
+Run from the repository root with: python -m benchmarks.bench_conditional_requests
+"""
+from apptracker.tracker import Tracker
+
+from benchmarks.common import ReadmeServer, SIMPLIFY_PATH, default_bodies, point_trackers_at, simplify_readme
+
+def main():
+    with ReadmeServer(default_bodies(2000)) as server:
+        tracker = Tracker()
+        point_trackers_at(tracker, server.base_url)
+
+        parse_calls = 0
+        for t in tracker.trackers:
+            parse = t.parse
+
+            def counted_parse(text, parse=parse):
+                nonlocal parse_calls
+                parse_calls += 1
+                return parse(text)
+
+            t.parse = counted_parse
+
+        def refresh(name : str, force : bool):
+            start_bytes, start_requests, start_parses = server.bytes_sent, server.request_count, parse_calls
+            tracker.get(force=force)
+            assert not tracker.errors, tracker.errors
+
+            print(f"{name:<32} requests={server.request_count - start_requests} bytes={server.bytes_sent - start_bytes:>8} parses={parse_calls - start_parses}")
+            return server.bytes_sent - start_bytes, parse_calls - start_parses
+
+        assert refresh("cold refresh", False)[1] == 3
+        assert refresh("cached refresh", False) == (0, 0)
+        assert refresh("forced refresh, unchanged", True) == (0, 0)
+
+        server.set_body(SIMPLIFY_PATH, simplify_readme(2001))
+        bytes_sent, parses = refresh("forced refresh, one README new", True)
+        assert bytes_sent == len(server.bodies[SIMPLIFY_PATH][0]) and parses == 1
+
+        print(f"304 Not Modified responses: {server.not_modified_count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compares the old nested-list duplicate scan plus deepcopy against Tracker's hashed index on synthetic listings.
+
+Run from the repository root with: python -m benchmarks.bench_dedup_index
+"""
+from copy import deepcopy
+
+from apptracker.tracker import Tracker
+from apptracker.trackers.joblisting import JobListing
+
+from benchmarks.common import timed
+
+SIZES = (10_000, 50_000, 100_000)
+
+class ListTracker:
+    """Stands in for a real tracker by returning a fixed list of listings."""
+    def __init__(self, listings : list[JobListing]):
+        self.provider_name = "Synthetic"
+        self.listings = listings
+        self.last_listings = []
+        self.last_removed = []
+
+    def stream(self, force : bool = False, pool = None):
+        yield from self.listings
+
+def synthetic_listings(count : int) -> list[JobListing]:
+    # 500 companies with 4 job titles each, so every (company, title) bucket grows with count like a real README does.
+    # Every tenth listing repeats an earlier location to exercise the duplicate path.
+    listings = []
+    for i in range(count):
+        company = f"Company{i % 500}"
+        title = f"Role{(i // 500) % 4}"
+        location = f"City{(i // 2000) if i % 10 else 0}"
+        listings.append(JobListing(company, title, location, f"https://example.com/{i}", "Synthetic"))
+    return listings
+
+def old_merge(listings : list[JobListing]):
+    job_listings = {}
+    for listing in listings:
+        if not listing.company_name in job_listings:
+            job_listings[listing.company_name] = {}
+
+        if not listing.job_title in job_listings[listing.company_name]:
+            job_listings[listing.company_name][listing.job_title] = []
+
+        found = False
+        for duplicate_listing in job_listings[listing.company_name][listing.job_title]:
+            if listing.location == duplicate_listing.location:
+                found = True
+                break
+
+        if found:
+            continue
+
+        job_listings[listing.company_name][listing.job_title].append(listing)
+
+    return deepcopy(job_listings)
+
+def new_merge(listings : list[JobListing]):
+    tracker = Tracker()
+    tracker.trackers = [ListTracker(listings)]
+    return tracker.get()
+
+def main():
+    print(f"{'listings':>10} {'old (s)':>10} {'new (s)':>10} {'speedup':>10}")
+    for size in SIZES:
+        listings = synthetic_listings(size)
+
+        old = sum(len(x) for titles in old_merge(listings).values() for x in titles.values())
+        new = len(new_merge(listings))
+        assert old == new, (old, new)
+
+        old_time = timed(lambda: old_merge(listings), repeat=1)
+        new_time = timed(lambda: new_merge(listings))
+        print(f"{size:>10} {old_time:>10.3f} {new_time:>10.3f} {old_time / new_time:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Checks that the single-pass markdown link helpers give the same output as the original ones on README cells, and times them.
+The repository has no test suite, so this is also the regression test for helpers.find_md_links and helpers.replace_md_links: it fails
+with an AssertionError if either gives a different result than the original on any cell.
+
+Run from the repository root with: python -m benchmarks.bench_md_links
+"""
+import re
+
+import apptracker.trackers.helpers as helpers
+
+from benchmarks.common import northwestern_readme, simplify_readme, timed
+
+# Company and role cells in the forms the README tables use, on top of the synthetic READMEs.
+EXTRA_CELLS = [
+    "Jane Street",
+    "**[Two Sigma](https://simplify.jobs/c/Two-Sigma)**",
+    "**[AT&T](https://simplify.jobs/c/AT&T)**",
+    "[Citadel](https://www.citadel.com/careers/)",
+    "[Hudson River Trading](https://www.hudsonrivertrading.com)",
+    "**Optiver**",
+    "↳",
+    "[✅](https://www.janestreet.com/join-jane-street/position/7000000002/)",
+    "[**Akuna**](https://akunacapital.com) Capital",
+    "",
+]
+
+def old_find_md_links(md):
+    INLINE_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+    FOOTNOTE_LINK_TEXT_RE = re.compile(r'\[([^\]]+)\]\[(\d+)\]')
+    FOOTNOTE_LINK_URL_RE = re.compile(r'\[(\d+)\]:\s+(\S+)')
+
+    links = list(INLINE_LINK_RE.findall(md))
+    footnote_links = dict(FOOTNOTE_LINK_TEXT_RE.findall(md))
+    footnote_urls = dict(FOOTNOTE_LINK_URL_RE.findall(md))
+
+    footnotes_linking = []
+    for key in footnote_links.keys():
+        footnotes_linking.append((footnote_links[key], footnote_urls[footnote_links[key]]))
+
+    return {'regular': links, 'footnotes': footnotes_linking}
+
+def old_replace_md_links(md, f):
+    links = old_find_md_links(md)
+    newmd = md
+
+    for r in links['regular']:
+        newmd = newmd.replace(f"({r[1]})", f(r[1])).replace(f"[{r[0]}]", r[0])
+
+    for r in links['footnotes']:
+        newmd = newmd.replace(f"({(r[1])})", f(r[1]))
+
+    return newmd.replace("**", "")
+
+def corpus() -> list[str]:
+    cells = list(EXTRA_CELLS)
+    for text in (simplify_readme(3000), northwestern_readme(1000)):
+        for line in text.splitlines():
+            if line.startswith("|"):
+                cells.extend(x.strip() for x in line.split("|"))
+    return cells
+
+def main():
+    cells = corpus()
+    strip = lambda _ : ""
+
+    old = [old_replace_md_links(cell, strip) for cell in cells]
+    assert [helpers.replace_md_links(cell, strip) for cell in cells] == old
+    assert [old_find_md_links(cell) for cell in cells] == [helpers.find_md_links(cell) for cell in cells]
+    print(f"identical output on {len(cells)} cells")
+
+    old_time = timed(lambda: [old_replace_md_links(cell, strip) for cell in cells])
+    new_time = timed(lambda: [helpers.replace_md_links(cell, strip) for cell in cells])
+
+    print(f"original:    {old_time * 1000:8.1f} ms")
+    print(f"single pass: {new_time * 1000:8.1f} ms ({old_time / new_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
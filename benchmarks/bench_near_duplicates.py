@@ -0,0 +1,129 @@
+"""Times finding near-duplicate listings (DuplicateIndex) among 50k listings against what comparing every pair would cost, and checks how many of the
+duplicates planted in the synthetic listings it finds and how many listings it flags wrongly.
+
+Like on real job boards, a company's roles link to one page told apart only by the query (careers?gh_jid=123), and some companies share a careers
+site with other companies (careers.parent.com/JobDetail?jobCode=...). Some roles are open in two nearby cities, or a second job board lists them in
+the other one (Seattle, WA and Bellevue, WA). None of those are duplicates of each other.
+
+Run from the repository root with: python -m benchmarks.bench_near_duplicates
+"""
+import random
+import time
+
+from apptracker.duplicate_index import DuplicateIndex
+from apptracker.settings import Settings
+from apptracker.trackers.joblisting import JobListing
+
+from benchmarks.common import LOCATIONS
+
+LISTING_COUNT = 50_000
+DUPLICATE_SHARE = 0.1 # Jobs which a second job board lists too, under a slightly different name.
+ALL_PAIRS_SAMPLE = 2_000 # Listings compared pairwise to estimate what comparing all of them would take.
+
+# The same job as two job boards word it.
+ROLE_VARIANTS = [
+    ("Software Engineer Intern", "SWE Intern - Summer 2025"),
+    ("Data Science Intern", "Data Science Internship"),
+    ("Machine Learning Intern", "ML Intern (Summer 2025)"),
+    ("Backend Engineering Intern", "Backend Engineer Intern"),
+    ("Quantitative Researcher Intern", "Quantitative Researcher Internship"),
+    ("Product Manager Intern", "Product Manager Intern - Summer"),
+]
+COMPANY_SUFFIXES = ["", " Inc.", " Capital", " Technologies", " LLC"]
+FIRST_WORDS = [f"Word{i}" for i in range(5_000)]
+SECOND_WORDS = ["Street", "Systems", "Robotics", "Labs", "Health", "Dynamics", "Analytics", "Energy", "Markets", "Bio"]
+SHARED_SITE_SHARE = 0.2 # Companies whose roles are on a careers site shared with other companies.
+SHARED_SITES = [f"https://careers.parent{i}.com/JobDetail" for i in range(50)]
+NEARBY_SHARE = 0.05 # Roles open in one of the cities below and near it.
+NEARBY_LOCATIONS = [
+    ("Seattle, WA", "Bellevue, WA"),
+    ("New York, NY", "New Jersey"),
+    ("Remote in USA", "Mountain View, CA, USA"),
+    ("San Francisco, CA", "San Jose, CA"),
+]
+
+def synthetic_listings(rng : random.Random) -> tuple[list[JobListing], set[tuple[int, int]]]:
+    """Returns listings and the (original index, duplicate index) pairs planted among them. Every company lists distinct roles, each in distinct cities,
+    so any other pair flagged is wrong.
+    """
+    listings : list[JobListing] = []
+    planted : set[tuple[int, int]] = set()
+    duplicates : list[tuple[int | None, JobListing]] = []
+
+    companies = set()
+    while len(listings) + len(duplicates) < LISTING_COUNT:
+        company = f"{rng.choice(FIRST_WORDS)} {rng.choice(SECOND_WORDS)}"
+        if company in companies:
+            continue
+        companies.add(company)
+
+        if rng.random() < SHARED_SITE_SHARE:
+            page, parameter = rng.choice(SHARED_SITES), "jobCode"
+        else:
+            page, parameter = f"https://{company.replace(' ', '').lower()}.com/careers", "gh_jid"
+
+        for roles in rng.sample(ROLE_VARIANTS, rng.randint(1, 3)):
+            nearby = rng.choice(NEARBY_LOCATIONS) if rng.random() < NEARBY_SHARE else None
+            if nearby is None:
+                locations = [rng.choice(LOCATIONS)]
+            elif rng.random() < 0.5:
+                locations = list(nearby) # Board A lists the role in both cities.
+            else:
+                # Board A lists the role in one city and Board B in the other: two jobs.
+                locations = [nearby[0]]
+                duplicates.append((None, JobListing(company, roles[1], nearby[1], f"https://jobs.lever.co/{company.replace(' ', '').lower()}/{rng.getrandbits(64):x}", "Board B")))
+
+            for location in locations:
+                listings.append(JobListing(company, roles[0], location, f"{page}?{parameter}={len(listings)}", "Board A"))
+
+                if rng.random() < DUPLICATE_SHARE:
+                    duplicate = JobListing(company + rng.choice(COMPANY_SUFFIXES), roles[1], location, f"https://jobs.lever.co/{company.replace(' ', '').lower()}/{rng.getrandbits(64):x}", "Board B")
+                    duplicates.append((len(listings) - 1, duplicate))
+
+    # Second job boards come later in the merge.
+    for original, duplicate in duplicates:
+        if original is not None:
+            planted.add((original, len(listings)))
+        listings.append(duplicate)
+
+    return listings, planted
+
+def main():
+    rng = random.Random(0)
+    listings, planted = synthetic_listings(rng)
+
+    index = DuplicateIndex(Settings.NEAR_DUPLICATE_THRESHOLD)
+    start = time.perf_counter()
+    flagged = {(duplicate_of, listing_id) for listing_id, listing in enumerate(listings) if (duplicate_of := index.add(listing_id, listing)) is not None}
+    index_time = time.perf_counter() - start
+
+    # Comparing every pair would need n * (n - 1) / 2 comparisons; time a sample of them.
+    sample = [index.entries[listing_id][0] for listing_id in range(ALL_PAIRS_SAMPLE)]
+    start = time.perf_counter()
+    for i, features in enumerate(sample):
+        for other in sample[:i]:
+            index.is_duplicate(features, other)
+    pair_time = (time.perf_counter() - start) / (ALL_PAIRS_SAMPLE * (ALL_PAIRS_SAMPLE - 1) / 2)
+    all_pairs_time = pair_time * LISTING_COUNT * (LISTING_COUNT - 1) / 2
+
+    found = len(flagged & planted)
+    print(f"{LISTING_COUNT} listings, {len(planted)} planted duplicates, {len(index.blocks)} blocks (largest {max(map(len, index.blocks.values()))})")
+    print(f"blocking index:          {index_time * 1000:>10.1f} ms")
+    print(f"all pairs (estimated):   {all_pairs_time * 1000:>10.1f} ms ({all_pairs_time / index_time:.0f}x)")
+    print(f"found {found} of {len(planted)} planted ({found / len(planted):.1%}), {len(flagged - planted)} flagged wrongly")
+
+    # Different roles on the same page, or different companies on the same site, are not the same job.
+    same_page = sum(1 for original, duplicate in flagged - planted if listings[original].url.split("?")[0] == listings[duplicate].url.split("?")[0])
+    print(f"{same_page} flagged wrongly for only sharing a page")
+    assert same_page == 0
+
+    # The same role in another city is another job, however near.
+    other_city = sum(1 for original, duplicate in flagged - planted if listings[original].location != listings[duplicate].location)
+    print(f"{other_city} flagged wrongly for only being in a city nearby")
+    assert other_city == 0
+
+    assert found / len(planted) > 0.95
+    assert len(flagged - planted) <= len(planted) * 0.01
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Compares sequential and parallel Tracker refresh times against a local README server.
+
+Run from the repository root with: python -m benchmarks.bench_parallel_fetch
+"""
+import apptracker.trackers.tracker_settings as tracker_settings
+from apptracker.tracker import Tracker
+
+from benchmarks.common import ReadmeServer, default_bodies, point_trackers_at, timed
+
+LATENCY = 0.25 # Seconds of simulated network latency per README download.
+ROW_COUNT = 1000 # Table rows per synthetic README.
+
+def main():
+    with ReadmeServer(default_bodies(ROW_COUNT), delay=LATENCY) as server:
+        def cold_refresh():
+            # A new Tracker every run, so nothing is reused from the previous refresh.
+            tracker = Tracker()
+            point_trackers_at(tracker, server.base_url)
+            tracker.get(force=True)
+
+            if tracker.errors:
+                raise RuntimeError(tracker.errors)
+
+        results = {}
+        for parallel in (False, True):
+            tracker_settings.FETCH_IN_PARALLEL = parallel
+            results[parallel] = timed(cold_refresh)
+
+        print(f"sequential refresh: {results[False]:.3f}s")
+        print(f"parallel refresh:   {results[True]:.3f}s")
+        print(f"speedup:            {results[False] / results[True]:.2f}x")
+
+if __name__ == "__main__":
+    main()
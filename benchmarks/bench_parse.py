@@ -0,0 +1,46 @@
+"""Measures README parse throughput (rows/second) with BeautifulSoup on every row versus the precompiled link extractor.
+
+Run from the repository root with: python -m benchmarks.bench_parse
+"""
+import requests_cache
+from bs4 import BeautifulSoup
+
+import apptracker.trackers.helpers as helpers
+from apptracker.trackers.table_tracker import TableTracker
+import apptracker.trackers.ouckah as ouckah
+import apptracker.trackers.simplify as simplify
+
+from benchmarks.common import ouckah_readme, simplify_readme, timed
+
+ROW_COUNT = 5000
+
+def bs4_extract_link(cell : str) -> str | None:
+    """How every row was parsed before the fast path."""
+    if cell == helpers.CLOSED_MARKER:
+        return None
+
+    return BeautifulSoup(cell, "lxml").find("a")["href"]
+
+def cold_parse(tracker, text : str):
+    tracker.row_cache = {} # Parse every row, not just the changed ones.
+    return list(tracker.parse(text.splitlines()))
+
+def main():
+    session = requests_cache.CachedSession(backend="memory")
+    fast_extract_link = helpers.extract_link
+
+    print(f"{'tracker':<24} {'bs4 rows/s':>12} {'fast rows/s':>12} {'speedup':>8}")
+    for tracker, text in ((TableTracker(session, ouckah.SCHEMA), ouckah_readme(ROW_COUNT)), (TableTracker(session, simplify.SCHEMA), simplify_readme(ROW_COUNT))):
+        helpers.extract_link = bs4_extract_link
+        before = cold_parse(tracker, text)
+        before_time = timed(lambda: cold_parse(tracker, text), repeat=1)
+
+        helpers.extract_link = fast_extract_link
+        after = cold_parse(tracker, text)
+        after_time = timed(lambda: cold_parse(tracker, text))
+
+        assert before == after
+        print(f"{tracker.provider_name:<24} {ROW_COUNT / before_time:>12.0f} {ROW_COUNT / after_time:>12.0f} {before_time / after_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Times a full refresh of a corpus of READMEs parsed on the download threads (0 workers) versus on a process pool of 1, 2, 4 and 8 workers
+(tracker_settings.PARSE_WORKERS), and checks every setting gives the same listings.
+
+Run from the repository root with: python -m benchmarks.bench_parse_workers
+Parsing is CPU-bound, so the speedup is bounded by the number of CPU cores; it is printed with the results.
+"""
+import dataclasses
+import os
+import tempfile
+
+import apptracker.trackers.northwesternfintech as northwesternfintech
+import apptracker.trackers.ouckah as ouckah
+import apptracker.trackers.registry as registry
+import apptracker.trackers.simplify as simplify
+import apptracker.trackers.tracker_settings as tracker_settings
+from apptracker.tracker import Tracker
+
+from benchmarks.common import ReadmeServer, northwestern_readme, ouckah_readme, point_trackers_at, simplify_readme, timed
+
+README_COUNT = 12 # Like tracking past seasons, new grad and off-season lists of each repository.
+ROW_COUNT = 5000 # Table rows per README.
+WORKER_COUNTS = (0, 1, 2, 4, 8)
+
+def corpus() -> dict[str, str]:
+    """Registers README_COUNT trackers in the three built-in formats and returns their README bodies by path."""
+    formats = (
+        (simplify.SCHEMA, simplify_readme, ROW_COUNT),
+        (ouckah.SCHEMA, ouckah_readme, ROW_COUNT),
+        (northwesternfintech.SCHEMA, northwestern_readme, ROW_COUNT // 3), # Up to three listings per row.
+    )
+
+    # Only the corpus; the built-in trackers would ask GitHub.
+    tracker_settings.TRACKERS_ENABLED = {provider_name: False for provider_name in registry.SCHEMAS}
+
+    bodies = {}
+    for i in range(README_COUNT):
+        schema, readme, row_count = formats[i % len(formats)]
+        path = f"/corpus/readme{i}/README.md"
+        registry.register(dataclasses.replace(schema,
+            provider_name = f"{schema.provider_name} {i}",
+            raw_url = "https://raw.githubusercontent.com" + path,
+            display_url = f"https://github.com/corpus/readme{i}"
+        ))
+        bodies[path] = readme(row_count, seed=i)
+    return bodies
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+
+    with ReadmeServer(corpus()) as server:
+        print(f"{README_COUNT} READMEs, {os.cpu_count()} CPU cores")
+        print(f"{'workers':>8} {'refresh (s)':>12} {'speedup':>8} {'listings':>9}")
+
+        expected = None
+        baseline = None
+        for workers in WORKER_COUNTS:
+            tracker_settings.PARSE_WORKERS = workers
+            tracker = Tracker()
+            point_trackers_at(tracker, server.base_url)
+            assert len(tracker.trackers) == README_COUNT
+
+            def full_refresh():
+                # Download and parse everything again, as on the first refresh of the day.
+                tracker.session.cache.clear()
+                for t in tracker.trackers:
+                    t.has_parsed = False
+                    t.row_cache = {}
+
+                listings = tracker.get()
+                if tracker.errors:
+                    raise RuntimeError(tracker.errors)
+                return listings
+
+            listings = full_refresh() # Starts the workers.
+            if expected is None:
+                expected = listings
+            assert listings == expected
+
+            refresh_time = timed(full_refresh)
+            tracker.close()
+
+            baseline = baseline or refresh_time
+            print(f"{workers:>8} {refresh_time:>12.3f} {baseline / refresh_time:>7.2f}x {len(listings):>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Counts Google Sheets API calls made while triaging listings, against fake worksheets, and checks the write-behind buffer survives a crash.
+
+Run from the repository root with: python -m benchmarks.bench_sheet_writes
+"""
+import os
+import tempfile
+
+from apptracker.settings import Settings
+from apptracker.sheets import JobStatus
+
+from benchmarks.common import fake_sheets
+
+CLICKS = 100
+
+def api_calls(sheets) -> int:
+    return sum(ws.api_calls for ws in sheets.worksheets.values())
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    Settings.SHEETS_FLUSH_INTERVAL = 3600 # Only the row count and explicit flushes should trigger writes here.
+
+    sheets = fake_sheets([["Existing", "SWE Intern", "https://existing.com", "Remote"]])
+    sheets.reload(force=True)
+    start_calls = api_calls(sheets)
+
+    for i in range(CLICKS):
+        add = sheets.add_applied if i % 2 else sheets.add_discarded
+        add(f"Company{i}", "SWE Intern", "Remote", f"https://company{i}.com/job")
+        # Local indexes must see the row before it is sent.
+        assert sheets.get_job_status(f"Company{i}", "SWE Intern", "Remote", "") != JobStatus.NOT_APPLIED
+
+    sheets.flush()
+    calls = api_calls(sheets) - start_calls
+    print(f"{CLICKS} clicks: {calls} API calls (was {CLICKS * 2} plus up to {CLICKS} reloads before buffering)")
+    assert calls <= 2 * (CLICKS // Settings.SHEETS_FLUSH_ROW_COUNT + 1)
+    assert sum(len(ws.rows) for ws in sheets.worksheets.values()) == CLICKS + 1
+    assert not any(sheets.pending_rows.values())
+
+    # A crash before the flush: the next run picks the rows up from disk and sends them.
+    sheets.add_applied("Crashed", "SWE Intern", "Remote", "https://crashed.com")
+    sheets.flush_timer.cancel()
+    applied_rows = sheets.worksheets["Applications"].rows
+
+    restarted = fake_sheets(applied_rows)
+    restarted.reload(force=True)
+    assert restarted.get_job_status("Crashed", "SWE Intern", "Remote", "") == JobStatus.APPLIED
+    restarted.flush()
+    assert restarted.worksheets["Applications"].rows[-1] == ["Crashed", "SWE Intern", "https://crashed.com", "Remote"]
+
+    # A crash after sending but before the queue file was updated: the row must not be sent twice.
+    with open(Settings.SHEETS_PENDING_ROWS_FILE, "w") as file:
+        file.write('{"Applications": [["Crashed", "SWE Intern", "https://crashed.com", "Remote"]], "Ignore": []}')
+
+    restarted_again = fake_sheets(restarted.worksheets["Applications"].rows)
+    restarted_again.reload(force=True)
+    restarted_again.flush()
+    assert restarted_again.worksheets["Applications"].rows == restarted.worksheets["Applications"].rows
+    print("recovered unsent rows after a crash without duplicating sent ones")
+
+if __name__ == "__main__":
+    main()
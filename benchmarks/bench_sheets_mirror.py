@@ -0,0 +1,69 @@
+"""Measures what a Sheets reload downloads with the local mirror, and how fast statuses are available at startup, against fake worksheets.
+
+Run from the repository root with: python -m benchmarks.bench_sheets_mirror
+"""
+import os
+import tempfile
+import time
+
+from apptracker.sheets import JobStatus
+
+from benchmarks.common import fake_sheets
+
+ROW_COUNT = 5000
+
+def history(count : int, prefix : str) -> list[list[str]]:
+    return [[f"{prefix}Company{i}", "SWE Intern", f"https://{prefix.lower()}{i}.com/job", "Remote"] for i in range(count)]
+
+def rows_downloaded(sheets) -> int:
+    return sum(len(rows) for rows in sheets.downloaded)
+
+def track_downloads(sheets):
+    """Records every batch of rows the fake worksheets hand out."""
+    sheets.downloaded = []
+    for ws in sheets.worksheets.values():
+        for method in ("get", "get_all_values"):
+            original = getattr(ws, method)
+
+            def recorded(*args, original=original):
+                rows = original(*args)
+                sheets.downloaded.append(rows)
+                return rows
+
+            setattr(ws, method, recorded)
+
+def reload(sheets, name : str) -> int:
+    start = rows_downloaded(sheets)
+    sheets.reload(force=True)
+    downloaded = rows_downloaded(sheets) - start
+    print(f"{name:<36} rows downloaded={downloaded}")
+    return downloaded
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    applied, discarded = history(ROW_COUNT, "A"), history(ROW_COUNT, "D")
+
+    sheets = fake_sheets(applied, discarded)
+    track_downloads(sheets)
+    assert reload(sheets, "first run (empty mirror)") == 2 * ROW_COUNT
+    assert reload(sheets, "nothing changed") == 2 # Just the anchor rows.
+
+    sheets.worksheets["Applications"].rows.append(["New", "SWE Intern", "https://new.com", "Remote"])
+    assert reload(sheets, "one row added elsewhere") == 3
+    assert sheets.get_job_status("New", "SWE Intern", "Remote", "") == JobStatus.APPLIED
+
+    del sheets.worksheets["Ignore"].rows[10]
+    # The Applications anchor, then the whole Ignore worksheet since its anchor row is gone.
+    assert reload(sheets, "a discarded row deleted") == 1 + ROW_COUNT - 1
+    assert sheets.get_job_status("DCompany10", "SWE Intern", "Remote", "") == JobStatus.NOT_APPLIED
+
+    # Startup: statuses come from the mirror before anything is downloaded.
+    start = time.perf_counter()
+    restarted = fake_sheets(sheets.worksheets["Applications"].rows, sheets.worksheets["Ignore"].rows)
+    startup = time.perf_counter() - start
+    assert restarted.get_job_status("ACompany42", "SWE Intern", "Remote", "") == JobStatus.APPLIED
+    assert sum(ws.api_calls for ws in restarted.worksheets.values()) == 0
+    print(f"startup with {2 * ROW_COUNT} mirrored rows: {startup * 1000:.1f} ms, no API calls")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Times how long a fresh start takes to have listings to show, with and without the listing snapshot, and checks that reconciling an unchanged snapshot changes nothing.
+
+Run from the repository root with: python -m benchmarks.bench_snapshot
+"""
+import contextlib
+import io
+import os
+import tempfile
+import threading
+
+from apptracker.backend import Backend
+from apptracker.settings import Settings
+from apptracker.tracker import Tracker
+
+from benchmarks.common import ReadmeServer, SIMPLIFY_PATH, default_bodies, fake_sheets, point_trackers_at, simplify_readme, timed
+
+ROW_COUNTS = (1_000, 10_000)
+
+def connect(b : Backend, base_url : str) -> Backend:
+    """Does what Backend.connect would, with Google Sheets faked and the trackers pointed at the local server."""
+    b.sheets = fake_sheets()
+    b.tracker = Tracker()
+    point_trackers_at(b.tracker, base_url)
+    return b
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+
+    print(f"{'rows/README':>12} {'listings':>9} {'full load (ms)':>15} {'snapshot (ms)':>14} {'file (KB)':>10} {'reconcile (ms)':>15}")
+    for row_count in ROW_COUNTS:
+        with ReadmeServer(default_bodies(row_count)) as server, contextlib.redirect_stdout(io.StringIO()):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(Settings.LISTING_SNAPSHOT_FILE)
+
+            # Without a snapshot, nothing can be shown until the first load is done.
+            first = connect(Backend(), server.base_url)
+            load_time = timed(lambda: first.load(threading.Event()), repeat=1)
+
+            # With one, a fresh start shows the same listings before signing in to Google Sheets or downloading anything.
+            second = Backend()
+            snapshot_time = timed(lambda: second.load_snapshot(), repeat=1)
+            assert list(second.to_display_job_lsting.values()) == list(first.to_display_job_lsting.values())
+            assert second.sheets is None and second.tracker is None
+
+            connect(second, server.base_url)
+            requests_before = server.request_count
+            reconcile_time = timed(lambda: second.reconcile(threading.Event()), repeat=1)
+            assert second.display_changes.empty()
+            assert server.not_modified_count == server.request_count - requests_before == 3 # Only revalidated, never parsed again.
+
+            # A README which changed while the app was closed comes in as a change, not a reload.
+            third = Backend()
+            third.load_snapshot()
+            connect(third, server.base_url)
+            server.set_body(SIMPLIFY_PATH, simplify_readme(row_count + 1))
+            third.reconcile(threading.Event())
+            generation, added, removed = third.display_changes.get_nowait()
+            assert len(added) <= 1 and removed == []
+
+        print(f"{row_count:>12} {len(first.to_display_job_lsting):>9} {load_time * 1000:>15.1f} {snapshot_time * 1000:>14.1f} {os.path.getsize(Settings.LISTING_SNAPSHOT_FILE) / 1024:>10.0f} {reconcile_time * 1000:>15.1f}")
+
+if __name__ == "__main__":
+    main()
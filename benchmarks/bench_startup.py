@@ -0,0 +1,105 @@
+"""Measures how fast the app starts: what importing apptracker.gui costs (a `python -X importtime` breakdown), and the time from launching
+python to the window being on screen, with and without a listing snapshot.
+
+Fails if importing the GUI pulls in a module which should only be imported on the backend's worker thread (HEAVY_MODULES).
+Timing the window needs a display. On a headless machine run it under Xvfb from the repository root with:
+    xvfb-run -a python -m benchmarks.bench_startup
+"""
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from apptracker.listing_snapshot import ListingSnapshot
+from apptracker.settings import Settings
+from apptracker.trackers.joblisting import JobListing
+
+from benchmarks.common import LOCATIONS, ROLES
+
+HEAVY_MODULES = ("gspread", "google", "requests", "requests_cache", "urllib3", "pyperclip")
+TOP_IMPORTS = 15
+RUNS = 5
+SNAPSHOT_LISTINGS = 20_000
+
+# Runs in a fresh interpreter. Prints the seconds from argv[1] (time.time() when the parent launched it) until the window is drawn.
+WINDOW_SCRIPT = """
+import os, sys, time
+import tkinter as tk
+
+import apptracker.gui as gui
+
+root = tk.Tk()
+view = gui.GUI(root)
+view.pack(side="top", fill="both", expand=True)
+root.update()
+print(time.time() - float(sys.argv[1]), len(view.view_ids))
+sys.stdout.flush()
+os._exit(0) # Don't wait for the backend's threads.
+"""
+
+def import_times() -> list[tuple[int, int, str]]:
+    """Returns (self us, cumulative us, module) of every module imported by `import apptracker.gui` in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import apptracker.gui"], capture_output=True, text=True, check=True)
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(self_time), int(cumulative), name.strip()))
+    return times
+
+def time_to_window(cwd : str) -> tuple[float, int]:
+    """Returns the best (seconds from launch until the window is drawn, rows shown) over RUNS runs."""
+    best = (float("inf"), 0)
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", WINDOW_SCRIPT, str(time.time())],
+            cwd=cwd, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=os.getcwd())
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+
+        seconds, rows = result.stdout.split()
+        best = min(best, (float(seconds), int(rows)))
+    return best
+
+def write_snapshot(cwd : str) -> None:
+    rng = random.Random(0)
+    listings = [
+        JobListing(f"Company{rng.randint(1, SNAPSHOT_LISTINGS // 3)}", rng.choice(ROLES), rng.choice(LOCATIONS), f"https://example.com/{i}", "Synthetic")
+        for i in range(SNAPSHOT_LISTINGS)
+    ]
+    ListingSnapshot(listings, 0, {"Synthetic": ('"etag"', None, listings)}).write(os.path.join(cwd, Settings.LISTING_SNAPSHOT_FILE))
+
+def main():
+    times = import_times()
+    total = sum(self_time for self_time, _, _ in times)
+    print(f"import apptracker.gui: {total / 1000:.1f} ms over {len(times)} modules. Slowest (cumulative):")
+    for self_time, cumulative, name in sorted(times, key=lambda entry: entry[1], reverse=True)[:TOP_IMPORTS]:
+        print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+
+    heavy = sorted({name for _, _, name in times if name.split(".")[0] in HEAVY_MODULES})
+    assert not heavy, f"importing the GUI imports {', '.join(heavy)}"
+
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print(f"No display ({e}), skipping time to window. Run this under Xvfb: xvfb-run -a python -m benchmarks.bench_startup")
+        return
+
+    # An empty directory has no key file, so the backend's first load fails in the background; the window is up by then.
+    with tempfile.TemporaryDirectory() as cwd:
+        seconds, _ = time_to_window(cwd)
+        print(f"time to window, no snapshot:                   {seconds * 1000:>8.1f} ms")
+
+        write_snapshot(cwd)
+        seconds, rows = time_to_window(cwd)
+        print(f"time to window, {SNAPSHOT_LISTINGS} listing snapshot:        {seconds * 1000:>8.1f} ms ({rows} rows)")
+
+if __name__ == "__main__":
+    main()
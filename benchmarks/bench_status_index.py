@@ -0,0 +1,95 @@
+"""Compares memory use and get_job_status lookups of the old nested SheetRow dictionaries against StatusIndex, at 10k and 100k historical rows.
+
+Run from the repository root with: python -m benchmarks.bench_status_index
+"""
+import random
+import tracemalloc
+from dataclasses import dataclass
+
+from apptracker.status_index import JobStatus, StatusIndex
+
+from benchmarks.common import LOCATIONS, ROLES, timed
+
+SIZES = (10_000, 100_000)
+LOOKUPS = 100_000
+
+@dataclass
+class SheetRow:
+    row_id : int
+    company_name : str
+    job_title : str
+    location : str
+    url : str
+
+class OldStatuses:
+    """The dictionaries Sheets used to keep: a SheetRow per row in each of a nested and a by-URL dictionary, per worksheet."""
+    def __init__(self):
+        self.applied, self.discarded, self.applied_by_url, self.discarded_by_url = {}, {}, {}, {}
+
+    def add(self, status, row_id, company_name, job_title, job_location, url):
+        nested, by_url = (self.applied, self.applied_by_url) if status == JobStatus.APPLIED else (self.discarded, self.discarded_by_url)
+        nested.setdefault(company_name, {}).setdefault(job_title, []).append(SheetRow(row_id, company_name, job_title, job_location, url))
+        by_url.setdefault(url, []).append(SheetRow(row_id, company_name, job_title, job_location, url))
+
+    def get(self, company_name, job_title, job_location, job_url):
+        if job_url in self.applied_by_url:
+            return JobStatus.APPLIED
+        if job_url in self.discarded_by_url:
+            return JobStatus.DISCARDED
+        for nested, status in ((self.applied, JobStatus.APPLIED), (self.discarded, JobStatus.DISCARDED)):
+            for job in nested.get(company_name, {}).get(job_title, []):
+                if job.location == job_location:
+                    return status
+        return JobStatus.NOT_APPLIED
+
+def fresh(text : str) -> str:
+    """A copy of text that is a different object, like every string read back from SQLite."""
+    return text.encode().decode()
+
+def history(count : int) -> list[tuple]:
+    """Rows as they come back from the mirror: fresh string objects, with company names repeating like a real history."""
+    rng = random.Random(count)
+    rows = []
+    for i in range(count):
+        status = JobStatus.APPLIED if rng.random() < 0.3 else JobStatus.DISCARDED
+        rows.append((status, i, f"Company{rng.randint(1, count // 20)}", fresh(rng.choice(ROLES)), fresh(rng.choice(LOCATIONS)), f"https://example.com/{i}"))
+    return rows
+
+def build_old(rows):
+    index = OldStatuses()
+    for row in rows:
+        index.add(*row)
+    return index
+
+def build_new(rows):
+    index = StatusIndex()
+    for status, _, company_name, job_title, job_location, url in rows:
+        index.add(status, company_name, job_title, job_location, url)
+    return index
+
+def memory(build, rows) -> tuple[object, int]:
+    tracemalloc.start()
+    index = build(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return index, size
+
+def main():
+    print(f"{'rows':>8} {'old MB':>8} {'new MB':>8} {'old lookups/s':>14} {'new lookups/s':>14}")
+    for size in SIZES:
+        rows = history(size)
+        old, old_memory = memory(build_old, rows)
+        new, new_memory = memory(build_new, rows)
+
+        # Half the queries miss on URL and fall through to the company/title/location match.
+        rng = random.Random(0)
+        queries = [(*row[2:5], row[5] if rng.random() < 0.5 else "https://example.com/none") for row in rng.choices(rows, k=LOOKUPS // 2)]
+        queries += [(f"Company{rng.randint(1, size)}", rng.choice(ROLES), rng.choice(LOCATIONS), "https://example.com/none") for _ in range(LOOKUPS // 2)]
+        assert [old.get(*q) for q in queries] == [new.get(*q) for q in queries]
+
+        old_time = timed(lambda: [old.get(*q) for q in queries])
+        new_time = timed(lambda: [new.get(*q) for q in queries])
+        print(f"{size:>8} {old_memory / 2**20:>8.1f} {new_memory / 2**20:>8.1f} {LOOKUPS / old_time:>14.0f} {LOOKUPS / new_time:>14.0f}")
+
+if __name__ == "__main__":
+    main()
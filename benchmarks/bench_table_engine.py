@@ -0,0 +1,91 @@
+"""Measures README parse throughput (rows/second) of the shared table engine (TableTracker) against the hand-written tracker it replaced,
+checks both give the same listings, and checks a tracker registered from outside apptracker is picked up by Tracker.
+
+Run from the repository root with: python -m benchmarks.bench_table_engine
+"""
+import os
+import tempfile
+
+import requests_cache
+
+import apptracker.trackers.helpers as helpers
+import apptracker.trackers.registry as registry
+import apptracker.trackers.simplify as simplify
+from apptracker.tracker import Tracker
+from apptracker.trackers.joblisting import JobListing
+from apptracker.trackers.table_schema import TableSchema
+from apptracker.trackers.table_tracker import TableTracker
+from apptracker.trackers.trackerabc import TrackerABC
+
+from benchmarks.common import simplify_readme, timed
+
+ROW_COUNT = 20_000
+
+class HandWrittenSimplifyTracker(TrackerABC):
+    """How Pitt CSC & Simplify rows were parsed before trackers were declared as TableSchemas."""
+    def __init__(self, session : requests_cache.CachedSession):
+        super().__init__(session)
+
+        self.provider_name = simplify.SCHEMA.provider_name
+        self.raw_url = simplify.SCHEMA.raw_url
+        self.display_url = simplify.SCHEMA.display_url
+
+    def parse_row(self, listing_data : list[str], last_company : str) -> tuple[list[JobListing], str | None]:
+        company_name = listing_data[1]
+        if company_name == "Company" and listing_data[2] == "Role":
+            return [], None
+
+        if company_name == "-------":
+            return [], None
+
+        if company_name == "↳":
+            company_name = last_company
+
+        company_name = helpers.replace_md_links(company_name, lambda _ : "")
+
+        job_url = helpers.extract_link(listing_data[4])
+        if job_url is None:
+            job_url = self.display_url
+        else:
+            job_url = helpers.canonical_url(job_url)
+
+        job_title = listing_data[2].encode('ascii', 'ignore').decode('ascii')
+        job_location = listing_data[3].replace("</br>", " | ").replace("<details><summary>", "").replace("</summary>", " ").replace("</details>", "")
+
+        return [JobListing(company_name, job_title, job_location, job_url, self.provider_name)], company_name
+
+def cold_parse(tracker, lines : list[str]):
+    tracker.row_cache = {} # Parse every row, not just the changed ones.
+    return list(tracker.parse(lines))
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    session = requests_cache.CachedSession(backend="memory")
+    lines = simplify_readme(ROW_COUNT).splitlines()
+
+    before_tracker = HandWrittenSimplifyTracker(session)
+    after_tracker = TableTracker(session, simplify.SCHEMA)
+    assert cold_parse(before_tracker, lines) == cold_parse(after_tracker, lines)
+
+    before_time = timed(lambda: cold_parse(before_tracker, lines), repeat=5)
+    after_time = timed(lambda: cold_parse(after_tracker, lines), repeat=5)
+    print(f"{'tracker':<24} {'hand-written rows/s':>20} {'engine rows/s':>14} {'speedup':>8}")
+    print(f"{simplify.SCHEMA.provider_name:<24} {ROW_COUNT / before_time:>20.0f} {ROW_COUNT / after_time:>14.0f} {before_time / after_time:>7.1f}x")
+
+    # A new source is a declaration, not a module; the same README served under another name parses the same way.
+    registry.register(TableSchema(
+        provider_name = "Synthetic Plugin",
+        raw_url = "https://raw.githubusercontent.com/example/Internships/dev/README.md",
+        display_url = "https://github.com/example/Internships",
+        company_column = 1,
+        title_column = 2,
+        location_column = 3,
+        link_column = 4
+    ))
+    plugin = next(t for t in Tracker().trackers if t.provider_name == "Synthetic Plugin")
+    assert len(cold_parse(plugin, lines)) == len(cold_parse(after_tracker, lines))
+    assert "https://github.com/example/Internships" in registry.PLACEHOLDER_URLS
+    print(f"registered tracker parsed {len(plugin.row_cache)} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Times repainting the listing view for 1k/10k/50k synthetic listings, inserting and measuring every row (as the GUI used to) versus the virtualized view.
+
+Needs a display. On a headless machine run it under Xvfb from the repository root with:
+    xvfb-run -a python -m benchmarks.bench_treeview
+"""
+import queue
+import random
+import sys
+import threading
+import tkinter as tk
+import types
+from tkinter import font
+
+import apptracker.gui as gui
+from apptracker.refresh_report import RefreshReport
+from apptracker.trackers.joblisting import JobListing
+
+from benchmarks.common import LOCATIONS, ROLES, timed
+
+SIZES = (1_000, 10_000, 50_000)
+SCROLL_JUMPS = 100
+
+class StubBackend:
+    """Stands in for Backend so the GUI can be built without Google Sheets or GitHub. Has every method and field of Backend the GUI and
+    RefreshScheduler use; keep it in step with them. Loads, snapshots and refreshes find nothing.
+    """
+    def __init__(self):
+        self.to_display_job_lsting = {}
+        self.possible_duplicates = {}
+        self.jobs_applied_to_count = 0
+        self.tracker = types.SimpleNamespace(trackers=[])
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.display_changes = queue.Queue()
+        self.loaded_listing_ids = []
+        self.load_error = None
+
+    def connect(self) -> None:
+        pass
+
+    def load(self, event : threading.Event, listing_queue = None, report = None):
+        self.loaded_listing_ids = list(self.to_display_job_lsting)
+        if report is None:
+            report = RefreshReport("load")
+            report.finish()
+        event.set()
+
+    def load_snapshot(self) -> None:
+        return None # No snapshot, so the GUI loads from scratch.
+
+    def reconcile(self, event : threading.Event):
+        event.set()
+
+    def refresh_tracker(self, position : int) -> bool:
+        return True
+
+    def drop_listings(self, listing_ids : list[int]) -> None:
+        for listing_id in listing_ids:
+            self.to_display_job_lsting.pop(listing_id, None)
+
+    def add_application(self, event : threading.Event, type : str, listing_id : int):
+        self.to_display_job_lsting.pop(listing_id)
+        event.set()
+
+def synthetic_listings(count : int, seed : int = 0) -> list[JobListing]:
+    rng = random.Random(seed)
+    return [
+        JobListing(f"Company{rng.randint(1, count // 3 + 1)}", rng.choice(ROLES), rng.choice(LOCATIONS), f"https://example.com/{i}", "Synthetic")
+        for i in range(count)
+    ]
+
+def old_repaint(view : gui.GUI, listings : list[JobListing]):
+    """How load_data_into_window_callback used to repaint: one item and four font measurements per listing."""
+    tree = view.job_gridlist
+    tree.delete(*tree.get_children())
+    longest_text = [15, 15, 15, 15]
+    default_font = font.nametofont("TkHeadingFont")
+    for listing in listings:
+        tree.insert('', 'end', None, text=listing.url, values=(listing.company_name, listing.job_title, listing.source, listing.location))
+        longest_text[0] = max(longest_text[0], default_font.measure(listing.company_name + "____"))
+        longest_text[1] = max(longest_text[1], default_font.measure(listing.job_title + "____"))
+        longest_text[2] = max(longest_text[2], default_font.measure(listing.source + "____"))
+        longest_text[3] = max(longest_text[3], default_font.measure(listing.location + "____"))
+
+    for i, col in enumerate(view.columns):
+        tree.column(col, width=longest_text[i])
+
+    view.update()
+
+def new_repaint(view : gui.GUI, listings : list[JobListing]):
+    view.text_widths.clear() # Time a cold width cache, like the first refresh after startup.
+    view.clear_gridlist()
+    view.backend.to_display_job_lsting = dict(enumerate(listings))
+    view.insert_listings(list(view.backend.to_display_job_lsting))
+    view.update()
+
+def scroll_around(view : gui.GUI, offsets : list[int]):
+    for offset in offsets:
+        view.scroll_gridlist_to(offset)
+        view.update()
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display ({e}). Run this under Xvfb: xvfb-run -a python -m benchmarks.bench_treeview")
+        sys.exit(1)
+
+    gui.Backend = StubBackend
+    view = gui.GUI(root)
+    view.pack(side="top", fill="both", expand=True)
+    root.update()
+
+    print(f"{'listings':>10} {'old (s)':>10} {'new (s)':>10} {'speedup':>10} {'scroll (ms/jump)':>18}")
+    for size in SIZES:
+        listings = synthetic_listings(size)
+
+        old_time = timed(lambda: old_repaint(view, listings), repeat=1)
+        view.job_gridlist.delete(*view.job_gridlist.get_children())
+        view.row_items = []
+
+        new_time = timed(lambda: new_repaint(view, listings))
+        assert len(view.job_gridlist.get_children()) <= view.visible_row_count() + gui.Settings.GRIDLIST_BUFFER_ROWS
+
+        offsets = random.Random(size).choices(range(size), k=SCROLL_JUMPS)
+        scroll_time = timed(lambda: scroll_around(view, offsets))
+
+        print(f"{size:>10} {old_time:>10.3f} {new_time:>10.3f} {old_time / new_time:>9.1f}x {scroll_time * 1000 / SCROLL_JUMPS:>18.2f}")
+
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Shows how URL duplicate removal in Backend.load scales: the old scan over a list of yarl.URLs against a set of canonical URLs, at 1k-20k URLs.
+
+Run from the repository root with: python -m benchmarks.bench_url_dedup
+"""
+import random
+import time
+
+import yarl
+
+from apptracker.trackers.helpers import canonical_url
+
+from benchmarks.common import timed
+
+SIZES = (1_000, 2_000, 5_000, 10_000, 20_000)
+
+def synthetic_urls(count : int) -> list[str]:
+    """Job links the way READMEs write them; about one in ten is another README's link to the same job."""
+    rng = random.Random(count)
+    urls = []
+    for i in range(count):
+        if urls and rng.random() < 0.1:
+            urls.append(rng.choice(urls).replace("https://", "https://www.") + "?utm_source=Simplify&ref=Simplify")
+        else:
+            urls.append(f"https://company{i % 700}.com/careers/{i}")
+    return urls
+
+def old_dedup(urls : list[str]) -> int:
+    urls_done : list[yarl.URL] = []
+    for url in urls:
+        yarl_url = yarl.URL(url)
+
+        found = False
+        for done in urls_done:
+            if done == yarl_url:
+                found = True
+                break
+
+        if not found:
+            urls_done.append(yarl_url)
+    return len(urls_done)
+
+def new_dedup(urls : list[str]) -> int:
+    # Trackers canonicalize each URL once while parsing; Backend.load then only checks a set.
+    urls_done : set[str] = set()
+    for url in map(canonical_url, urls):
+        if url not in urls_done:
+            urls_done.add(url)
+    return len(urls_done)
+
+def main():
+    print(f"{'urls':>8} {'list scan (s)':>14} {'set (s)':>10} {'speedup':>9}")
+    for size in SIZES:
+        urls = synthetic_urls(size)
+
+        start = time.perf_counter()
+        old_count = old_dedup(urls)
+        old_time = time.perf_counter() - start
+
+        # The old scan only caught exact duplicates; canonical URLs also catch the www./utm variants.
+        assert new_dedup(urls) == len({url.split("//www.")[-1].split("?")[0].split("//")[-1] for url in urls}) < old_count
+
+        new_time = timed(lambda: new_dedup(urls))
+        print(f"{size:>8} {old_time:>14.3f} {new_time:>10.4f} {old_time / new_time:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
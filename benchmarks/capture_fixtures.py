@@ -0,0 +1,29 @@
+"""Downloads the README of every registered tracker into benchmarks/fixtures, which the benchmark suite (benchmarks/suite.py) reads instead of the network.
+
+Run from the repository root with: python -m benchmarks.capture_fixtures [PROVIDER NAME ...]
+Captures every tracker by default. The listing tables change every day, so save a new baseline (python -m benchmarks.suite --save) after capturing.
+"""
+import sys
+
+import requests
+
+import apptracker.trackers.registry as registry
+
+from benchmarks.common import fixture_path
+
+def main(argv : list[str]):
+    registry.discover()
+    provider_names = argv or list(registry.SCHEMAS)
+
+    for provider_name in provider_names:
+        schema = registry.SCHEMAS[provider_name]
+        r = requests.get(schema.raw_url, timeout=30)
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+
+        with open(fixture_path(provider_name), "w", encoding="utf-8", newline="\n") as file:
+            file.write(r.text)
+        print(f"{provider_name}: {len(r.content)} bytes, {r.text.count(chr(10))} lines -> {fixture_path(provider_name)}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
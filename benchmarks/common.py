@@ -0,0 +1,273 @@
+import hashlib
+import os
+import random
+import re
+import requests_cache
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Shared helpers for the benchmark scripts. Nothing in here talks to the network; the READMEs are synthetic or
+# fixtures (see fixture_readme), and are served from a local HTTP server standing in for raw.githubusercontent.com.
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIRST_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+
+SIMPLIFY_PATH = "/SimplifyJobs/Summer2025-Internships/dev/README.md"
+OUCKAH_PATH = "/Ouckah/Summer2025-Internships/dev/README.md"
+NORTHWESTERN_PATH = "/northwesternfintech/2025QuantInternships/main/README.md"
+
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Seattle, WA", "Remote", "Austin, TX", "Chicago, IL"]
+ROLES = ["Software Engineer Intern", "SWE Intern - Summer 2025", "Data Science Intern", "Backend Engineering Intern", "Machine Learning Intern"]
+
+def _table_readme(rows : list[str]) -> str:
+    return "\n".join([
+        "# Summer 2025 Tech Internships",
+        "",
+        "<!-- Please leave a one line gap between this and the table TABLE_START (DO NOT CHANGE THIS LINE) -->",
+        "",
+        "| Company | Role | Location | Application/Link | Date Posted |",
+        "| ------- | ---- | -------- | ---------------- | ----------- |",
+        *rows,
+        "",
+        "<!-- Please leave a one line gap between this and the table TABLE_END (DO NOT CHANGE THIS LINE) -->",
+        ""
+    ])
+
+def simplify_readme(row_count : int, seed : int = 0) -> str:
+    """Builds a README in the Pitt CSC & Simplify format with roughly row_count table rows."""
+    rng = random.Random(seed)
+    rows = []
+    company_id = 0
+    while len(rows) < row_count:
+        company_id += 1
+        company = f"Company{company_id}"
+        for sub in range(rng.randint(1, 3)):
+            name = f"**[{company}](https://simplify.jobs/c/{company})**" if sub == 0 else "↳"
+            location = rng.choice(LOCATIONS)
+            if rng.random() < 0.3:
+                location = f"<details><summary>**3 locations**</summary>{location}</br>Remote</br>Boston, MA</details>"
+            if rng.random() < 0.1:
+                link = "🔒"
+            else:
+                url = f"https://www.{company.lower()}.com/careers/{len(rows)}?utm_source=Simplify&ref=Simplify"
+                link = f'<a href="{url}"><img src="https://i.imgur.com/u1KNU8z.png" width="118" alt="Apply"></a> <a href="https://simplify.jobs/p/{len(rows)}?utm_source=GHList"><img src="https://i.imgur.com/aVnQdox.png" width="84" alt="Simplify"></a>'
+            rows.append(f"| {name} | {rng.choice(ROLES)} 🛂 | {location} | {link} | Aug {rng.randint(1, 28)} |")
+    return _table_readme(rows[:row_count])
+
+def ouckah_readme(row_count : int, seed : int = 1) -> str:
+    """Builds a README in the Ouckah & CS Careers format with roughly row_count table rows."""
+    rng = random.Random(seed)
+    rows = []
+    company_id = 0
+    while len(rows) < row_count:
+        company_id += 1
+        company = f"Company{company_id}"
+        for sub in range(rng.randint(1, 3)):
+            name = company if sub == 0 else "↳"
+            url = f"https://{company.lower()}.com/careers/{len(rows)}"
+            link = "🔒" if rng.random() < 0.1 else f'<a href="{url}"><img src="https://i.imgur.com/JpkfjIq.png" alt="Apply" width="70"/></a>'
+            rows.append(f"| {name} | {rng.choice(ROLES)} | {rng.choice(LOCATIONS)} | {link} | Aug {rng.randint(1, 28)} |")
+    return _table_readme(rows[:row_count])
+
+def northwestern_readme(row_count : int, seed : int = 2) -> str:
+    """Builds a README in the Northwestern Fintech Club format with row_count table rows."""
+    rng = random.Random(seed)
+    lines = [
+        "# 2025 Quant Internships",
+        "",
+        "| Company| Location|SWE|QR|QT|Status| Notes|",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for i in range(row_count):
+        company = f"Firm{i}"
+        cells = []
+        for role in ("swe", "qr", "qt"):
+            cells.append(f"[✅](https://{company.lower()}.com/{role}/{i})" if rng.random() < 0.6 else "❌")
+        lines.append(f"| [{company}](https://{company.lower()}.com) | {rng.choice(LOCATIONS)} | {' | '.join(cells)} | Open | |")
+    lines.append("")
+    return "\n".join(lines)
+
+def fixture_path(provider_name : str) -> str:
+    """Where the README fixture of a tracker is kept: benchmarks/fixtures/pitt_csc_simplify.md for "Pitt CSC & Simplify"."""
+    return os.path.join(FIXTURE_DIR, re.sub(r'[^a-z0-9]+', '_', provider_name.lower()).strip('_') + ".md")
+
+def fixture_readme(provider_name : str) -> str:
+    """The README fixture of a tracker (see benchmarks/capture_fixtures.py)."""
+    with open(fixture_path(provider_name), encoding="utf-8") as file:
+        return file.read()
+
+def scaled_readme(schema, factor : int) -> str:
+    """The README fixture of a TableSchema with its table rows repeated factor times. Every copy after the first has its own company names
+    and URL hosts, so the rows of different copies are never duplicates of each other.
+    """
+    from apptracker.trackers.table_tracker import TableTracker
+
+    tracker = TableTracker(None, schema)
+    lines = fixture_readme(schema.provider_name).splitlines()
+
+    start = next(i for i, line in enumerate(lines) if tracker.is_table_start(line)) + 1
+    end = next((i for i, line in enumerate(lines[start:], start) if tracker.is_table_end(line)), len(lines))
+    rows = [line for line in lines[start:end] if line.startswith("|") and not tracker.is_filler_row([cell.strip() for cell in line.split("|")])]
+
+    copies = []
+    for copy in range(1, factor):
+        for row in rows:
+            cells = row.split("|")
+            if cells[schema.company_column].strip() != schema.sublisting_marker:
+                # "Jane2 Street": DuplicateIndex would take "Jane Street 2" for the same company, and put every "Copy2 ..." in one block.
+                cells[schema.company_column] = FIRST_WORD_RE.sub(lambda match: match.group(0) + str(copy), cells[schema.company_column], count=1)
+            copies.append("|".join(cells).replace("https://", f"https://copy{copy}."))
+
+    # Copies go right after the last row, so each sublisting (↳) still follows its company.
+    last_row = max(i for i in range(start, end) if lines[i].startswith("|"))
+    return "\n".join(lines[:last_row + 1] + copies + lines[last_row + 1:]) + "\n"
+
+class ReadmeServer:
+    """Local HTTP server that serves README bodies by path, with an optional per-request delay to emulate network latency.
+
+    Like raw.githubusercontent.com, it sends an ETag and answers a matching If-None-Match with 304 Not Modified.
+    """
+    def __init__(self, bodies : dict[str, str], delay : float = 0.0):
+        self.bodies = {}
+        self.delay = delay
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        for path, body in bodies.items():
+            self.set_body(path, body)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.delay:
+                    time.sleep(server.delay)
+
+                if self.path not in server.bodies:
+                    self.send_error(404)
+                    return
+
+                body, etag = server.bodies[self.path]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+
+                    with server._lock:
+                        server.request_count += 1
+                        server.not_modified_count += 1
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+                with server._lock:
+                    server.request_count += 1
+                    server.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def set_body(self, path : str, body : str) -> None:
+        encoded = body.encode("utf-8")
+        self.bodies[path] = (encoded, '"' + hashlib.sha1(encoded).hexdigest() + '"')
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def default_bodies(row_count : int) -> dict[str, str]:
+    return {
+        OUCKAH_PATH: ouckah_readme(row_count),
+        SIMPLIFY_PATH: simplify_readme(row_count),
+        NORTHWESTERN_PATH: northwestern_readme(max(row_count // 10, 1)),
+    }
+
+def point_trackers_at(tracker, base_url : str) -> None:
+    """Redirects every tracker inside an apptracker Tracker to the local server, using a fresh in-memory cache instead of the user's on-disk one."""
+    tracker.session = requests_cache.CachedSession(backend="memory", expire_after=60, stale_if_error=True)
+    for t in tracker.trackers:
+        t.session = tracker.session
+        path = "/" + t.raw_url.split("raw.githubusercontent.com/", 1)[1]
+        t.raw_url = base_url + path
+
+def timed(func, repeat : int = 3) -> float:
+    """Returns the best wall-clock time of func over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+class FakeWorksheet:
+    """In-memory stand-in for gspread.Worksheet, implementing only what Sheets uses. api_calls counts calls that would each be a Sheets API request."""
+    def __init__(self, title : str, rows : list[list[str]] | None = None):
+        self.title = title
+        self.rows = [list(row) for row in rows or []]
+        self.api_calls = 0
+
+    def get_all_values(self) -> list[list[str]]:
+        self.api_calls += 1
+        return [list(row) for row in self.rows]
+
+    def get(self, range_name : str) -> list[list[str]]:
+        """Supports the "A<start row>:D" ranges SheetsMirror asks for. Like the real API, empty trailing cells are left out."""
+        self.api_calls += 1
+        start_row = int(range_name.split(":")[0][1:])
+        rows = [list(row[:4]) for row in self.rows[start_row - 1:]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        return rows
+
+    def append_rows(self, values, value_input_option = None, **kwargs):
+        self.api_calls += 1
+        self.rows.extend(list(row) for row in values)
+
+class FakeSpreadsheet:
+    def __init__(self, worksheets : list[FakeWorksheet]):
+        self.worksheets = {ws.title: ws for ws in worksheets}
+
+    def worksheet(self, title : str) -> FakeWorksheet:
+        return self.worksheets[title]
+
+def fake_sheets(applied_rows : list[list[str]] | None = None, discarded_rows : list[list[str]] | None = None):
+    """Builds an apptracker Sheets backed by FakeWorksheets instead of Google Sheets.
+
+    Must be called with the working directory set to somewhere disposable: Sheets keeps its unsent rows in
+    Settings.SHEETS_PENDING_ROWS_FILE and its mirror in Settings.SHEETS_MIRROR_FILE.
+    """
+    import gspread
+    from unittest import mock
+
+    from apptracker.settings import Settings
+    from apptracker.sheets import Sheets
+
+    spreadsheet = FakeSpreadsheet([FakeWorksheet("Applications", applied_rows), FakeWorksheet("Ignore", discarded_rows)])
+    client = mock.Mock()
+    client.open_by_key.return_value = spreadsheet
+
+    with open(Settings.SHEET_KEY_FILE, "w") as file:
+        file.write("fake-key")
+
+    with mock.patch.object(gspread, "service_account", return_value=client):
+        return Sheets()
@@ -0,0 +1,326 @@
+"""Runs the end-to-end benchmarks fully offline and compares them with the stored baseline (benchmarks/baseline.json), so a change which makes
+apptracker slower shows up as a diff. READMEs are the fixtures in benchmarks/fixtures, scaled up 10x and 100x (see common.scaled_readme), served
+from a local HTTP server; Google Sheets is an in-memory fake (see common.fake_sheets).
+
+    parse         cold parse of every fixture at 1x/10x/100x, and a parse of an unchanged README (every row reused)
+    dedup         merging every tracker's listings (Tracker) and showing them (Backend._show: URL duplicates and near-duplicates)
+    classify      Sheets.classify of the 100x listings against a history of rows
+    refresh       Backend.load on a cold cache, with the cache still fresh (warm), and with every README revalidated (304)
+    applications  latency of Backend.add_application, applied and discarded
+    search        building the search bar's SearchIndex of the 100x listings, and typing SEARCH_QUERIES into it one keystroke at a time
+
+Run from the repository root with: python -m benchmarks.suite [--save] [--tolerance SHARE]
+    --save       stores the results as the new baseline. Commit it with the change that caused it, so the diff shows what changed.
+    --tolerance  how much slower than the baseline a timing may get, 0.5 (50%) by default.
+
+Timings are in milliseconds (best of a few runs, or the median for applications). They depend on the machine, so only compare with a baseline
+saved on the same one; counts (listings, requests, bytes, Sheets API calls) must match anywhere. Exits with 1 if a timing got more than
+the tolerance slower than the baseline (and by more than NOISE_FLOOR ms) or a count changed.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests_cache
+
+import apptracker.trackers.registry as registry
+import apptracker.trackers.tracker_settings as tracker_settings
+from apptracker.backend import Backend
+from apptracker.refresh_report import RefreshReport
+from apptracker.search_index import SearchIndex
+from apptracker.status_index import JobStatus
+from apptracker.tracker import Tracker
+from apptracker.trackers.joblisting import JobListing
+from apptracker.trackers.table_schema import TableSchema
+from apptracker.trackers.table_tracker import TableTracker
+
+from benchmarks.common import ReadmeServer, fake_sheets, fixture_path, point_trackers_at, scaled_readme
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SCALES = (1, 10, 100)
+CLASSIFY_SCALE = 100
+HISTORY_ROW_COUNT = 10_000 # Rows already in Google Sheets.
+REFRESH_SCALE = 10
+REFRESH_REPEAT = 5
+APPLICATION_COUNT = 200 # Of each type.
+SEARCH_SCALE = 100
+SEARCH_QUERIES = ("jane street new york", "software engineer intern", "quant chicago", "c") # "c" alone matches the most words.
+TOLERANCE = 0.5 # Timings on a busy machine easily vary by a third between runs.
+NOISE_FLOOR = 2.0
+
+@contextlib.contextmanager
+def no_gc():
+    """Keeps the garbage collector out of a timing. Whether a collection of the other benchmarks' leftovers happens to run inside one is most of the
+    difference between runs otherwise.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+def timed(func, repeat : int = 5) -> float:
+    """Returns the best wall-clock time of func over repeat runs, without garbage collection."""
+    best = float("inf")
+    for _ in range(repeat):
+        with no_gc():
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def fixture_schemas() -> list[TableSchema]:
+    """Trackers with a README fixture; plugins are left out."""
+    return [schema for schema in registry.SCHEMAS.values() if os.path.exists(fixture_path(schema.provider_name))]
+
+def fixture_name(schema : TableSchema) -> str:
+    return os.path.splitext(os.path.basename(fixture_path(schema.provider_name)))[0]
+
+def bench_parse(timings : dict[str, float], counts : dict[str, int]) -> dict[int, dict[str, list[JobListing]]]:
+    """Returns parsed[ SCALE ][ PROVIDER NAME ] = listings parsed from that tracker's fixture at that scale."""
+    session = requests_cache.CachedSession(backend="memory")
+    parsed : dict[int, dict[str, list[JobListing]]] = {scale: {} for scale in SCALES}
+
+    for schema in fixture_schemas():
+        tracker = TableTracker(session, schema)
+        for scale in SCALES:
+            lines = scaled_readme(schema, scale).splitlines()
+
+            def cold_parse():
+                tracker.row_cache = {} # Parse every row, not just the changed ones.
+                return list(tracker.parse(lines))
+
+            name = f"parse {fixture_name(schema)} {scale}x"
+            listings = cold_parse()
+            timings[name] = timed(cold_parse)
+            counts[name + " listings"] = len(listings)
+            parsed[scale][schema.provider_name] = listings
+
+        # The last parse left every row of the 100x README in the row cache.
+        timings[f"parse {fixture_name(schema)} {SCALES[-1]}x unchanged"] = timed(lambda: list(tracker.parse(lines)))
+
+    return parsed
+
+def bench_dedup(timings : dict[str, float], counts : dict[str, int], parsed : dict[int, dict[str, list[JobListing]]]) -> None:
+    tracker = Tracker()
+    backend = Backend()
+
+    for scale in SCALES:
+        states = {provider_name: (None, None, listings) for provider_name, listings in parsed[scale].items()}
+
+        def merge():
+            tracker.job_listings, tracker.listing_index, tracker._snapshot = {}, {}, None
+            tracker.restore(states)
+            return tracker.snapshot()
+
+        def show():
+            backend.to_display_job_lsting.clear()
+            backend.display_ids.clear()
+            backend.urls_done.clear()
+            backend.duplicate_index.clear()
+            backend.possible_duplicates.clear()
+            return backend._show(list(kept), print_duplicates=False)
+
+        kept = merge()
+        timings[f"dedup merge {scale}x"] = timed(merge)
+        shown = show()
+        timings[f"dedup show {scale}x"] = timed(show)
+
+        counts[f"dedup merge {scale}x listings"] = len(kept)
+        counts[f"dedup show {scale}x listings"] = len(shown)
+        counts[f"dedup show {scale}x possible duplicates"] = len(backend.possible_duplicates)
+
+def bench_classify(timings : dict[str, float], counts : dict[str, int], parsed : dict[int, dict[str, list[JobListing]]]) -> None:
+    listings = [listing for provider_listings in parsed[CLASSIFY_SCALE].values() for listing in provider_listings]
+
+    # Every other listing was already applied to or discarded; the rest of the history is older rows.
+    history = [[listing.company_name, listing.job_title, listing.url, listing.location] for listing in listings[::2]]
+    history += [[f"Old{i}", "Software Engineer Intern", f"https://old.example.com/{i}", "Remote"] for i in range(HISTORY_ROW_COUNT - len(history))]
+    sheets = fake_sheets(history[::2], history[1::2])
+    sheets.reload(force=True)
+
+    statuses = sheets.classify(listings)
+    timings[f"classify {CLASSIFY_SCALE}x"] = timed(lambda: sheets.classify(listings))
+    counts[f"classify {CLASSIFY_SCALE}x listings"] = len(listings)
+    counts[f"classify {CLASSIFY_SCALE}x not applied"] = statuses.count(JobStatus.NOT_APPLIED.value)
+
+def bench_refresh(timings : dict[str, float], counts : dict[str, int], server : ReadmeServer) -> Backend:
+    """Returns the loaded Backend, for bench_applications."""
+    backend = Backend()
+    backend.sheets = fake_sheets()
+    backend.tracker = Tracker()
+    point_trackers_at(backend.tracker, server.base_url)
+
+    def cold():
+        backend.tracker.session.cache.clear()
+        for tracker in backend.tracker.trackers:
+            tracker.has_parsed = False
+            tracker.row_cache = {}
+
+    def revalidate():
+        backend.tracker.session.cache.clear()
+
+    for name, setup in (("cold", cold), ("warm", lambda: None), ("revalidate", revalidate)):
+        best = float("inf")
+        for run in range(REFRESH_REPEAT):
+            setup()
+            requests, bytes_sent = server.request_count, server.bytes_sent
+            report = RefreshReport(name)
+
+            # Backend.load prints every URL it finds twice.
+            with contextlib.redirect_stdout(io.StringIO()), no_gc():
+                start = time.perf_counter()
+                backend.load(threading.Event(), report=report)
+                best = min(best, time.perf_counter() - start)
+
+            if run == 0:
+                counts[f"refresh {name} requests"] = server.request_count - requests
+                counts[f"refresh {name} bytes"] = server.bytes_sent - bytes_sent
+                counts[f"refresh {name} rows parsed"] = sum(tracker["counters"].get("rows_parsed", 0) for tracker in report.trackers.values())
+                counts[f"refresh {name} listings"] = len(backend.to_display_job_lsting)
+
+        timings[f"refresh {name}"] = best
+
+    return backend
+
+def bench_applications(timings : dict[str, float], counts : dict[str, int], backend : Backend) -> None:
+    listing_ids = list(backend.to_display_job_lsting)
+    assert len(listing_ids) >= 2 * APPLICATION_COUNT, "not enough listings shown"
+
+    for type, worksheet, ids in (("Applied", backend.sheets.applied_ws, listing_ids[:APPLICATION_COUNT]), ("Discarded", backend.sheets.discarded_ws, listing_ids[APPLICATION_COUNT:2 * APPLICATION_COUNT])):
+        api_calls = worksheet.api_calls
+        latencies = []
+        with no_gc():
+            for listing_id in ids:
+                start = time.perf_counter()
+                backend.add_application(threading.Event(), type, listing_id)
+                latencies.append(time.perf_counter() - start)
+
+        backend.sheets.flush()
+        timings[f"add {type.lower()} median"] = statistics.median(latencies)
+        counts[f"add {type.lower()} sheets api calls"] = worksheet.api_calls - api_calls
+        counts[f"add {type.lower()} rows"] = len(worksheet.rows)
+
+def bench_search(timings : dict[str, float], counts : dict[str, int], parsed : dict[int, dict[str, list[JobListing]]]) -> None:
+    listings = [listing for provider_listings in parsed[SEARCH_SCALE].values() for listing in provider_listings]
+
+    def build():
+        index = SearchIndex()
+        for listing_id, listing in enumerate(listings):
+            index.add(listing_id, listing)
+        return index
+
+    index = build()
+    timings[f"search index {SEARCH_SCALE}x"] = timed(build)
+
+    for query in SEARCH_QUERIES:
+        keystrokes = [query[:end] for end in range(1, len(query) + 1)]
+
+        def type_query():
+            # Typed from an empty search bar each time, so the prefixes of the last run are not cached.
+            index.forget_searches()
+            return max(timed(lambda: index.search(keystroke), repeat=1) for keystroke in keystrokes)
+
+        timings[f"search slowest keystroke {query!r}"] = min(type_query() for run in range(5))
+        counts[f"search {query!r} matches"] = len(index.search(query))
+
+def run() -> dict:
+    timings : dict[str, float] = {}
+    counts : dict[str, int] = {}
+    # Only the trackers with fixtures are served.
+    tracker_settings.TRACKERS_ENABLED = {provider_name: os.path.exists(fixture_path(provider_name)) for provider_name in registry.SCHEMAS}
+
+    parsed = bench_parse(timings, counts)
+    bench_dedup(timings, counts, parsed)
+    bench_classify(timings, counts, parsed)
+    bench_search(timings, counts, parsed)
+
+    bodies = {urlsplit(schema.raw_url).path: scaled_readme(schema, REFRESH_SCALE) for schema in fixture_schemas()}
+    with ReadmeServer(bodies) as server:
+        backend = bench_refresh(timings, counts, server)
+        bench_applications(timings, counts, backend)
+        backend.tracker.close()
+
+    return {
+        "machine": {"python": platform.python_version(), "system": platform.system(), "cpu_count": os.cpu_count()},
+        "timings": {name: round(seconds * 1000, 3) for name, seconds in timings.items()},
+        "counts": counts,
+    }
+
+def compare(results : dict, baseline : dict | None, tolerance : float) -> list[str]:
+    """Prints the results next to the baseline.
+
+        Returns:
+            list[str]: Names of the timings which got more than tolerance slower (and by more than NOISE_FLOOR ms) and the counts which changed.
+    """
+    if baseline is None:
+        print("No baseline yet; save one with --save.")
+        baseline = {"timings": {}, "counts": {}}
+    elif baseline.get("machine") != results["machine"]:
+        print(f"Baseline was saved on another machine ({baseline.get('machine')}); timings may not compare.")
+
+    regressions = []
+    print(f"{'timing (ms)':<48} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, now in results["timings"].items():
+        before = baseline["timings"].get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>10} {now:>10.3f}")
+            continue
+
+        change = now / before - 1 if before else 0.0
+        regressed = change > tolerance and now - before > NOISE_FLOOR
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<48} {before:>10.3f} {now:>10.3f} {change:>+7.0%}{' slower' if regressed else ''}")
+
+    print(f"\n{'count':<48} {'baseline':>10} {'now':>10}")
+    for name, now in results["counts"].items():
+        before = baseline["counts"].get(name)
+        if before is not None and before != now:
+            regressions.append(name)
+        print(f"{name:<48} {'-' if before is None else before:>10} {now:>10}{' changed' if before is not None and before != now else ''}")
+
+    return regressions
+
+def main(argv : list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Runs the offline benchmark suite and compares it with the stored baseline.")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="how much slower than the baseline a timing may get (0.5 is 50%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    # Sheets and Backend keep their files in the working directory.
+    os.chdir(tempfile.mkdtemp())
+    results = run()
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"\nSaved baseline to {BASELINE_FILE}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())